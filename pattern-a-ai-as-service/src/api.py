@@ -2,7 +2,7 @@
 
 from fastapi import FastAPI, HTTPException
 
-from shared import BookingError, BookingService
+from shared import AdmissionMiddleware, BookingError, BookingService
 
 from .booking import process_booking
 from .exceptions import BookingError as PatternABookingError
@@ -15,6 +15,7 @@ app = FastAPI(
     description="LLM parses text only, YOU control the business logic",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 # Wire dependencies at startup
 _booking_service = BookingService()
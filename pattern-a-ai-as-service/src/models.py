@@ -1,49 +1,45 @@
 """Pydantic models for Pattern A: AI as Service."""
 
-import re
+from pydantic import BaseModel, Field
 
-from pydantic import BaseModel, Field, field_validator
 
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+TIME_PATTERN = r"^\d{2}:\d{2}$"
 
-class ParsedIntent(BaseModel):
+
+class ExtractedIntent(BaseModel):
     """
-    Output from the LLM parser.
+    What the LLM extracts from a message.
 
-    The LLM converts natural language into this structured format.
+    Also the JSON schema its reply must follow: the format constraints are
+    part of the schema and are checked by pydantic-core while parsing.
     """
 
     date: str | None = Field(
         default=None,
         description="Extracted date in YYYY-MM-DD format",
+        pattern=DATE_PATTERN,
     )
     time: str | None = Field(
         default=None,
         description="Extracted time in HH:MM format",
+        pattern=TIME_PATTERN,
     )
     slot_preference: int | None = Field(
         default=None,
         description="User's preferred slot (1=first, 2=second, etc.)",
         ge=1,
     )
-    raw_message: str = Field(description="Original user message")
 
-    @field_validator("date")
-    @classmethod
-    def validate_date_format(cls, v: str | None) -> str | None:
-        if v is None:
-            return v
-        if not re.match(r"^\d{4}-\d{2}-\d{2}$", v):
-            raise ValueError(f"Date must be in YYYY-MM-DD format, got: {v}")
-        return v
-
-    @field_validator("time")
-    @classmethod
-    def validate_time_format(cls, v: str | None) -> str | None:
-        if v is None:
-            return v
-        if not re.match(r"^\d{2}:\d{2}$", v):
-            raise ValueError(f"Time must be in HH:MM format, got: {v}")
-        return v
+
+class ParsedIntent(ExtractedIntent):
+    """
+    Output from the LLM parser.
+
+    The LLM converts natural language into this structured format.
+    """
+
+    raw_message: str = Field(description="Original user message")
 
 
 class ChatRequest(BaseModel):
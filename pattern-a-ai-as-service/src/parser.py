@@ -7,25 +7,25 @@ The LLM's job is simple: convert natural language into structured data.
 No business logic, no decisions, no actions - just parsing.
 """
 
-import json
 import logging
 from datetime import datetime
 from typing import Protocol
 
-from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
 
+from shared.llm import StructuredOutputError, create_structured, get_llm_client
+
 from .exceptions import ParseError
-from .models import ParsedIntent
+from .models import ExtractedIntent, ParsedIntent
 from .settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
 
+# The system prompt is the same for every request, so the provider can cache it
+# as a prompt prefix; today's date follows it in a message of its own.
 SYSTEM_PROMPT = """You are a text parser. Extract booking details from user messages.
 
-Today's date is {today}.
-
 Return a JSON object with:
 - date: extracted date in YYYY-MM-DD format (null if not specified)
 - time: extracted time in HH:MM format (null if not specified)
@@ -36,14 +36,16 @@ Handle time ranges like "afternoon" (14:00), "morning" (09:00), "evening" (17:00
 Handle slot preferences like "first slot", "second one", "the first available", etc.
 
 Examples:
-- "Book tomorrow at 3pm" -> {{"date": "2024-01-16", "time": "15:00", "slot_preference": null}}
-- "Tomorrow 3pm, first slot" -> {{"date": "2024-01-16", "time": "15:00", "slot_preference": 1}}
-- "Next Monday afternoon, second one" -> {{"date": "2024-01-22", "time": "14:00", "slot_preference": 2}}
-- "Give me the first available tomorrow" -> {{"date": "2024-01-16", "time": null, "slot_preference": 1}}
+- "Book tomorrow at 3pm" -> {"date": "2024-01-16", "time": "15:00", "slot_preference": null}
+- "Tomorrow 3pm, first slot" -> {"date": "2024-01-16", "time": "15:00", "slot_preference": 1}
+- "Next Monday afternoon, second one" -> {"date": "2024-01-22", "time": "14:00", "slot_preference": 2}
+- "Give me the first available tomorrow" -> {"date": "2024-01-16", "time": null, "slot_preference": 1}
 
 Return ONLY valid JSON
 """
 
+DATE_PROMPT = "Today's date is {today}."
+
 
 class OpenAIClient(Protocol):
     """Protocol for OpenAI-compatible client."""
@@ -83,47 +85,37 @@ async def parse_intent(
         raise ParseError("No message provided")
 
     settings = settings or get_settings()
-    client = client or AsyncOpenAI(api_key=settings.get_openai_api_key())
+    client = client or get_llm_client(await settings.get_openai_api_key_async())
 
     today = datetime.now().strftime("%Y-%m-%d (%A)")
 
     logger.debug("Parsing message: %s", message[:50])
 
     try:
-        response = await client.chat.completions.create(
+        # The reply must match ExtractedIntent's JSON schema; see shared.llm.structured
+        extracted = await create_structured(
+            client,
+            ExtractedIntent,
             model=settings.openai_model,
             messages=[
-                {"role": "system", "content": SYSTEM_PROMPT.format(today=today)},
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "system", "content": DATE_PROMPT.format(today=today)},
                 {"role": "user", "content": message},
             ],
             temperature=0,
-            response_format={"type": "json_object"},
         )
+    except StructuredOutputError as e:
+        logger.error("Unusable reply from OpenAI: %s", e)
+        raise ParseError(str(e)) from e
     except Exception as e:
         logger.error("OpenAI API call failed: %s", e)
         raise ParseError(f"Failed to parse message: {e}") from e
 
-    content = response.choices[0].message.content
-    if not content:
-        logger.error("OpenAI returned empty response")
-        raise ParseError("AI returned empty response")
-
-    try:
-        parsed = json.loads(content)
-    except json.JSONDecodeError as e:
-        logger.error("Failed to parse JSON response: %s", content)
-        raise ParseError(f"Invalid JSON from AI: {e}") from e
-
     logger.info(
         "Parsed intent: date=%s, time=%s, slot=%s",
-        parsed.get("date"),
-        parsed.get("time"),
-        parsed.get("slot_preference"),
+        extracted.date,
+        extracted.time,
+        extracted.slot_preference,
     )
 
-    return ParsedIntent(
-        date=parsed.get("date"),
-        time=parsed.get("time"),
-        slot_preference=parsed.get("slot_preference"),
-        raw_message=message,
-    )
+    return ParsedIntent(**extracted.model_dump(), raw_message=message)
@@ -1,12 +1,19 @@
 """Integration tests for Pattern A API."""
 
+import json
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from shared.llm import LLMGateway, json_schema_format
+from shared.llm.gateway import _http
 from src.api import app
+from src.exceptions import ParseError
+from src.models import ExtractedIntent
+from src.parser import parse_intent
+from src.settings import Settings
 
 
 @pytest.fixture
@@ -36,7 +43,7 @@ class TestChatEndpoint:
 
     def test_chat_books_slot_successfully(self, client, mock_openai_response):
         """Verify API can parse message and book a slot end-to-end."""
-        with patch("src.parser.AsyncOpenAI") as mock_openai:
+        with patch("src.parser.get_llm_client") as mock_openai:
             mock_openai.return_value.chat.completions.create = AsyncMock(
                 return_value=mock_openai_response
             )
@@ -54,7 +61,7 @@ class TestChatEndpoint:
 
     def test_chat_returns_error_for_empty_message(self, client, mock_openai_response):
         """Verify API returns error for empty message."""
-        with patch("src.parser.AsyncOpenAI") as mock_openai:
+        with patch("src.parser.get_llm_client") as mock_openai:
             mock_openai.return_value.chat.completions.create = AsyncMock(
                 return_value=mock_openai_response
             )
@@ -73,3 +80,67 @@ class TestChatEndpoint:
 
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
+
+
+def completion(prompt_tokens=10, cached_tokens=0, content="{}"):
+    """A Chat Completions response body."""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 2,
+            "total_tokens": prompt_tokens + 2,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+class TestParseIntent:
+    """Tests for the parser's structured-output requests, against a mock HTTP transport."""
+
+    async def parse(self, replies):
+        """Parse a message against replies from a mock transport; return the result and requests."""
+        http = _http()
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return http.Response(200, json=completion(content=replies.pop(0)))
+
+        gateway = LLMGateway(transport=http.MockTransport(handler))
+        try:
+            return await parse_intent(
+                "Book tomorrow at 2pm",
+                client=gateway.client("sk-test"),
+                settings=Settings(openai_api_key="sk-test"),
+            ), requests
+        except ParseError as e:
+            return e, requests
+
+    async def test_repairs_reply_without_asking_again(self, tomorrow_date):
+        """Verify a fenced reply with a trailing comma is repaired locally."""
+        reply = f'Here you go:\n```json\n{{"date": "{tomorrow_date}", "time": "14:00", "slot_preference": 1,}}\n```'
+
+        intent, requests = await self.parse([reply])
+
+        assert intent.date == tomorrow_date
+        assert intent.slot_preference == 1
+        assert intent.raw_message == "Book tomorrow at 2pm"
+        assert len(requests) == 1
+        assert requests[0]["response_format"] == json_schema_format(ExtractedIntent)
+
+    async def test_invalid_reply_is_parse_error(self):
+        """Verify a reply still invalid after one retry is reported as a ParseError."""
+        invalid = '{"date": "tomorrow", "time": "2pm", "slot_preference": null}'
+
+        error, requests = await self.parse([invalid, invalid])
+
+        assert isinstance(error, ParseError)
+        assert "date" in str(error)
+        assert len(requests) == 2
@@ -4,7 +4,7 @@ import logging
 
 from fastapi import FastAPI, HTTPException
 
-from shared import BookingService
+from shared import AdmissionMiddleware, BookingService
 
 from .intent_parser import IntentParser
 from .models import ChatRequest, ChatResponse
@@ -18,6 +18,7 @@ app = FastAPI(
     description="Fixed-sequence workflow orchestration",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 # Wire dependencies at startup
 _settings = get_settings()
@@ -1,20 +1,18 @@
 """Intent parser using OpenAI to extract booking details from natural language."""
 
-import json
 import logging
 from datetime import datetime
 
-from openai import AsyncOpenAI
+from shared.llm import StructuredOutputError, create_structured, get_llm_client
 
 from .models import ParsedIntent
 from .settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Static, so the provider can cache it as a prompt prefix; the date is sent after it
 SYSTEM_PROMPT = """You are a booking intent parser. Extract booking details from user messages.
 
-Today's date is {today}.
-
 Return a JSON object with:
 - date: extracted date in YYYY-MM-DD format (null if not specified)
 - time: extracted time in HH:MM format (null if not specified)
@@ -24,12 +22,14 @@ Handle time expressions like "afternoon" (14:00), "morning" (09:00), "evening" (
 
 Return ONLY valid JSON, no other text."""
 
+DATE_PROMPT = "Today's date is {today}."
+
 
 class IntentParser:
     """Parses user messages to extract booking intent using OpenAI."""
 
     def __init__(self, settings: Settings) -> None:
-        self._client = AsyncOpenAI(api_key=settings.get_openai_api_key())
+        self._settings = settings
         self._model = settings.openai_model
 
     async def parse(self, message: str) -> ParsedIntent:
@@ -39,28 +39,23 @@ class IntentParser:
         try:
             today = datetime.now().strftime("%Y-%m-%d")
 
-            response = await self._client.chat.completions.create(
+            client = get_llm_client(await self._settings.get_openai_api_key_async())
+            intent = await create_structured(
+                client,
+                ParsedIntent,
                 model=self._model,
                 messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT.format(today=today)},
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "system", "content": DATE_PROMPT.format(today=today)},
                     {"role": "user", "content": message},
                 ],
                 temperature=0,
-                response_format={"type": "json_object"},
-            )
-
-            content = response.choices[0].message.content or "{}"
-            parsed = json.loads(content)
-
-            intent = ParsedIntent(
-                date=parsed.get("date"),
-                time=parsed.get("time"),
             )
 
             logger.info("Parsed intent: date=%s, time=%s", intent.date, intent.time)
             return intent
 
-        except json.JSONDecodeError as e:
+        except StructuredOutputError as e:
             logger.error("Failed to parse AI response: %s", e)
             raise
 
@@ -1,6 +1,6 @@
 """Pydantic models for Pattern B."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ChatRequest(BaseModel):
@@ -16,7 +16,15 @@ class ChatResponse(BaseModel):
 
 
 class ParsedIntent(BaseModel):
-    """Parsed booking intent from user message."""
-
-    date: str | None = None
-    time: str | None = None
+    """Parsed booking intent from user message; also the LLM's reply schema."""
+
+    date: str | None = Field(
+        default=None,
+        description="Date in YYYY-MM-DD format",
+        pattern=r"^\d{4}-\d{2}-\d{2}$",
+    )
+    time: str | None = Field(
+        default=None,
+        description="Time in HH:MM format",
+        pattern=r"^\d{2}:\d{2}$",
+    )
@@ -36,7 +36,11 @@ class TestChatEndpoint:
 
     def test_chat_books_slot_successfully(self, client, mock_openai_response):
         """Verify API can parse message and book a slot end-to-end."""
-        with patch("src.api._intent_parser._client.chat.completions.create", new=AsyncMock(return_value=mock_openai_response)):
+        with patch("src.intent_parser.get_llm_client") as mock_openai:
+            mock_openai.return_value.chat.completions.create = AsyncMock(
+                return_value=mock_openai_response
+            )
+
             response = client.post(
                 "/chat",
                 json={"message": "Book tomorrow afternoon please"}
@@ -2,6 +2,8 @@
 
 from fastapi import FastAPI, HTTPException
 
+from shared import AdmissionMiddleware
+
 from .exceptions import ServiceError, WorkflowError
 from .models import ChatRequest, ChatResponse
 from .workflow import run_workflow
@@ -11,6 +13,7 @@ app = FastAPI(
     description="Fixed workflow with independent, deployable services",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -3,10 +3,9 @@ Pydantic models defining service contracts.
 These models define the input/output interfaces between independent services.
 """
 
-import re
 from typing import Generic, TypeVar
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field
 
 T = TypeVar("T")
 
@@ -25,36 +24,29 @@ class ServiceResponse(BaseModel, Generic[T]):
 # ============ Service 1: Intent Parser ============
 
 
-class ParsedIntent(BaseModel):
-    """Output from the Intent Parser service."""
+DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}$"
+TIME_PATTERN = r"^\d{2}:\d{2}$"
+
+
+class ExtractedIntent(BaseModel):
+    """The Intent Parser's LLM reply; its JSON schema is the reply format."""
 
     date: str | None = Field(
         default=None,
         description="Extracted date in YYYY-MM-DD format",
+        pattern=DATE_PATTERN,
     )
     time: str | None = Field(
         default=None,
         description="Extracted time in HH:MM format",
+        pattern=TIME_PATTERN,
     )
-    raw_message: str = Field(description="Original user message")
 
-    @field_validator("date")
-    @classmethod
-    def validate_date_format(cls, v: str | None) -> str | None:
-        if v is None:
-            return v
-        if not re.match(r"^\d{4}-\d{2}-\d{2}$", v):
-            raise ValueError(f"Date must be in YYYY-MM-DD format, got: {v}")
-        return v
-
-    @field_validator("time")
-    @classmethod
-    def validate_time_format(cls, v: str | None) -> str | None:
-        if v is None:
-            return v
-        if not re.match(r"^\d{2}:\d{2}$", v):
-            raise ValueError(f"Time must be in HH:MM format, got: {v}")
-        return v
+
+class ParsedIntent(ExtractedIntent):
+    """Output from the Intent Parser service."""
+
+    raw_message: str = Field(description="Original user message")
 
 
 # ============ Service 2: Availability Checker ============
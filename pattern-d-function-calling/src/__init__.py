@@ -1,11 +1,16 @@
 """Pattern D: Function Calling - LLM decides which functions to call."""
 
-from .function_caller import call
+from .exceptions import FunctionCallingError, LoopLimitExceededError
+from .function_caller import ToolResultMemo, call, call_stream
 from .models import ChatRequest, ChatResponse, HealthResponse
 from .settings import Settings, get_settings
 
 __all__ = [
     "call",
+    "call_stream",
+    "ToolResultMemo",
+    "FunctionCallingError",
+    "LoopLimitExceededError",
     "ChatRequest",
     "ChatResponse",
     "HealthResponse",
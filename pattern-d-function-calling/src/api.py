@@ -1,20 +1,51 @@
 """FastAPI application for Pattern D: Function Calling."""
 
+from collections.abc import AsyncIterator
+from typing import Any
+
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 
-from shared import BookingError, BookingService
+from shared import (
+    AdmissionMiddleware,
+    BookingError,
+    BookingService,
+    create_conversation_store,
+    sse_stream,
+)
 
-from .function_caller import call
+from .exceptions import LoopLimitExceededError
+from .function_caller import call, call_stream
 from .models import ChatRequest, ChatResponse
+from .settings import get_settings
 
 app = FastAPI(
     title="Pattern D: Function Calling",
     description="LLM decides which functions to call in a loop",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 _booking_service = BookingService()
 
+_settings = get_settings()
+_conversations = create_conversation_store(
+    _settings.session_store,
+    _settings.session_db_path,
+    ttl=_settings.session_ttl,
+    max_turns=_settings.session_max_turns,
+    max_bytes=_settings.session_max_bytes,
+)
+
+
+async def _with_session(
+    deltas: AsyncIterator[str], history: list[dict[str, Any]], session_id: str
+) -> AsyncIterator[str]:
+    """Pass a stream through, saving the session once it completes."""
+    async for delta in deltas:
+        yield delta
+    _conversations.save(session_id, history)
+
 
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest) -> ChatResponse:
@@ -26,18 +57,48 @@ async def chat(request: ChatRequest) -> ChatResponse:
     2. LLM decides which tools to call
     3. Execute tools and return results to LLM
     4. Repeat until LLM returns final response
+
+    With a ``session_id``, earlier turns of that conversation are sent too.
     """
     try:
-        result = await call(request.message, _booking_service)
-        return ChatResponse(response=result)
+        if request.session_id is None:
+            result = await call(request.message, _booking_service)
+        else:
+            history = _conversations.load(request.session_id)
+            result = await call(request.message, _booking_service, history=history)
+            _conversations.save(request.session_id, history)
+        return ChatResponse(response=result, session_id=request.session_id)
 
     except BookingError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    except LoopLimitExceededError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
     except Exception:
         raise HTTPException(status_code=500, detail="Internal error")
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Process a booking request, streaming the reply as server-sent events.
+
+    Same loop as /chat, but completions are streamed: each text delta is sent
+    as soon as the LLM produces it, followed by a final ``done`` event.
+    """
+    if request.session_id is None:
+        deltas = call_stream(request.message, _booking_service)
+    else:
+        history = _conversations.load(request.session_id)
+        deltas = _with_session(
+            call_stream(request.message, _booking_service, history=history),
+            history,
+            request.session_id,
+        )
+    return StreamingResponse(sse_stream(deltas), media_type="text/event-stream")
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
@@ -0,0 +1,14 @@
+"""Custom exceptions for Pattern D."""
+
+
+class FunctionCallingError(Exception):
+    """Base exception for the function-calling loop."""
+
+
+class LoopLimitExceededError(FunctionCallingError):
+    """The model kept calling tools past a configured loop limit."""
+
+    def __init__(self, limit: str, value: int) -> None:
+        self.limit = limit
+        self.value = value
+        super().__init__(f"Function-calling loop stopped: {limit} limit of {value} reached")
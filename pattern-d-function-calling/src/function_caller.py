@@ -1,24 +1,32 @@
 """Function caller for Pattern D: LLM decides which functions to call."""
 
+import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import Any
 
 from openai import AsyncOpenAI
-from openai.types.chat import ChatCompletionMessageToolCall
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageToolCall
 
-from shared import BookingService
+from shared import BookingError, BookingService
+from shared.llm import get_llm_client
 
+from .exceptions import LoopLimitExceededError
 from .settings import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
+# The system prompt and tools are the same for every request, so the provider can
+# cache them as a prompt prefix, along with as much of the history as is unchanged
+# since the last request. Today's date is sent just before the newest user message
+# instead of in the system prompt, and history is compacted when a turn starts and
+# then only each time the prompt has grown by settings.compact_prompt_tokens (see
+# call()), so within a turn most requests extend the previous one.
 SYSTEM_PROMPT = """You are a helpful tennis court booking assistant.
 You help users check availability and book tennis courts.
 
-Today's date is {today}.
-
 When the user wants to book:
 1. First check availability for the requested date/time
 2. Present the available slots to the user
@@ -26,6 +34,8 @@ When the user wants to book:
 
 Always be helpful and confirm bookings with full details."""
 
+DATE_PROMPT = "Today's date is {today}."
+
 TOOLS = [
     {
         "type": "function",
@@ -68,13 +78,28 @@ TOOLS = [
 ]
 
 
+SUPERSEDED_RESULT = "[Superseded by a later check_availability call with the same arguments]"
+
+
+def _parse_args(arguments: str) -> dict[str, Any] | None:
+    """Parse a tool call's JSON arguments, or return None if they aren't a JSON object."""
+    try:
+        args = json.loads(arguments)
+    except ValueError:
+        return None
+    return args if isinstance(args, dict) else None
+
+
 def _execute_tool(
     tool_call: ChatCompletionMessageToolCall,
     booking_service: BookingService,
 ) -> str:
     """Execute a tool call and return the result as a string."""
     name = tool_call.function.name
-    args = json.loads(tool_call.function.arguments)
+    args = _parse_args(tool_call.function.arguments)
+    if args is None:
+        logger.warning("Invalid arguments for tool %s: %r", name, tool_call.function.arguments)
+        return f"Error: invalid arguments for {name}, expected a JSON object"
 
     logger.info("Executing tool: %s with args: %s", name, args)
 
@@ -105,49 +130,424 @@ def _execute_tool(
         return f"Unknown function: {name}"
 
 
+def _canonical_args(arguments: str) -> str:
+    """
+    Normalize a JSON arguments string so equal calls compare equal.
+
+    Invalid JSON is returned as is: it still names the call, and a bad call
+    stored in a session's history mustn't break the session's later turns.
+    """
+    try:
+        return json.dumps(json.loads(arguments), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return arguments
+
+
+class ToolResultMemo:
+    """
+    Per-conversation memo of read-only tool results.
+
+    Results are keyed by (function name, canonical arguments), so a repeated
+    ``check_availability`` call is answered without touching the booking
+    service. Any successful ``book`` call clears the memo, since it changes
+    availability.
+    """
+
+    MEMOIZABLE_TOOLS = frozenset({"check_availability"})
+
+    def __init__(self) -> None:
+        self._results: dict[tuple[str, str], str] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str]) -> str | None:
+        """Return a memoized result, counting the lookup as a hit or miss."""
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation."""
+        return self._generation
+
+    def put(self, key: tuple[str, str], result: str, generation: int) -> None:
+        """Store a result unless the memo was invalidated while it was computed."""
+        if generation == self._generation:
+            self._results[key] = result
+
+    def invalidate(self) -> None:
+        """Drop all memoized results."""
+        self._results.clear()
+        self._generation += 1
+
+
+def _conflict_key(tool_call: ChatCompletionMessageToolCall) -> str | None:
+    """
+    Return the lane a tool call must share, or None if it can run on its own.
+
+    Calls sharing a key run in the order the model issued them: bookings of
+    the same slot, and identical availability checks (so the repeat is
+    answered from the memo instead of racing the first call). A call with
+    malformed arguments runs on its own, and fails there.
+    """
+    name = tool_call.function.name
+    args = _parse_args(tool_call.function.arguments)
+    if args is None:
+        return None
+    if name == "book":
+        return f"slot:{args.get('slot_id')}"
+    if name in ToolResultMemo.MEMOIZABLE_TOOLS:
+        return f"{name}:{_canonical_args(tool_call.function.arguments)}"
+    return None
+
+
+async def _execute_tools(
+    tool_calls: list[ChatCompletionMessageToolCall],
+    booking_service: BookingService,
+    memo: ToolResultMemo,
+) -> list[str]:
+    """
+    Execute all tool calls from one assistant message, returning results in call order.
+
+    Independent calls (e.g. availability checks for different dates) run
+    concurrently in worker threads. Calls that conflict - bookings of the
+    same slot - are queued in a single lane and run one after another.
+    Repeated read-only calls are served from ``memo``.
+
+    A failing call becomes an error result for the model rather than an
+    exception: by the time it fails, calls in other lanes may already have
+    booked courts, and the model has to be told about both.
+    """
+    lanes: dict[str | int, list[int]] = {}
+    for index, tool_call in enumerate(tool_calls):
+        key = _conflict_key(tool_call)
+        lanes.setdefault(index if key is None else key, []).append(index)
+
+    results: list[str] = [""] * len(tool_calls)
+
+    async def run_one(tool_call: ChatCompletionMessageToolCall) -> str:
+        name = tool_call.function.name
+        if name not in ToolResultMemo.MEMOIZABLE_TOOLS:
+            result = await asyncio.to_thread(_execute_tool, tool_call, booking_service)
+            if name == "book":
+                memo.invalidate()
+            return result
+
+        key = (name, _canonical_args(tool_call.function.arguments))
+        cached = memo.get(key)
+        if cached is not None:
+            logger.info("Tool result served from memo: %s %s", *key)
+            return cached
+
+        generation = memo.generation
+        result = await asyncio.to_thread(_execute_tool, tool_call, booking_service)
+        memo.put(key, result, generation)
+        return result
+
+    async def run_lane(indices: list[int]) -> None:
+        for index in indices:
+            tool_call = tool_calls[index]
+            try:
+                results[index] = await run_one(tool_call)
+            except BookingError as e:
+                results[index] = f"Error: {e}"
+            except Exception:
+                logger.exception("Tool %s failed", tool_call.function.name)
+                results[index] = f"Error: {tool_call.function.name} failed"
+
+    logger.debug("Executing %d tool calls in %d lanes", len(tool_calls), len(lanes))
+    await asyncio.gather(*(run_lane(indices) for indices in lanes.values()))
+    return results
+
+
+def _summarize_tool_result(content: str) -> str:
+    """Keep only the summary line of a multi-line tool result."""
+    first_line, _, rest = content.partition("\n")
+    if not rest.strip():
+        return content
+    return f"{first_line} [details omitted]"
+
+
+def _compact_history(messages: list[Any], keep_recent_turns: int) -> None:
+    """
+    Shrink stale tool outputs in place at the start of a turn.
+
+    - An availability listing superseded by a later check with the same
+      arguments is replaced with a short marker.
+    - Tool outputs older than the last ``keep_recent_turns`` assistant turns
+      are cut down to their summary line.
+
+    Message order and tool_call ids are untouched, so the history remains a
+    valid conversation for the API.
+    """
+    calls: dict[str, tuple[str, str]] = {}
+    turn_of: dict[str, int] = {}
+    turn = 0
+    for message in messages:
+        if isinstance(message, dict) or not message.tool_calls:
+            continue
+        turn += 1
+        for tool_call in message.tool_calls:
+            calls[tool_call.id] = (
+                tool_call.function.name,
+                _canonical_args(tool_call.function.arguments),
+            )
+            turn_of[tool_call.id] = turn
+
+    latest_call: dict[tuple[str, str], str] = {}
+    for call_id, key in calls.items():
+        latest_call[key] = call_id
+
+    for message in messages:
+        if not isinstance(message, dict) or message.get("role") != "tool":
+            continue
+        call_id = message["tool_call_id"]
+        key = calls.get(call_id)
+        if key is None:
+            continue
+        if key[0] == "check_availability" and latest_call[key] != call_id:
+            message["content"] = SUPERSEDED_RESULT
+        elif turn - turn_of[call_id] >= keep_recent_turns:
+            message["content"] = _summarize_tool_result(message["content"])
+
+
+def _compact_if_grown(
+    messages: list[Any], prompt_tokens: int, compact_at: int, settings: Settings
+) -> int:
+    """
+    Compact the history mid-turn once the last prompt reached ``compact_at`` tokens.
+
+    Returns:
+        The prompt size at which to compact next
+    """
+    if prompt_tokens < compact_at:
+        return compact_at
+    logger.debug("Prompt reached %d tokens, compacting history mid-turn", prompt_tokens)
+    _compact_history(messages, settings.keep_recent_tool_turns)
+    return prompt_tokens + settings.compact_prompt_tokens
+
+
+def _initial_messages(message: str, history: list[dict[str, Any]] | None = None) -> list[Any]:
+    """
+    Build the messages that start a request: system prompt, earlier turns, today's
+    date, user message.
+
+    Stored assistant tool-call messages are turned back into
+    ChatCompletionMessage objects, as _compact_history expects.
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    earlier = [
+        ChatCompletionMessage.model_validate(item) if item.get("tool_calls") else dict(item)
+        for item in history or []
+    ]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        *earlier,
+        {"role": "system", "content": DATE_PROMPT.format(today=today)},
+        {"role": "user", "content": message},
+    ]
+
+
+def _record_history(
+    history: list[dict[str, Any]] | None, messages: list[Any], reply: str
+) -> None:
+    """Replace ``history`` in place with this conversation, minus system messages."""
+    if history is None:
+        return
+    history[:] = [
+        message if isinstance(message, dict)
+        else message.model_dump(include={"role", "content", "tool_calls"}, exclude_none=True)
+        for message in messages
+        if not (isinstance(message, dict) and message["role"] == "system")
+    ]
+    history.append({"role": "assistant", "content": reply})
+
+
+def _append_tool_results(
+    messages: list[Any],
+    tool_calls: list[ChatCompletionMessageToolCall],
+    results: list[str],
+) -> None:
+    """Append one tool message per tool call, in call order."""
+    for tool_call, result in zip(tool_calls, results):
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "content": result,
+        })
+
+
 async def call(
     message: str,
     booking_service: BookingService,
     client: AsyncOpenAI | None = None,
     settings: Settings | None = None,
+    memo: ToolResultMemo | None = None,
+    history: list[dict[str, Any]] | None = None,
 ) -> str:
     """
     Process a user message using function calling.
 
     The LLM decides which functions to call in a loop until the task is complete.
+    The loop is bounded by ``settings.max_iterations`` completion requests and
+    ``settings.max_total_tokens`` tokens. Stale tool outputs are compacted
+    before the first request. Rewriting them changes the middle of a prompt
+    the provider has cached, so within the turn they are compacted again only
+    each time the prompt has grown by ``settings.compact_prompt_tokens``; the
+    requests in between only append to it.
+
+    Read-only tool results are memoized for the conversation in ``memo``
+    (a fresh one per call unless supplied), so duplicate calls return instantly.
+
+    If ``history`` is given, its earlier turns - including their tool results -
+    are sent before the message, and it is updated in place with this turn.
+
+    Raises:
+        LoopLimitExceededError: If the model is still calling tools when a limit is hit
     """
     settings = settings or get_settings()
-    client = client or AsyncOpenAI(api_key=settings.get_openai_api_key())
+    client = client or get_llm_client(await settings.get_openai_api_key_async())
+    memo = memo or ToolResultMemo()
 
-    today = datetime.now().strftime("%Y-%m-%d")
-    system_prompt = SYSTEM_PROMPT.format(today=today)
+    messages = _initial_messages(message, history)
+    _compact_history(messages, settings.keep_recent_tool_turns)
+    tokens_used = 0
+    prompt_tokens = 0
+    compact_at = settings.compact_prompt_tokens
 
-    messages: list[dict[str, Any]] = [
-        {"role": "system", "content": system_prompt},
-        {"role": "user", "content": message},
-    ]
+    for iteration in range(settings.max_iterations):
+        if tokens_used >= settings.max_total_tokens:
+            raise LoopLimitExceededError("token", settings.max_total_tokens)
+        compact_at = _compact_if_grown(messages, prompt_tokens, compact_at, settings)
 
-    while True:
-        logger.debug("Calling OpenAI with %d messages", len(messages))
+        logger.debug("Calling OpenAI with %d messages (iteration %d)", len(messages), iteration + 1)
 
         response = await client.chat.completions.create(
             model=settings.openai_model,
             messages=messages,
             tools=TOOLS,
         )
+        if response.usage is not None:
+            tokens_used += response.usage.total_tokens
+            prompt_tokens = response.usage.prompt_tokens
 
         assistant_message = response.choices[0].message
 
         if not assistant_message.tool_calls:
-            logger.info("No more tool calls, returning response")
-            return assistant_message.content or ""
+            logger.info(
+                "No more tool calls, returning response (%d tool calls deduplicated)",
+                memo.hits,
+            )
+            reply = assistant_message.content or ""
+            _record_history(history, messages, reply)
+            return reply
 
         messages.append(assistant_message)
 
-        for tool_call in assistant_message.tool_calls:
-            result = _execute_tool(tool_call, booking_service)
-            messages.append({
-                "role": "tool",
-                "tool_call_id": tool_call.id,
-                "content": result,
-            })
+        results = await _execute_tools(assistant_message.tool_calls, booking_service, memo)
+        _append_tool_results(messages, assistant_message.tool_calls, results)
+
+    raise LoopLimitExceededError("iteration", settings.max_iterations)
+
+
+async def call_stream(
+    message: str,
+    booking_service: BookingService,
+    client: AsyncOpenAI | None = None,
+    settings: Settings | None = None,
+    memo: ToolResultMemo | None = None,
+    history: list[dict[str, Any]] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of call(): yield assistant text as it is generated.
+
+    Each completion is requested with ``stream=True``. Text deltas are yielded
+    immediately; tool-call deltas are assembled into complete tool calls and
+    executed exactly as in call(), with the same limits, compaction, memo and
+    history.
+
+    Raises:
+        LoopLimitExceededError: If the model is still calling tools when a limit is hit
+    """
+    settings = settings or get_settings()
+    client = client or get_llm_client(await settings.get_openai_api_key_async())
+    memo = memo or ToolResultMemo()
+
+    messages = _initial_messages(message, history)
+    _compact_history(messages, settings.keep_recent_tool_turns)
+    tokens_used = 0
+    prompt_tokens = 0
+    compact_at = settings.compact_prompt_tokens
+
+    for iteration in range(settings.max_iterations):
+        if tokens_used >= settings.max_total_tokens:
+            raise LoopLimitExceededError("token", settings.max_total_tokens)
+        compact_at = _compact_if_grown(messages, prompt_tokens, compact_at, settings)
+
+        logger.debug("Streaming OpenAI with %d messages (iteration %d)", len(messages), iteration + 1)
+
+        stream = await client.chat.completions.create(
+            model=settings.openai_model,
+            messages=messages,
+            tools=TOOLS,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        content_parts: list[str] = []
+        tool_call_parts: dict[int, dict[str, str]] = {}
+        async for chunk in stream:
+            if chunk.usage is not None:
+                tokens_used += chunk.usage.total_tokens
+                prompt_tokens = chunk.usage.prompt_tokens
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta
+            if delta.content:
+                content_parts.append(delta.content)
+                yield delta.content
+
+            for tool_call_delta in delta.tool_calls or []:
+                part = tool_call_parts.setdefault(
+                    tool_call_delta.index, {"id": "", "name": "", "arguments": ""}
+                )
+                if tool_call_delta.id:
+                    part["id"] = tool_call_delta.id
+                if tool_call_delta.function:
+                    part["name"] += tool_call_delta.function.name or ""
+                    part["arguments"] += tool_call_delta.function.arguments or ""
+
+        if not tool_call_parts:
+            logger.info(
+                "No more tool calls, stream complete (%d tool calls deduplicated)",
+                memo.hits,
+            )
+            _record_history(history, messages, "".join(content_parts))
+            return
+
+        tool_calls = [
+            ChatCompletionMessageToolCall(
+                id=part["id"],
+                type="function",
+                function={"name": part["name"], "arguments": part["arguments"]},
+            )
+            for _, part in sorted(tool_call_parts.items())
+        ]
+        messages.append(
+            ChatCompletionMessage(
+                role="assistant",
+                content="".join(content_parts) or None,
+                tool_calls=tool_calls,
+            )
+        )
+
+        results = await _execute_tools(tool_calls, booking_service, memo)
+        _append_tool_results(messages, tool_calls, results)
+
+    raise LoopLimitExceededError("iteration", settings.max_iterations)
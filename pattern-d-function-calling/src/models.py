@@ -1,5 +1,7 @@
 """Pydantic models for Pattern D: Function Calling."""
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -12,12 +14,18 @@ class ChatRequest(BaseModel):
         description="User message for booking request",
         examples=["Book a tennis court for tomorrow at 3pm"],
     )
+    session_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Conversation to continue; omit for a one-off request",
+    )
 
 
 class ChatResponse(BaseModel):
     """API response model."""
 
     response: str = Field(description="System's response to the user")
+    session_id: Optional[str] = Field(None, description="Session ID echoed from the request")
 
 
 class HealthResponse(BaseModel):
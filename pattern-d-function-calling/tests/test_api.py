@@ -1,16 +1,137 @@
 """Integration tests for Pattern D API."""
 
+import json
+import threading
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
+from openai.types.chat import (
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+    ChatCompletionMessageToolCall,
+)
 
+from shared import BookingService
 from src.api import app
+from src.function_caller import SUPERSEDED_RESULT, SYSTEM_PROMPT
+from src.settings import get_settings
+
+
+def make_tool_call_response(*calls, total_tokens=500):
+    """Build a mock OpenAI response carrying the given (name, arguments) tool calls."""
+    tool_calls = []
+    for i, (name, arguments) in enumerate(calls):
+        tool_call = MagicMock()
+        tool_call.id = f"call_{i}"
+        tool_call.function.name = name
+        tool_call.function.arguments = arguments
+        tool_calls.append(tool_call)
+
+    message = MagicMock()
+    message.tool_calls = tool_calls
+    message.content = None
+
+    response = MagicMock()
+    response.choices = [MagicMock(message=message)]
+    response.usage = MagicMock(total_tokens=total_tokens, prompt_tokens=total_tokens)
+    return response
+
+
+def make_stream(*deltas, total_tokens=500):
+    """Build a mock streamed completion from a sequence of delta dicts."""
+    chunks = [
+        ChatCompletionChunk.model_validate({
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        })
+        for delta in deltas
+    ]
+    chunks.append(
+        ChatCompletionChunk.model_validate({
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [],
+            "usage": {
+                "prompt_tokens": total_tokens,
+                "completion_tokens": 0,
+                "total_tokens": total_tokens,
+            },
+        })
+    )
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    return stream()
+
+
+def make_check_response(call_id, date, prompt_tokens=500):
+    """Build a response whose one tool call is an availability check for ``date``."""
+    response = MagicMock(usage=MagicMock(total_tokens=prompt_tokens, prompt_tokens=prompt_tokens))
+    response.choices = [MagicMock(message=ChatCompletionMessage(
+        role="assistant",
+        tool_calls=[ChatCompletionMessageToolCall(
+            id=call_id,
+            type="function",
+            function={"name": "check_availability", "arguments": f'{{"date": "{date}"}}'},
+        )],
+    ))]
+    return response
+
+
+def recording_create(*replies):
+    """
+    A chat.completions.create stand-in returning ``replies`` in order.
+
+    Returns:
+        The tool outputs sent with each request (copied, since the list is
+        mutated later), and the stand-in
+    """
+    replies = iter(replies)
+    sent = []
+
+    async def create(**kwargs):
+        sent.append([
+            m["content"] for m in kwargs["messages"]
+            if isinstance(m, dict) and m["role"] == "tool"
+        ])
+        return next(replies)
+
+    return sent, create
+
+
+def parse_sse(body):
+    """Split a server-sent events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event = "message"
+        for line in block.splitlines():
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+@pytest.fixture
+def booking_service(monkeypatch):
+    """Give each test its own booking service, so bookings don't leak between tests."""
+    service = BookingService()
+    monkeypatch.setattr("src.api._booking_service", service)
+    return service
 
 
 @pytest.fixture
-def client():
+def client(booking_service):
     """Create test client."""
     return TestClient(app)
 
@@ -35,6 +156,7 @@ def mock_tool_call_response(tomorrow_date):
 
     response = MagicMock()
     response.choices = [MagicMock(message=message)]
+    response.usage = MagicMock(total_tokens=500, prompt_tokens=500)
     return response
 
 
@@ -47,6 +169,7 @@ def mock_final_response():
 
     response = MagicMock()
     response.choices = [MagicMock(message=message)]
+    response.usage = MagicMock(total_tokens=300, prompt_tokens=300)
     return response
 
 
@@ -57,7 +180,7 @@ class TestChatEndpoint:
         self, client, mock_tool_call_response, mock_final_response
     ):
         """Verify API handles function calling loop correctly."""
-        with patch("src.function_caller.AsyncOpenAI") as mock_openai:
+        with patch("src.function_caller.get_llm_client") as mock_openai:
             mock_client = AsyncMock()
             mock_client.chat.completions.create = AsyncMock(
                 side_effect=[mock_tool_call_response, mock_final_response]
@@ -75,7 +198,7 @@ class TestChatEndpoint:
 
     def test_chat_direct_response(self, client, mock_final_response):
         """Verify API handles direct response (no tool calls)."""
-        with patch("src.function_caller.AsyncOpenAI") as mock_openai:
+        with patch("src.function_caller.get_llm_client") as mock_openai:
             mock_client = AsyncMock()
             mock_client.chat.completions.create = AsyncMock(
                 return_value=mock_final_response
@@ -89,6 +212,359 @@ class TestChatEndpoint:
             assert "response" in data
             assert mock_client.chat.completions.create.call_count == 1
 
+    def test_chat_runs_independent_tool_calls_concurrently(
+        self, client, booking_service, mock_final_response
+    ):
+        """Verify several availability checks in one turn are in flight together."""
+        dates = [
+            (datetime.now() + timedelta(days=d)).strftime("%Y-%m-%d") for d in (1, 2, 3)
+        ]
+        tool_response = make_tool_call_response(
+            *[("check_availability", f'{{"date": "{d}"}}') for d in dates]
+        )
+        # Each check waits for the other two, so this only passes if all three overlap
+        barrier = threading.Barrier(len(dates), timeout=5)
+
+        def overlapping_check(date, time=None):
+            barrier.wait()
+            return []
+
+        with patch("src.function_caller.get_llm_client") as mock_openai, patch.object(
+            booking_service, "check_availability", side_effect=overlapping_check
+        ):
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[tool_response, mock_final_response]
+            )
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Any courts this week?"})
+
+            assert response.status_code == 200
+            tool_messages = mock_client.chat.completions.create.call_args.kwargs[
+                "messages"
+            ][-3:]
+            assert [m["tool_call_id"] for m in tool_messages] == [
+                "call_0",
+                "call_1",
+                "call_2",
+            ]
+            assert all(m["content"].startswith("No available") for m in tool_messages)
+
+    def test_chat_serializes_bookings_of_same_slot(
+        self, client, booking_service, tomorrow_date, mock_final_response
+    ):
+        """Verify duplicate bookings of one slot run in order, and the failure reaches the model."""
+        slot_id = f"{tomorrow_date}_CourtC_1700"
+        tool_response = make_tool_call_response(
+            ("book", f'{{"slot_id": "{slot_id}"}}'),
+            ("book", f'{{"slot_id": "{slot_id}"}}'),
+        )
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[tool_response, mock_final_response]
+            )
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Book 5pm twice"})
+
+            assert response.status_code == 200
+            first, second = mock_client.chat.completions.create.call_args.kwargs[
+                "messages"
+            ][-2:]
+            assert first["content"].startswith("Booking confirmed!")
+            assert second["content"].startswith("Error:")
+            assert "already booked" in second["content"]
+            assert slot_id not in {
+                slot.slot_id for slot in booking_service.check_availability(tomorrow_date)
+            }
+
+    def test_chat_reports_malformed_tool_arguments(
+        self, client, tomorrow_date, mock_final_response
+    ):
+        """Verify calls with invalid JSON arguments fail alone, as tool results."""
+        tool_response = make_tool_call_response(
+            ("book", '{"slot_id": "2024'),
+            ("book", "not json"),
+            ("book", '["not", "an", "object"]'),
+            ("book", f'{{"slot_id": "{tomorrow_date}_CourtA_0900"}}'),
+        )
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[tool_response, mock_final_response]
+            )
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Book 9am"})
+
+            assert response.status_code == 200
+            tool_messages = mock_client.chat.completions.create.call_args.kwargs[
+                "messages"
+            ][-4:]
+            assert all(
+                m["content"].startswith("Error: invalid arguments for book")
+                for m in tool_messages[:3]
+            )
+            assert tool_messages[3]["content"].startswith("Booking confirmed!")
+
+    def test_chat_stops_after_max_iterations(self, client, mock_tool_call_response):
+        """Verify a model that never stops calling tools is cut off."""
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                return_value=mock_tool_call_response
+            )
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Keep checking"})
+
+            assert response.status_code == 500
+            assert "iteration limit" in response.json()["detail"]
+            assert (
+                mock_client.chat.completions.create.call_count
+                == get_settings().max_iterations
+            )
+
+    def test_chat_stops_when_token_budget_spent(self, client, tomorrow_date):
+        """Verify the loop stops once reported usage exceeds the token budget."""
+        tool_response = make_tool_call_response(
+            ("check_availability", f'{{"date": "{tomorrow_date}"}}'),
+            total_tokens=get_settings().max_total_tokens // 2 + 1,
+        )
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(return_value=tool_response)
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Keep checking"})
+
+            assert response.status_code == 500
+            assert "token limit" in response.json()["detail"]
+            assert mock_client.chat.completions.create.call_count == 2
+
+    def test_chat_compacts_superseded_availability(
+        self, client, tomorrow_date, mock_final_response
+    ):
+        """Verify a repeated availability check replaces the earlier listing at the next turn."""
+        sent, create = recording_create(
+            make_check_response("call_first", tomorrow_date), mock_final_response,
+            make_check_response("call_again", tomorrow_date), mock_final_response,
+            mock_final_response,
+        )
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=create)
+            mock_openai.return_value = mock_client
+
+            for message in ("Tomorrow?", "Tomorrow again?", "Thanks"):
+                response = client.post(
+                    "/chat", json={"message": message, "session_id": "compaction"}
+                )
+                assert response.status_code == 200
+
+        # Within the second turn the earlier listing is left as sent, so the prompt
+        # only grows; it is compacted when the third turn starts
+        assert [len(contents) for contents in sent] == [0, 1, 1, 2, 2]
+        assert sent[3][0].startswith("Found")
+        assert sent[4][0] == SUPERSEDED_RESULT
+        assert sent[4][1].startswith("Found")
+
+    def test_chat_compacts_long_turn_once_prompt_grows(
+        self, client, tomorrow_date, mock_final_response
+    ):
+        """Verify a single turn is compacted mid-loop once its prompt passes the threshold."""
+        threshold = get_settings().compact_prompt_tokens
+        sent, create = recording_create(
+            make_check_response("call_1", tomorrow_date, prompt_tokens=threshold // 4),
+            make_check_response("call_2", tomorrow_date, prompt_tokens=threshold),
+            make_check_response("call_3", tomorrow_date, prompt_tokens=threshold + 1),
+            mock_final_response,
+        )
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=create)
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Tomorrow?"})
+
+            assert response.status_code == 200
+
+        # Compacted before the third request, then left alone until the prompt
+        # grows by another threshold
+        assert sent[1] == [sent[1][0]] and sent[1][0].startswith("Found")
+        assert sent[2][0] == SUPERSEDED_RESULT
+        assert sent[3][0] == SUPERSEDED_RESULT
+        assert all(content.startswith("Found") for content in sent[3][1:])
+
+    def test_chat_memoizes_repeated_availability_checks(
+        self, client, booking_service, tomorrow_date, mock_final_response
+    ):
+        """Verify identical availability checks hit the booking service only once."""
+        first = make_tool_call_response(
+            ("check_availability", f'{{"date": "{tomorrow_date}"}}'),
+            ("check_availability", f'{{ "date":"{tomorrow_date}" }}'),
+        )
+        second = make_tool_call_response(
+            ("check_availability", f'{{"date": "{tomorrow_date}"}}'),
+        )
+
+        with patch("src.function_caller.get_llm_client") as mock_openai, patch.object(
+            booking_service,
+            "check_availability",
+            wraps=booking_service.check_availability,
+        ) as check:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[first, second, mock_final_response]
+            )
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Tomorrow?"})
+
+            assert response.status_code == 200
+            assert check.call_count == 1
+
+    def test_chat_booking_invalidates_memo(
+        self, client, booking_service, tomorrow_date, mock_final_response
+    ):
+        """Verify availability is re-read after a successful booking."""
+        check_args = f'{{"date": "{tomorrow_date}", "time": "16:00"}}'
+        responses = [
+            make_tool_call_response(("check_availability", check_args)),
+            make_tool_call_response(
+                ("book", f'{{"slot_id": "{tomorrow_date}_CourtB_1600"}}')
+            ),
+            make_tool_call_response(("check_availability", check_args)),
+            mock_final_response,
+        ]
+
+        with patch("src.function_caller.get_llm_client") as mock_openai, patch.object(
+            booking_service,
+            "check_availability",
+            wraps=booking_service.check_availability,
+        ) as check:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=responses)
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat", json={"message": "Book 4pm on court B"})
+
+            assert response.status_code == 200
+            assert check.call_count == 2
+
+    def test_chat_stream_sends_deltas_then_done(self, client, tomorrow_date):
+        """Verify streamed tool calls are assembled and the answer arrives as deltas."""
+        tool_stream = make_stream(
+            {
+                "role": "assistant",
+                "tool_calls": [{
+                    "index": 0,
+                    "id": "call_1",
+                    "type": "function",
+                    "function": {"name": "check_availability", "arguments": '{"date": '},
+                }],
+            },
+            {"tool_calls": [{"index": 0, "function": {"arguments": f'"{tomorrow_date}"}}'}}]},
+        )
+        text_stream = make_stream({"content": "Courts are "}, {"content": "free."})
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[tool_stream, text_stream]
+            )
+            mock_openai.return_value = mock_client
+
+            response = client.post("/chat/stream", json={"message": "Tomorrow?"})
+
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = parse_sse(response.text)
+            assert events == [
+                ("message", {"delta": "Courts are "}),
+                ("message", {"delta": "free."}),
+                ("done", {"response": "Courts are free."}),
+            ]
+            messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+            assert messages[-1]["role"] == "tool"
+            assert messages[-1]["content"].startswith("Found")
+
+    def test_chat_session_reuses_earlier_tool_results(
+        self, client, tomorrow_date, mock_final_response
+    ):
+        """Verify a follow-up turn in a session is sent the first turn's tool results."""
+        tool_turn = MagicMock(usage=MagicMock(total_tokens=500, prompt_tokens=500))
+        tool_turn.choices = [MagicMock(message=ChatCompletionMessage(
+            role="assistant",
+            tool_calls=[ChatCompletionMessageToolCall(
+                id="call_1",
+                type="function",
+                function={
+                    "name": "check_availability",
+                    "arguments": f'{{"date": "{tomorrow_date}"}}',
+                },
+            )],
+        ))]
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[tool_turn, mock_final_response, mock_final_response]
+            )
+            mock_openai.return_value = mock_client
+
+            first = client.post("/chat", json={"message": "Tomorrow?", "session_id": "s1"})
+            second = client.post(
+                "/chat", json={"message": "Book the second one", "session_id": "s1"}
+            )
+
+            assert first.json()["session_id"] == "s1"
+            assert second.status_code == 200
+            messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+            roles = [m["role"] if isinstance(m, dict) else m.role for m in messages]
+            # Only the newest turn is preceded by today's date; earlier turns are kept as sent
+            assert roles == ["system", "user", "assistant", "tool", "assistant", "system", "user"]
+            assert messages[0]["content"] == SYSTEM_PROMPT
+            assert messages[3]["content"].startswith("Found")
+            assert messages[-2]["content"].startswith("Today's date is")
+            assert messages[-1]["content"] == "Book the second one"
+
+    def test_chat_session_survives_malformed_tool_call(self, client, mock_final_response):
+        """Verify a stored call with invalid JSON arguments doesn't break later turns."""
+        tool_turn = MagicMock(usage=MagicMock(total_tokens=500, prompt_tokens=500))
+        tool_turn.choices = [MagicMock(message=ChatCompletionMessage(
+            role="assistant",
+            tool_calls=[ChatCompletionMessageToolCall(
+                id="call_1",
+                type="function",
+                function={"name": "check_availability", "arguments": '{"date": "2024'},
+            )],
+        ))]
+
+        with patch("src.function_caller.get_llm_client") as mock_openai:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create = AsyncMock(
+                side_effect=[tool_turn, mock_final_response, mock_final_response]
+            )
+            mock_openai.return_value = mock_client
+
+            first = client.post("/chat", json={"message": "Tomorrow?", "session_id": "s2"})
+            second = client.post("/chat", json={"message": "And now?", "session_id": "s2"})
+
+            assert first.status_code == 200
+            assert second.status_code == 200
+            messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+            assert messages[3]["content"].startswith(
+                "Error: invalid arguments for check_availability"
+            )
+
     def test_health_endpoint(self, client):
         """Verify health endpoint works."""
         response = client.get("/health")
@@ -9,22 +9,71 @@ The agent autonomously manages the conversation loop, deciding when to:
 Key difference from Pattern D: The agent controls the loop, not your code.
 """
 
-import os
+from collections.abc import AsyncIterator
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional
 
-from agents import Agent, Runner, RunContextWrapper, function_tool
+from agents import (
+    Agent,
+    OpenAIProvider,
+    RunConfig,
+    Runner,
+    function_tool,
+    set_tracing_export_api_key,
+)
+from agents.run import CallModelData, ModelInputData
+from openai.types.responses import ResponseTextDeltaEvent
 
 from .settings import get_settings
-from shared import create_booking_service
+from shared import (
+    BookingService,
+    ConversationStore,
+    create_booking_service,
+    create_conversation_store,
+)
+from shared.llm import get_llm_client
+
+
+@lru_cache
+def configure_openai() -> None:
+    """Give trace export the OpenAI API key, on the first run rather than at import."""
+    set_tracing_export_api_key(get_settings().get_openai_api_key())
+
+
+def _add_current_datetime(data: CallModelData[Any]) -> ModelInputData:
+    """
+    Append the current date and time to each model call's input.
+
+    It goes last rather than in the instructions, so the instructions, tool
+    schemas and conversation so far stay an unchanging prefix that the
+    provider can serve from its prompt cache.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+    return ModelInputData(
+        input=[*data.model_data.input, {"role": "system", "content": f"CURRENT DATETIME: {now}"}],
+        instructions=data.model_data.instructions,
+    )
+
+
+def _run_config(api_key: Optional[str] = None) -> RunConfig:
+    """
+    Run the agents on the shared LLM gateway's pooled client.
 
-# Set OpenAI API key for the Agents SDK
-settings = get_settings()
-os.environ["OPENAI_API_KEY"] = settings.get_openai_api_key()
+    Async callers pass ``api_key``, looked up without blocking the event loop.
+    """
+    configure_openai()
+    client = get_llm_client(api_key or get_settings().get_openai_api_key())
+    return RunConfig(
+        model_provider=OpenAIProvider(openai_client=client),
+        call_model_input_filter=_add_current_datetime,
+    )
 
 
-# Initialize the booking service
-booking_service = create_booking_service()
+@lru_cache
+def get_booking_service() -> BookingService:
+    """Get the booking service, created on first use."""
+    return create_booking_service()
 
 
 @function_tool
@@ -39,7 +88,7 @@ def check_availability(date: str, time: Optional[str] = None) -> str:
     Returns:
         Available slots or a message if none found
     """
-    slots = booking_service.check_availability(date, time)
+    slots = get_booking_service().check_availability(date, time)
 
     if not slots:
         return f"No available slots found for {date}" + (f" at {time}" if time else "")
@@ -63,7 +112,7 @@ def book_slot(slot_id: str) -> str:
         Booking confirmation or error message
     """
     try:
-        booking = booking_service.book(slot_id)
+        booking = get_booking_service().book(slot_id)
         return (
             f"Booking confirmed!\n"
             f"  Booking ID: {booking.booking_id}\n"
@@ -75,20 +124,11 @@ def book_slot(slot_id: str) -> str:
         return f"Booking failed: {e}"
 
 
-def get_instructions(
-    context: RunContextWrapper[Any], agent: Agent[Any]
-) -> str:
-    """Generate dynamic instructions with current datetime."""
-    now = datetime.now()
-    current_datetime = now.strftime("%Y-%m-%d %H:%M (%A)")
-
-    return f"""You are a helpful tennis court booking assistant. Your job is to help users:
+INSTRUCTIONS = """You are a helpful tennis court booking assistant. Your job is to help users:
 
 1. Find available tennis court slots
 2. Book slots for them
 
-CURRENT DATETIME: {current_datetime}
-
 WORKFLOW:
 - When a user wants to book, FIRST check availability for their preferred date/time
 - Present the available options clearly
@@ -96,7 +136,7 @@ WORKFLOW:
 - Always confirm the booking details
 
 GUIDELINES:
-- Convert relative dates ("tomorrow", "next Monday") to YYYY-MM-DD format
+- Convert relative dates ("tomorrow", "next Monday") to YYYY-MM-DD format, from the CURRENT DATETIME message
 - If no time is specified, show all available slots for that day
 - Be concise but friendly
 - Always use the tools to check real availability - don't make up slots
@@ -107,25 +147,78 @@ IMPORTANT: You control the conversation flow. Decide autonomously when to check
 # Create the booking agent
 booking_agent = Agent(
     name="Tennis Court Booking Agent",
-    instructions=get_instructions,
+    instructions=INSTRUCTIONS,
     tools=[check_availability, book_slot],
 )
 
 
-async def run_agent(user_message: str) -> str:
+@lru_cache
+def get_conversations() -> ConversationStore:
+    """Get the conversation history store for requests that send a session_id."""
+    settings = get_settings()
+    return create_conversation_store(
+        settings.session_store,
+        settings.session_db_path,
+        ttl=settings.session_ttl,
+        max_turns=settings.session_max_turns,
+        max_bytes=settings.session_max_bytes,
+    )
+
+
+def _agent_input(user_message: str, session_id: Optional[str]) -> str | list[dict[str, Any]]:
+    """The run input: just the message, or the session's earlier turns followed by it."""
+    if session_id is None:
+        return user_message
+    return [*get_conversations().load(session_id), {"role": "user", "content": user_message}]
+
+
+async def run_agent(user_message: str, session_id: Optional[str] = None) -> str:
     """
     Run the booking agent with a user message.
 
     Args:
         user_message: The user's request
+        session_id: Optional conversation to continue; its earlier turns are
+            sent with the message and this turn is saved to it
 
     Returns:
         The agent's response
     """
-    result = await Runner.run(booking_agent, user_message)
+    run_config = _run_config(await get_settings().get_openai_api_key_async())
+    result = await Runner.run(
+        booking_agent, _agent_input(user_message, session_id), run_config=run_config
+    )
+    if session_id is not None:
+        get_conversations().save(session_id, result.to_input_list())
     return result.final_output
 
 
+async def run_agent_streamed(
+    user_message: str, session_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Run the booking agent, yielding response text as it is generated.
+
+    Args:
+        user_message: The user's request
+        session_id: Optional conversation to continue, as in the non-streamed run
+
+    Yields:
+        Text deltas of the agent's response
+    """
+    run_config = _run_config(await get_settings().get_openai_api_key_async())
+    result = Runner.run_streamed(
+        booking_agent, _agent_input(user_message, session_id), run_config=run_config
+    )
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(
+            event.data, ResponseTextDeltaEvent
+        ):
+            yield event.data.delta
+    if session_id is not None:
+        get_conversations().save(session_id, result.to_input_list())
+
+
 def run_agent_sync(user_message: str) -> str:
     """
     Synchronous version for simpler use cases.
@@ -136,5 +229,17 @@ def run_agent_sync(user_message: str) -> str:
     Returns:
         The agent's response
     """
-    result = Runner.run_sync(booking_agent, user_message)
+    result = Runner.run_sync(booking_agent, user_message, run_config=_run_config())
     return result.final_output
+
+
+def warmup() -> None:
+    """
+    Do the first request's setup ahead of time, e.g. on a Lambda warmup event.
+
+    Importing this module loads the Agents SDK; this also resolves the
+    OpenAI API key and opens the booking and conversation stores.
+    """
+    configure_openai()
+    get_booking_service()
+    get_conversations()
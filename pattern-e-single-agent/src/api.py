@@ -5,16 +5,21 @@ Run with: uvicorn pattern-e.src.api:app --reload
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+from shared import AdmissionMiddleware, sse_stream
 
-from .agent import run_agent
 from .models import ChatRequest, ChatResponse
 
+# The agent module (and the Agents SDK) is imported on the first chat request, not
+# at cold start - see lambda_handler.warmup
 
 app = FastAPI(
     title="Pattern E: Single Agent",
     description="The agent autonomously manages the booking workflow",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -29,13 +34,31 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
     This is Pattern E: the agent controls its own reasoning loop.
     """
+    from .agent import run_agent
+
     try:
-        response = await run_agent(request.message)
-        return ChatResponse(response=response)
+        response = await run_agent(request.message, request.session_id)
+        return ChatResponse(response=response, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Send a message to the booking agent, streaming the reply as server-sent events.
+
+    The agent runs the same loop as /chat; its reply text is sent as each
+    delta arrives, followed by a final ``done`` event.
+    """
+    from .agent import run_agent_streamed
+
+    return StreamingResponse(
+        sse_stream(run_agent_streamed(request.message, request.session_id)),
+        media_type="text/event-stream",
+    )
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
@@ -1,7 +1,30 @@
-"""AWS Lambda handler using Mangum adapter for FastAPI."""
+"""
+AWS Lambda handler using Mangum adapter for FastAPI.
+
+Importing this module only loads FastAPI and the API models; the Agents SDK,
+the OpenAI key and the stores are set up on the first chat request, or ahead
+of it by a warmup event such as ``{"warmup": true}`` from a scheduled rule.
+"""
+
+from typing import Any
 
 from mangum import Mangum
 
 from .api import app
 
-handler = Mangum(app, lifespan="off")
+_asgi_handler = Mangum(app, lifespan="off")
+
+
+def warmup() -> None:
+    """Import the agent module and run its first-request setup."""
+    from .agent import warmup as warmup_agent
+
+    warmup_agent()
+
+
+def handler(event: dict[str, Any], context: Any) -> Any:
+    """Handle a warmup event directly, and everything else through Mangum."""
+    if event.get("warmup"):
+        warmup()
+        return {"warmed": True}
+    return _asgi_handler(event, context)
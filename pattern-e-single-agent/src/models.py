@@ -2,6 +2,8 @@
 Pydantic models for Pattern E: Single Agent.
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +15,11 @@ class ChatRequest(BaseModel):
         description="User message to the booking agent",
         examples=["Book a tennis court for tomorrow at 3pm"],
     )
+    session_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Conversation to continue; omit for a one-off request",
+    )
 
 
 class ChatResponse(BaseModel):
@@ -22,3 +29,4 @@ class ChatResponse(BaseModel):
         ...,
         description="Agent's response to the user",
     )
+    session_id: Optional[str] = Field(None, description="Session ID echoed from the request")
@@ -0,0 +1 @@
+"""Tests for Pattern E."""
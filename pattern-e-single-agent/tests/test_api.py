@@ -0,0 +1,108 @@
+"""Integration tests for Pattern E API."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+from openai.types.responses import ResponseTextDeltaEvent
+
+from shared.import_profile import format_report, profile_import
+from src.agent import booking_agent, configure_openai
+from src.api import app
+from src.lambda_handler import handler
+
+# Import time allowed for a lambda_handler module, in ms
+COLD_START_BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", "1000"))
+
+
+def streamed_result(*deltas, error=None):
+    """A mock Runner.run_streamed result whose events carry text deltas, then raise ``error``."""
+
+    async def stream_events():
+        for delta in deltas:
+            yield MagicMock(
+                type="raw_response_event",
+                data=ResponseTextDeltaEvent.model_construct(delta=delta),
+            )
+        if error is not None:
+            raise error
+
+    result = MagicMock(stream_events=stream_events)
+    result.to_input_list.return_value = []
+    return result
+
+
+def sse_events(body):
+    """Split a server-sent events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+class TestChatEndpoint:
+    """Tests for the /chat endpoint."""
+
+    def test_chat_runs_booking_agent(self):
+        """Verify /chat runs the booking agent with the message."""
+        result = MagicMock(final_output="Done")
+        with patch("src.agent.Runner.run", AsyncMock(return_value=result)) as run:
+            response = TestClient(app).post("/chat", json={"message": "Any courts tomorrow?"})
+
+        assert response.status_code == 200
+        assert response.json()["response"] == "Done"
+        assert run.call_args.args == (booking_agent, "Any courts tomorrow?")
+
+    def test_chat_stream_sends_deltas_then_done(self):
+        """Verify /chat/stream sends each text delta, then the full reply."""
+        result = streamed_result("Court A ", "is free.")
+        with patch("src.agent.Runner.run_streamed", MagicMock(return_value=result)):
+            response = TestClient(app).post("/chat/stream", json={"message": "Any courts?"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert sse_events(response.text) == [
+            ("message", {"delta": "Court A "}),
+            ("message", {"delta": "is free."}),
+            ("done", {"response": "Court A is free."}),
+        ]
+
+    def test_chat_stream_hides_error_details(self):
+        """Verify a failure mid-stream is reported without the exception's text."""
+        result = streamed_result("Court ", error=RuntimeError("Incorrect API key: sk-abc123"))
+        with patch("src.agent.Runner.run_streamed", MagicMock(return_value=result)):
+            response = TestClient(app).post("/chat/stream", json={"message": "Any courts?"})
+
+        assert sse_events(response.text)[-1] == ("error", {"detail": "Internal error"})
+        assert "sk-abc123" not in response.text
+
+
+class TestColdStart:
+    """Tests for keeping Lambda init work out of the handler import."""
+
+    def test_handler_import_skips_agents_sdk(self):
+        """Verify importing the handler stays within the cold-start budget."""
+        profile = profile_import("src.lambda_handler", Path(__file__).parent.parent)
+
+        assert "agents" not in profile.modules
+        assert "openai" not in profile.modules
+        assert profile.total_ms < COLD_START_BUDGET_MS, format_report(profile)
+
+    def test_warmup_event(self):
+        """Verify a warmup event runs the first-request setup instead of the app."""
+        assert handler({"warmup": True}, None) == {"warmed": True}
+        assert configure_openai.cache_info().currsize == 1
+
+
+class TestHealthEndpoint:
+    """Tests for the /health endpoint."""
+
+    def test_health_endpoint(self):
+        """Verify health endpoint works."""
+        response = TestClient(app).get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["pattern"] == "E"
@@ -8,21 +8,70 @@ A manager agent routes requests to specialized agents:
 Key difference from Pattern E: Multiple focused agents instead of one agent with multiple tools.
 """
 
-import os
+from collections.abc import AsyncIterator
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional
 
-from agents import Agent, Runner, RunContextWrapper, function_tool
+from agents import (
+    Agent,
+    OpenAIProvider,
+    RunConfig,
+    Runner,
+    function_tool,
+    set_tracing_export_api_key,
+)
+from agents.run import CallModelData, ModelInputData
+from openai.types.responses import ResponseTextDeltaEvent
 
+from .router import get_pre_router
 from .settings import get_settings
-from shared import create_booking_service
+from shared import (
+    BookingService,
+    ConversationStore,
+    create_booking_service,
+    create_conversation_store,
+)
+from shared.llm import get_llm_client
+
+
+@lru_cache
+def configure_openai() -> None:
+    """Give trace export the OpenAI API key, on the first run rather than at import."""
+    set_tracing_export_api_key(get_settings().get_openai_api_key())
+
 
-# Set OpenAI API key for the Agents SDK
-settings = get_settings()
-os.environ["OPENAI_API_KEY"] = settings.get_openai_api_key()
+def _add_current_datetime(data: CallModelData[Any]) -> ModelInputData:
+    """
+    Send the current date and time as the last input item of every model call,
+    for whichever agent is running, leaving each agent's instructions and the
+    history a stable prompt prefix.
+    """
+    now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+    return ModelInputData(
+        input=[*data.model_data.input, {"role": "system", "content": f"CURRENT DATETIME: {now}"}],
+        instructions=data.model_data.instructions,
+    )
 
-# Initialize the booking service
-booking_service = create_booking_service()
+
+def _run_config(api_key: Optional[str] = None) -> RunConfig:
+    """
+    Run the agents on the shared LLM gateway's pooled client.
+
+    Async callers pass ``api_key``, looked up without blocking the event loop.
+    """
+    configure_openai()
+    client = get_llm_client(api_key or get_settings().get_openai_api_key())
+    return RunConfig(
+        model_provider=OpenAIProvider(openai_client=client),
+        call_model_input_filter=_add_current_datetime,
+    )
+
+
+@lru_cache
+def get_booking_service() -> BookingService:
+    """Get the booking service, created on first use."""
+    return create_booking_service()
 
 
 # =============================================================================
@@ -42,7 +91,7 @@ def check_availability(date: str, time: Optional[str] = None) -> str:
     Returns:
         Available slots or a message if none found
     """
-    slots = booking_service.check_availability(date, time)
+    slots = get_booking_service().check_availability(date, time)
 
     if not slots:
         return f"No available slots found for {date}" + (f" at {time}" if time else "")
@@ -66,7 +115,7 @@ def book_slot(slot_id: str) -> str:
         Booking confirmation or error message
     """
     try:
-        booking = booking_service.book(slot_id)
+        booking = get_booking_service().book(slot_id)
         return (
             f"Booking confirmed!\n"
             f"  Booking ID: {booking.booking_id}\n"
@@ -83,21 +132,12 @@ def book_slot(slot_id: str) -> str:
 # =============================================================================
 
 
-def get_availability_instructions(
-    context: RunContextWrapper[Any], agent: Agent[Any]
-) -> str:
-    """Instructions for the Availability Specialist."""
-    now = datetime.now()
-    current_datetime = now.strftime("%Y-%m-%d %H:%M (%A)")
-
-    return f"""You are the Availability Specialist for tennis court bookings.
-
-CURRENT DATETIME: {current_datetime}
+AVAILABILITY_INSTRUCTIONS = """You are the Availability Specialist for tennis court bookings.
 
 YOUR ROLE:
 - Check tennis court availability for requested dates/times
 - Present available slots clearly to users
-- Convert relative dates ("tomorrow", "next Monday") to YYYY-MM-DD format
+- Convert relative dates ("tomorrow", "next Monday") to YYYY-MM-DD format, from the CURRENT DATETIME message
 
 GUIDELINES:
 - Always use the check_availability tool - never make up slots
@@ -106,11 +146,7 @@ GUIDELINES:
 - After showing availability, let the user know they can book a slot"""
 
 
-def get_booking_instructions(
-    context: RunContextWrapper[Any], agent: Agent[Any]
-) -> str:
-    """Instructions for the Booking Specialist."""
-    return """You are the Booking Specialist for tennis court bookings.
+BOOKING_INSTRUCTIONS = """You are the Booking Specialist for tennis court bookings.
 
 YOUR ROLE:
 - Book tennis court slots when users confirm their choice
@@ -124,14 +160,14 @@ GUIDELINES:
 
 availability_agent = Agent(
     name="Availability Specialist",
-    instructions=get_availability_instructions,
+    instructions=AVAILABILITY_INSTRUCTIONS,
     tools=[check_availability],
 )
 
 
 booking_agent = Agent(
     name="Booking Specialist",
-    instructions=get_booking_instructions,
+    instructions=BOOKING_INSTRUCTIONS,
     tools=[book_slot],
 )
 
@@ -141,16 +177,7 @@ booking_agent = Agent(
 # =============================================================================
 
 
-def get_manager_instructions(
-    context: RunContextWrapper[Any], agent: Agent[Any]
-) -> str:
-    """Instructions for the Manager Agent."""
-    now = datetime.now()
-    current_datetime = now.strftime("%Y-%m-%d %H:%M (%A)")
-
-    return f"""You are the Tennis Court Booking Manager. Your job is to route user requests to the right specialist.
-
-CURRENT DATETIME: {current_datetime}
+MANAGER_INSTRUCTIONS = """You are the Tennis Court Booking Manager. Your job is to route user requests to the right specialist.
 
 AVAILABLE SPECIALISTS:
 1. Availability Specialist - Checks available tennis court slots
@@ -172,7 +199,7 @@ Be helpful and route requests efficiently."""
 
 manager_agent = Agent(
     name="Tennis Court Booking Manager",
-    instructions=get_manager_instructions,
+    instructions=MANAGER_INSTRUCTIONS,
     handoffs=[availability_agent, booking_agent],
 )
 
@@ -181,21 +208,86 @@ manager_agent = Agent(
 # Runner Functions
 # =============================================================================
 
+_specialists = {"availability": availability_agent, "booking": booking_agent}
+
+
+def starting_agent(user_message: str) -> Agent:
+    """Pick the agent to start with: a specialist if the pre-router is sure, else the manager."""
+    specialist = get_pre_router().route(user_message)
+    return _specialists[specialist] if specialist else manager_agent
 
-async def run_manager(user_message: str) -> str:
+
+@lru_cache
+def get_conversations() -> ConversationStore:
+    """Get the conversation history store for requests that send a session_id."""
+    settings = get_settings()
+    return create_conversation_store(
+        settings.session_store,
+        settings.session_db_path,
+        ttl=settings.session_ttl,
+        max_turns=settings.session_max_turns,
+        max_bytes=settings.session_max_bytes,
+    )
+
+
+def _agent_input(user_message: str, session_id: Optional[str]) -> str | list[dict[str, Any]]:
+    """The run input: just the message, or the session's earlier turns followed by it."""
+    if session_id is None:
+        return user_message
+    return [*get_conversations().load(session_id), {"role": "user", "content": user_message}]
+
+
+async def run_manager(user_message: str, session_id: Optional[str] = None) -> str:
     """
     Run the manager agent with a user message.
 
+    Obvious requests skip the manager and go straight to a specialist.
+
     Args:
         user_message: The user's request
+        session_id: Optional conversation to continue; its earlier turns are
+            sent with the message and this turn is saved to it
 
     Returns:
         The final response after routing and specialist handling
     """
-    result = await Runner.run(manager_agent, user_message)
+    agent = starting_agent(user_message)
+    run_config = _run_config(await get_settings().get_openai_api_key_async())
+    result = await Runner.run(
+        agent, _agent_input(user_message, session_id), run_config=run_config
+    )
+    if session_id is not None:
+        get_conversations().save(session_id, result.to_input_list())
     return result.final_output
 
 
+async def run_manager_streamed(
+    user_message: str, session_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Run the manager agent, yielding response text as it is generated.
+
+    Args:
+        user_message: The user's request
+        session_id: Optional conversation to continue, as in the non-streamed run
+
+    Yields:
+        Text deltas of the response after routing and specialist handling
+    """
+    agent = starting_agent(user_message)
+    run_config = _run_config(await get_settings().get_openai_api_key_async())
+    result = Runner.run_streamed(
+        agent, _agent_input(user_message, session_id), run_config=run_config
+    )
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(
+            event.data, ResponseTextDeltaEvent
+        ):
+            yield event.data.delta
+    if session_id is not None:
+        get_conversations().save(session_id, result.to_input_list())
+
+
 def run_manager_sync(user_message: str) -> str:
     """
     Synchronous version for simpler use cases.
@@ -206,5 +298,17 @@ def run_manager_sync(user_message: str) -> str:
     Returns:
         The final response after routing and specialist handling
     """
-    result = Runner.run_sync(manager_agent, user_message)
+    result = Runner.run_sync(starting_agent(user_message), user_message, run_config=_run_config())
     return result.final_output
+
+
+def warmup() -> None:
+    """
+    Do the first request's setup ahead of time, e.g. on a Lambda warmup event.
+
+    Importing this module loads the Agents SDK; this also resolves the
+    OpenAI API key and opens the booking and conversation stores.
+    """
+    configure_openai()
+    get_booking_service()
+    get_conversations()
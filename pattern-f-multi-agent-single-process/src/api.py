@@ -5,16 +5,22 @@ Run with: uvicorn pattern-f-multi-agent-single-process.src.api:app --reload
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+from shared import AdmissionMiddleware, sse_stream
 
-from .agent import run_manager
 from .models import ChatRequest, ChatResponse
+from .router import get_pre_router
 
+# The agent module (and the Agents SDK) is imported on the first chat request, not
+# at cold start - see lambda_handler.warmup
 
 app = FastAPI(
     title="Pattern F: Multi-Agent (Single Process)",
     description="Manager routes requests to specialized agents in shared runtime",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -28,13 +34,37 @@ async def chat(request: ChatRequest) -> ChatResponse:
 
     This is Pattern F: multiple agents in a shared runtime.
     """
+    from .agent import run_manager
+
     try:
-        response = await run_manager(request.message)
-        return ChatResponse(response=response)
+        response = await run_manager(request.message, request.session_id)
+        return ChatResponse(response=response, session_id=request.session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Send a message to the multi-agent booking system, streaming the reply as server-sent events.
+
+    Routing works exactly as in /chat; the specialist's reply text is sent
+    as each delta arrives, followed by a final ``done`` event.
+    """
+    from .agent import run_manager_streamed
+
+    return StreamingResponse(
+        sse_stream(run_manager_streamed(request.message, request.session_id)),
+        media_type="text/event-stream",
+    )
+
+
+@app.get("/metrics/router")
+async def router_metrics() -> dict:
+    """How requests were routed, and how many manager LLM calls the pre-router saved."""
+    return get_pre_router().metrics.snapshot()
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
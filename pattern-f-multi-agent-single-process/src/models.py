@@ -2,6 +2,8 @@
 Pydantic models for Pattern F: Multi-Agent (Shared Runtime).
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +15,11 @@ class ChatRequest(BaseModel):
         description="User message to the booking system",
         examples=["What courts are available tomorrow?"],
     )
+    session_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Conversation to continue; omit for a one-off request",
+    )
 
 
 class ChatResponse(BaseModel):
@@ -22,3 +29,4 @@ class ChatResponse(BaseModel):
         ...,
         description="Response from the multi-agent system",
     )
+    session_id: Optional[str] = Field(None, description="Session ID echoed from the request")
@@ -0,0 +1,126 @@
+"""
+Deterministic pre-router for Pattern F.
+
+The manager agent only decides which specialist should handle a message,
+which costs a full LLM call. Obvious cases - a message naming a slot ID to
+book, or a plain availability question - are routed straight to the
+specialist here; anything else still goes to the manager.
+"""
+
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Literal, Optional
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+Specialist = Literal["availability", "booking"]
+
+# e.g. "2024-12-15_CourtA_1400", see shared.make_slot_id
+SLOT_ID_PATTERN = re.compile(r"\b\d{4}-\d{2}-\d{2}_Court[A-Z]_\d{4}\b")
+
+_BOOKING_WORDS = re.compile(r"\b(book|reserve|take|grab|confirm)\b", re.IGNORECASE)
+_AVAILABILITY_WORDS = re.compile(
+    r"\b(available|availability|free|open|slots?|what times?|any courts?)\b",
+    re.IGNORECASE,
+)
+# Requests the specialists don't cover, or where keywords could mislead
+_MANAGER_WORDS = re.compile(r"\b(cancel|change|move|not|don'?t|instead)\b", re.IGNORECASE)
+
+
+def classify(message: str) -> Optional[Specialist]:
+    """
+    Route a message by rules alone.
+
+    Args:
+        message: The user's message
+
+    Returns:
+        The specialist to hand the message to, or None if it is ambiguous
+    """
+    if _MANAGER_WORDS.search(message):
+        return None
+
+    wants_booking = bool(_BOOKING_WORDS.search(message))
+    asks_availability = bool(_AVAILABILITY_WORDS.search(message))
+
+    if asks_availability and not wants_booking:
+        return "availability"
+    # The booking specialist needs a slot ID; without one, the manager
+    # sends the user to availability first
+    if SLOT_ID_PATTERN.search(message) and not asks_availability:
+        return "booking"
+    return None
+
+
+@dataclass
+class RouterMetrics:
+    """Counts of how requests were routed."""
+
+    requests: int = 0
+    routed: dict[str, int] = field(default_factory=dict)
+    to_manager: int = 0
+
+    @property
+    def llm_calls_saved(self) -> int:
+        """Manager LLM calls skipped: one per request routed directly."""
+        return self.requests - self.to_manager
+
+    def snapshot(self) -> dict:
+        """Metrics as a JSON-serializable dict."""
+        return {
+            "requests": self.requests,
+            "routed": dict(self.routed),
+            "to_manager": self.to_manager,
+            "llm_calls_saved": self.llm_calls_saved,
+        }
+
+
+class PreRouter:
+    """
+    Routes messages with classify(), then an optional fallback classifier.
+
+    The fallback - e.g. a small local intent model - is only asked about
+    messages the rules leave ambiguous, and may also return None.
+    """
+
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        fallback: Optional[Callable[[str], Optional[Specialist]]] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.fallback = fallback
+        self.metrics = RouterMetrics()
+
+    def route(self, message: str) -> Optional[Specialist]:
+        """
+        Pick the specialist for a message and record the decision.
+
+        Returns:
+            The specialist to start with, or None to start with the manager
+        """
+        self.metrics.requests += 1
+        specialist = None
+        if self.enabled:
+            specialist = classify(message)
+            if specialist is None and self.fallback is not None:
+                specialist = self.fallback(message)
+
+        if specialist is None:
+            self.metrics.to_manager += 1
+        else:
+            self.metrics.routed[specialist] = self.metrics.routed.get(specialist, 0) + 1
+            logger.info("Pre-routed to %s specialist, skipping manager", specialist)
+        return specialist
+
+
+@lru_cache
+def get_pre_router() -> PreRouter:
+    """Get the process-wide pre-router, configured from settings."""
+    return PreRouter(enabled=get_settings().prerouter_enabled)
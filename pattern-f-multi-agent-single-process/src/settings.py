@@ -1,19 +1,10 @@
 """Settings for Pattern F - supports local dev and Lambda deployment."""
 
 from functools import lru_cache
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from shared import get_env_file
-
-
-def _get_secret_from_aws(secret_arn: str) -> str:
-    """Fetch secret value from AWS Secrets Manager."""
-    import boto3
-
-    client = boto3.client("secretsmanager")
-    response = client.get_secret_value(SecretId=secret_arn)
-    return response["SecretString"]
+from shared import get_env_file, get_secret, get_secret_async
 
 
 class Settings(BaseSettings):
@@ -25,14 +16,30 @@ class Settings(BaseSettings):
     openai_secret_arn: Optional[str] = None
     openai_model: str = "gpt-4o-mini"
 
+    # Route obvious requests straight to a specialist, skipping the manager LLM call
+    prerouter_enabled: bool = True
+
+    # Conversation history for requests that send a session_id
+    session_store: Literal["memory", "sqlite"] = "memory"
+    session_db_path: Optional[str] = None
+    session_ttl: float = 1800.0
+    session_max_turns: int = 10
+    session_max_bytes: int = 64_000
+
     def get_openai_api_key(self) -> str:
-        """Get OpenAI API key from env var or Secrets Manager."""
+        """Get OpenAI API key from env var or Secrets Manager (cached, see shared.get_secret)."""
         if self.openai_api_key:
             return self.openai_api_key
         if self.openai_secret_arn:
-            return _get_secret_from_aws(self.openai_secret_arn)
+            return get_secret(self.openai_secret_arn)
         raise ValueError("No OpenAI API key configured. Set OPENAI_API_KEY or OPENAI_SECRET_ARN.")
 
+    async def get_openai_api_key_async(self) -> str:
+        """get_openai_api_key() for async code: a Secrets Manager fetch won't block the loop."""
+        if self.openai_secret_arn and not self.openai_api_key:
+            return await get_secret_async(self.openai_secret_arn)
+        return self.get_openai_api_key()
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,179 @@
+"""Integration tests for Pattern F API."""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from openai.types.responses import ResponseTextDeltaEvent
+
+from shared.import_profile import format_report, profile_import
+from src.agent import availability_agent, booking_agent, configure_openai, manager_agent
+from src.api import app
+from src.lambda_handler import handler
+from src.router import PreRouter, classify
+
+# Import time allowed for a lambda_handler module, in ms
+COLD_START_BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", "1000"))
+
+
+class TestPreRouter:
+    """Tests for routing obvious requests past the manager."""
+
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            ("What courts are available tomorrow?", "availability"),
+            ("Any free slots on 2024-12-15 at 14:00?", "availability"),
+            ("Book 2024-12-15_CourtA_1400 please", "booking"),
+            ("2024-12-15_CourtB_0900", "booking"),
+            ("Is 2024-12-15_CourtA_1400 still available?", "availability"),
+            ("Book a court tomorrow at 3pm", None),
+            ("Cancel my booking for 2024-12-15_CourtA_1400", None),
+            ("Hello", None),
+        ],
+    )
+    def test_classify(self, message, expected):
+        """Verify only unambiguous messages are routed by rules."""
+        assert classify(message) == expected
+
+    def test_fallback_sees_only_ambiguous_messages(self):
+        """Verify the optional fallback classifier is consulted after the rules."""
+        fallback = MagicMock(return_value="availability")
+        router = PreRouter(fallback=fallback)
+
+        assert router.route("Book 2024-12-15_CourtA_1400") == "booking"
+        assert router.route("Tennis tomorrow?") == "availability"
+        fallback.assert_called_once_with("Tennis tomorrow?")
+
+    def test_disabled_router_always_uses_manager(self):
+        """Verify a disabled router sends everything to the manager."""
+        router = PreRouter(enabled=False)
+
+        assert router.route("What courts are available tomorrow?") is None
+        assert router.metrics.llm_calls_saved == 0
+
+
+def streamed_result(*deltas, error=None):
+    """A mock Runner.run_streamed result whose events carry text deltas, then raise ``error``."""
+
+    async def stream_events():
+        for delta in deltas:
+            yield MagicMock(
+                type="raw_response_event",
+                data=ResponseTextDeltaEvent.model_construct(delta=delta),
+            )
+        if error is not None:
+            raise error
+
+    result = MagicMock(stream_events=stream_events)
+    result.to_input_list.return_value = []
+    return result
+
+
+def sse_events(body):
+    """Split a server-sent events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+class TestChatEndpoint:
+    """Tests for the /chat endpoint."""
+
+    @pytest.mark.parametrize(
+        "message,agent",
+        [
+            ("What courts are available tomorrow?", availability_agent),
+            ("Book 2024-12-15_CourtA_1400", booking_agent),
+            ("Book a court tomorrow at 3pm", manager_agent),
+        ],
+    )
+    def test_chat_starts_with_routed_agent(self, message, agent):
+        """Verify obvious requests skip the manager agent."""
+        result = MagicMock(final_output="Done")
+        with patch("src.agent.Runner.run", AsyncMock(return_value=result)) as run:
+            response = TestClient(app).post("/chat", json={"message": message})
+
+        assert response.status_code == 200
+        assert response.json()["response"] == "Done"
+        assert run.call_args.args[0] is agent
+
+    def test_chat_stream_sends_routed_agent_deltas(self):
+        """Verify /chat/stream streams the routed agent's reply, then the full reply."""
+        result = streamed_result("Court A ", "is free.")
+        with patch(
+            "src.agent.Runner.run_streamed", MagicMock(return_value=result)
+        ) as run_streamed:
+            response = TestClient(app).post(
+                "/chat/stream", json={"message": "What courts are available tomorrow?"}
+            )
+
+        assert response.status_code == 200
+        assert run_streamed.call_args.args[0] is availability_agent
+        assert sse_events(response.text) == [
+            ("message", {"delta": "Court A "}),
+            ("message", {"delta": "is free."}),
+            ("done", {"response": "Court A is free."}),
+        ]
+
+    def test_chat_session_sends_earlier_turns(self):
+        """Verify a follow-up in a session runs with the earlier turns as input."""
+        first_turn = [
+            {"role": "user", "content": "What is available tomorrow?"},
+            {"role": "assistant", "content": "Court A at 09:00"},
+        ]
+        result = MagicMock(final_output="Done")
+        result.to_input_list.return_value = first_turn
+        with patch("src.agent.Runner.run", AsyncMock(return_value=result)) as run:
+            client = TestClient(app)
+            client.post("/chat", json={"message": first_turn[0]["content"], "session_id": "s1"})
+            response = client.post("/chat", json={"message": "Book it", "session_id": "s1"})
+
+        assert response.json()["session_id"] == "s1"
+        assert run.call_args.args[1] == [*first_turn, {"role": "user", "content": "Book it"}]
+
+    def test_router_metrics(self):
+        """Verify the metrics endpoint reports manager calls saved."""
+        client = TestClient(app)
+        before = client.get("/metrics/router").json()
+        with patch("src.agent.Runner.run", AsyncMock(return_value=MagicMock(final_output="ok"))):
+            client.post("/chat", json={"message": "What is available tomorrow?"})
+            client.post("/chat", json={"message": "Hello"})
+        after = client.get("/metrics/router").json()
+
+        assert after["requests"] - before["requests"] == 2
+        assert after["llm_calls_saved"] - before["llm_calls_saved"] == 1
+        assert after["to_manager"] - before["to_manager"] == 1
+
+
+class TestHealthEndpoint:
+    """Tests for the /health endpoint."""
+
+    def test_health_endpoint(self):
+        """Verify health endpoint works."""
+        response = TestClient(app).get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["pattern"] == "F"
+
+
+class TestColdStart:
+    """Tests for keeping Lambda init work out of the handler import."""
+
+    def test_handler_import_skips_agents_sdk(self):
+        """Verify importing the handler stays within the cold-start budget."""
+        profile = profile_import("src.lambda_handler", Path(__file__).parent.parent)
+
+        assert "agents" not in profile.modules
+        assert "openai" not in profile.modules
+        assert profile.total_ms < COLD_START_BUDGET_MS, format_report(profile)
+
+    def test_warmup_event(self):
+        """Verify a warmup event runs the first-request setup instead of the app."""
+        assert handler({"warmup": True}, None) == {"warmed": True}
+        assert configure_openai.cache_info().currsize == 1
@@ -0,0 +1,75 @@
+"""
+Payload benchmark for Manager <-> Availability Specialist calls in Pattern G.
+
+Compares the original text responses with structured responses in JSON and
+MessagePack, measuring bytes on the wire and the prompt tokens the manager's
+LLM sees for the tool output.
+
+Run with: uv run benchmarks/payload_size.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path so we can import from src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-key")
+
+from fastapi.testclient import TestClient
+
+from src.availability.api import app as availability_app
+from src.manager.agent import render_slots
+from src.wire import MSGPACK, decode_body
+
+DAYS = 5
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when its encoding is available, else estimate at 4 chars/token."""
+    try:
+        import tiktoken
+
+        return len(tiktoken.get_encoding("o200k_base").encode(text))
+    except Exception:
+        return len(text) // 4
+
+
+def main():
+    """Measure one batch of DAYS availability checks in each mode."""
+    client = TestClient(availability_app)
+    dates = [
+        (datetime.now() + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(DAYS)
+    ]
+
+    def batch(fmt: str, accept: str = "application/json") -> tuple[int, list[dict]]:
+        response = client.post(
+            "/process/batch",
+            json={"requests": [{"date": d, "format": fmt} for d in dates]},
+            headers={"Accept": accept},
+        )
+        body = decode_body(response.content, response.headers["content-type"])
+        return len(response.content), body["results"]
+
+    text_bytes, text_results = batch("text")
+    json_bytes, structured = batch("structured")
+    msgpack_bytes, _ = batch("structured", MSGPACK)
+
+    text_prompt = "\n".join(r["result"] for r in text_results)
+    compact_prompt = "\n".join(
+        render_slots(d, None, r["slots"]) for d, r in zip(dates, structured)
+    )
+
+    print("=" * 56)
+    print(f"Pattern G: availability payloads ({DAYS} dates, one batch)")
+    print("=" * 56)
+    print(f"{'mode':<28} {'wire bytes':>12} {'prompt tokens':>14}")
+    print(f"{'text (original)':<28} {text_bytes:>12} {count_tokens(text_prompt):>14}")
+    print(f"{'structured, JSON':<28} {json_bytes:>12} {count_tokens(compact_prompt):>14}")
+    print(f"{'structured, MessagePack':<28} {msgpack_bytes:>12} {count_tokens(compact_prompt):>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark for the Manager -> specialist HTTP transport in Pattern G.
+
+Starts the Availability Specialist locally and compares:
+- a new httpx.Client per tool call (the original approach)
+- the shared pooled httpx.AsyncClient, sequential calls
+- the shared pooled httpx.AsyncClient, concurrent calls
+
+Reports per-call latency, throughput and how many TCP connections the
+specialist saw, which shows connection reuse directly.
+
+Run with: uv run benchmarks/specialist_transport.py
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path so we can import from src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-key")
+
+import httpx
+import uvicorn
+
+from src.availability.api import app as availability_app
+from src.manager.specialists import SpecialistClient, close_http_client
+
+CALLS = 200
+
+
+class ConnectionCounter:
+    """ASGI middleware recording each distinct client connection."""
+
+    def __init__(self, app):
+        self.app = app
+        self.peers: set[tuple] = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            self.peers.add(tuple(scope["client"]))
+        await self.app(scope, receive, send)
+
+
+def start_server(app) -> tuple[uvicorn.Server, str]:
+    """Run an ASGI app with uvicorn in a background thread."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def bench_client_per_call(url: str, payload: dict) -> float:
+    """Original approach: open a new client (and connection) for every call."""
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        with httpx.Client(timeout=30.0) as client:
+            client.post(f"{url}/process", json=payload).raise_for_status()
+    return time.perf_counter() - start
+
+
+async def bench_pooled(url: str, payload: dict, concurrent: bool) -> float:
+    """Shared pooled client, either one call at a time or all at once."""
+    client = SpecialistClient("availability", url, 30.0)
+    start = time.perf_counter()
+    if concurrent:
+        await asyncio.gather(*(client.process(payload) for _ in range(CALLS)))
+    else:
+        for _ in range(CALLS):
+            await client.process(payload)
+    elapsed = time.perf_counter() - start
+    await close_http_client()
+    return elapsed
+
+
+def main():
+    """Run each transport against a local Availability Specialist."""
+    counter = ConnectionCounter(availability_app)
+    server, url = start_server(counter)
+    date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    payload = {"date": date, "time": None}
+
+    runs = [
+        ("new client per call", lambda: bench_client_per_call(url, payload)),
+        ("pooled, sequential", lambda: asyncio.run(bench_pooled(url, payload, False))),
+        ("pooled, concurrent", lambda: asyncio.run(bench_pooled(url, payload, True))),
+    ]
+
+    print("=" * 66)
+    print(f"Pattern G: Manager -> Availability transport ({CALLS} calls)")
+    print("=" * 66)
+    print(f"{'transport':<22} {'ms/call':>10} {'req/s':>10} {'connections':>14}")
+    for name, run in runs:
+        counter.peers.clear()
+        elapsed = run()
+        print(
+            f"{name:<22} {elapsed * 1000 / CALLS:>10.2f} "
+            f"{CALLS / elapsed:>10.0f} {len(counter.peers):>14}"
+        )
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark for what the multi-process split costs Pattern G per tool call.
+
+Times one check_availability call through each transport the Manager
+supports, against a direct in-process function call (what Pattern F does):
+- direct: the availability function itself, no HTTP
+- asgi: the specialist FastAPI app called in-process via httpx.ASGITransport
+- uds: a local specialist service on a Unix domain socket
+- tcp: a local specialist service on 127.0.0.1
+
+Each step adds one layer: asgi - direct is the HTTP/ASGI framing cost,
+uds - asgi the process hop, tcp - uds the TCP stack.
+
+Run with: uv run benchmarks/transport_overhead.py
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path so we can import from src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-key")
+
+import uvicorn
+
+from src.availability.agent import process_availability_request
+from src.availability.api import app as availability_app
+from src.manager.specialists import SpecialistClient, close_http_client, transport_factory
+
+CALLS = 500
+
+
+def start_server(**bind) -> uvicorn.Server:
+    """Run the Availability Specialist with uvicorn in a background thread."""
+    server = uvicorn.Server(
+        uvicorn.Config(availability_app, log_level="warning", **bind)
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def free_port() -> int:
+    """Pick a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def bench_client(client: SpecialistClient, payload: dict) -> float:
+    """Mean seconds per sequential call through a specialist client."""
+    await client.process(payload)  # warm up the connection
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await client.process(payload)
+    elapsed = time.perf_counter() - start
+    await close_http_client()
+    await client.aclose()
+    return elapsed / CALLS
+
+
+def bench_direct(payload: dict) -> float:
+    """Mean seconds per direct in-process call."""
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        process_availability_request(payload["date"], payload["time"])
+    return (time.perf_counter() - start) / CALLS
+
+
+def main():
+    """Time each transport against the same availability query."""
+    date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    payload = {"date": date, "time": None}
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "availability.sock")
+    port = free_port()
+    servers = [start_server(uds=socket_path), start_server(host="127.0.0.1", port=port)]
+
+    clients = {
+        "asgi": ("http://availability", transport_factory("asgi", "availability")),
+        "uds": ("http://availability", transport_factory("uds", "availability", socket_path)),
+        "tcp": (f"http://127.0.0.1:{port}", transport_factory("http", "availability")),
+    }
+
+    results = [("direct (Pattern F)", bench_direct(payload))]
+    for name, (url, transport) in clients.items():
+        client = SpecialistClient("availability", url, 30.0, transport=transport)
+        results.append((name, asyncio.run(bench_client(client, payload))))
+
+    print("=" * 56)
+    print(f"Pattern G: one availability tool call ({CALLS} calls)")
+    print("=" * 56)
+    print(f"{'transport':<20} {'ms/call':>10} {'overhead ms':>14}")
+    baseline = results[0][1]
+    for name, seconds in results:
+        print(f"{name:<20} {seconds * 1000:>10.3f} {(seconds - baseline) * 1000:>14.3f}")
+
+    for server in servers:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
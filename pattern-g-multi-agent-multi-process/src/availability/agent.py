@@ -4,13 +4,41 @@ Availability Specialist Agent - Pattern G
 Runs as a separate service, handles availability queries.
 """
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
-from shared import create_booking_service
+from shared import Slot
 
-# Initialize the booking service
-booking_service = create_booking_service()
+from ..settings import get_settings
+from ..store import get_booking_service
+
+# New in every process: store versions restart with a fresh store (e.g. a new
+# /tmp after a cold start), so a tag from an earlier process must never match
+BOOT_EPOCH = uuid.uuid4().hex[:8]
+
+
+def get_available_slots(date: str, time: Optional[str] = None) -> list[Slot]:
+    """Return available slots for a date and optional time, sorted by time then court."""
+    return get_booking_service().check_availability(date, time)
+
+
+def availability_etag(date: str) -> Optional[str]:
+    """
+    Get the ETag for a date's availability, derived from the booking store.
+
+    Weak, because the same availability may be sent as text, structured
+    JSON or MessagePack.
+
+    Returns:
+        The tag, or None with the memory store: bookings are made by the
+        booking service, and only the shared sqlite store lets this service
+        see them, so with any other store a 304 could be stale
+    """
+    if get_settings().booking_store != "sqlite":
+        return None
+    version = get_booking_service().availability_version(date)
+    return f'W/"{date}.{BOOT_EPOCH}.{version}"'
 
 
 def check_availability(date: str, time: Optional[str] = None) -> str:
@@ -24,7 +52,7 @@ def check_availability(date: str, time: Optional[str] = None) -> str:
     Returns:
         Available slots or a message if none found
     """
-    slots = booking_service.check_availability(date, time)
+    slots = get_available_slots(date, time)
 
     if not slots:
         return f"No available slots found for {date}" + (f" at {time}" if time else "")
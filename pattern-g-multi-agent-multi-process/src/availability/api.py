@@ -4,10 +4,20 @@ FastAPI for Availability Specialist - Pattern G
 Runs as a separate service, handles availability queries via HTTP.
 """
 
-from fastapi import FastAPI, HTTPException
+from typing import Annotated, Optional
 
-from ..models import AvailabilityRequest, AvailabilityResponse
-from .agent import process_availability_request
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+
+from ..deadline import DeadlineMiddleware
+from ..models import (
+    AvailabilityBatchRequest,
+    AvailabilityBatchResponse,
+    AvailabilityRequest,
+    AvailabilityResponse,
+    AvailableSlot,
+)
+from ..wire import encode_response
+from .agent import availability_etag, get_available_slots, process_availability_request
 
 
 app = FastAPI(
@@ -15,18 +25,107 @@ app = FastAPI(
     description="Availability checking service (separate process)",
     version="1.0.0",
 )
+app.add_middleware(DeadlineMiddleware)
+
+
+def _answer(request: AvailabilityRequest, etag: Optional[str] = None) -> AvailabilityResponse:
+    """Answer one availability request in the requested format, tagged with its ETag."""
+    etag = etag or availability_etag(request.date)
+    if request.format == "structured":
+        slots = get_available_slots(request.date, request.time)
+        return AvailabilityResponse(
+            slots=[
+                AvailableSlot(court=slot.court, time=slot.time)
+                for slot in slots
+            ],
+            etag=etag,
+        )
+    return AvailabilityResponse(
+        result=process_availability_request(request.date, request.time),
+        etag=etag,
+    )
 
 
-@app.post("/process", response_model=AvailabilityResponse)
-async def process(request: AvailabilityRequest) -> AvailabilityResponse:
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+@app.post(
+    "/process",
+    response_model=AvailabilityResponse,
+    response_model_exclude_none=True,
+)
+async def process(
+    request: AvailabilityRequest,
+    accept: Optional[str] = Header(None),
+) -> Response:
     """
     Check availability for a given date/time.
 
-    Called by the Manager service via HTTP.
+    Called by the Manager service via HTTP. Returns preformatted text by
+    default, or a typed slot list when ``format`` is "structured"; encoded as
+    MessagePack when the caller accepts ``application/msgpack``.
+    """
+    try:
+        return encode_response(_answer(request), accept)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get(
+    "/process",
+    response_model=AvailabilityResponse,
+    response_model_exclude_none=True,
+    responses={304: {"description": "Availability unchanged since the given ETag"}},
+)
+async def process_conditional(
+    request: Annotated[AvailabilityRequest, Query()],
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
+    """
+    Check availability, revalidating a cached answer.
+
+    Returns 304 with an empty body, without querying slots, when
+    ``If-None-Match`` carries the date's current ETag. ETags are only given
+    with the shared sqlite booking store (see availability_etag); otherwise
+    this always answers in full.
+    """
+    try:
+        etag = availability_etag(request.date)
+        if etag is None:
+            return encode_response(_answer(request), accept)
+        if _etag_matches(etag, if_none_match):
+            return Response(status_code=304, headers={"ETag": etag})
+        response = encode_response(_answer(request, etag), accept)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post(
+    "/process/batch",
+    response_model=AvailabilityBatchResponse,
+    response_model_exclude_none=True,
+)
+async def process_batch(
+    request: AvailabilityBatchRequest,
+    accept: Optional[str] = Header(None),
+) -> Response:
+    """
+    Check availability for several dates/times in one call.
+
+    Results are returned in request order.
     """
     try:
-        result = process_availability_request(request.date, request.time)
-        return AvailabilityResponse(result=result)
+        results = [_answer(item) for item in request.requests]
+        return encode_response(AvailabilityBatchResponse(results=results), accept)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
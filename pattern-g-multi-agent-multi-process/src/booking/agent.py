@@ -4,10 +4,7 @@ Booking Specialist Agent - Pattern G
 Runs as a separate service, handles booking requests.
 """
 
-from shared import create_booking_service
-
-# Initialize the booking service
-booking_service = create_booking_service()
+from ..store import get_booking_service
 
 
 def book_slot(slot_id: str) -> str:
@@ -21,7 +18,7 @@ def book_slot(slot_id: str) -> str:
         Booking confirmation or error message
     """
     try:
-        booking = booking_service.book(slot_id)
+        booking = get_booking_service().book(slot_id)
         return (
             f"Booking confirmed!\n"
             f"  Booking ID: {booking.booking_id}\n"
@@ -4,9 +4,18 @@ FastAPI for Booking Specialist - Pattern G
 Runs as a separate service, handles booking requests via HTTP.
 """
 
-from fastapi import FastAPI, HTTPException
+from typing import Optional
 
-from ..models import BookingRequest, BookingResponse
+from fastapi import FastAPI, Header, HTTPException, Response
+
+from ..deadline import DeadlineMiddleware
+from ..models import (
+    BookingBatchRequest,
+    BookingBatchResponse,
+    BookingRequest,
+    BookingResponse,
+)
+from ..wire import encode_response
 from .agent import process_booking_request
 
 
@@ -15,18 +24,44 @@ app = FastAPI(
     description="Booking service (separate process)",
     version="1.0.0",
 )
+app.add_middleware(DeadlineMiddleware)
 
 
 @app.post("/process", response_model=BookingResponse)
-async def process(request: BookingRequest) -> BookingResponse:
+async def process(
+    request: BookingRequest,
+    accept: Optional[str] = Header(None),
+) -> Response:
     """
     Book a specific slot.
 
-    Called by the Manager service via HTTP.
+    Called by the Manager service via HTTP. Encoded as MessagePack when the
+    caller accepts ``application/msgpack``.
     """
     try:
         result = process_booking_request(request.slot_id)
-        return BookingResponse(result=result)
+        return encode_response(BookingResponse(result=result), accept)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/process/batch", response_model=BookingBatchResponse)
+async def process_batch(
+    request: BookingBatchRequest,
+    accept: Optional[str] = Header(None),
+) -> Response:
+    """
+    Book several slots in one call.
+
+    Bookings are processed in request order, so a later request for the same
+    slot sees the earlier one's result.
+    """
+    try:
+        results = [
+            BookingResponse(result=process_booking_request(item.slot_id))
+            for item in request.requests
+        ]
+        return encode_response(BookingBatchResponse(results=results), accept)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
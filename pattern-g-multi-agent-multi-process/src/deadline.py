@@ -0,0 +1,88 @@
+"""
+Request deadlines across Pattern G's services.
+
+The Manager sends each specialist request with the seconds left in the
+/chat request's budget (see manager.resilience). DeadlineMiddleware makes
+the specialists honour it: a request that arrives already expired is
+refused, and one that is still running when its budget runs out is
+cancelled, so no work is done for an answer nobody is waiting for.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Remaining budget in seconds, sent with each specialist request
+DEADLINE_HEADER = "X-Request-Deadline"
+
+EXPIRED_BODY = json.dumps({"detail": "Request deadline exceeded"}).encode()
+
+
+def parse_deadline(value: Optional[str]) -> Optional[float]:
+    """Seconds of budget in a deadline header value, or None if absent or malformed."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that bounds each request by its X-Request-Deadline.
+
+    Requests without the header run unbounded. Expired requests, and
+    requests cut off before they responded, get 504 Gateway Timeout.
+
+    Usage: ``app.add_middleware(DeadlineMiddleware)``
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+        self.expired = 0
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        remaining = parse_deadline(
+            headers.get(DEADLINE_HEADER.lower().encode(), b"").decode("latin-1")
+        )
+        if remaining is None:
+            await self.app(scope, receive, send)
+            return
+        if remaining <= 0:
+            self.expired += 1
+            await self._expired(send)
+            return
+
+        started = False
+
+        async def send_tracked(message: dict) -> None:
+            nonlocal started
+            started = True
+            await send(message)
+
+        try:
+            async with asyncio.timeout(remaining):
+                await self.app(scope, receive, send_tracked)
+        except TimeoutError:
+            self.expired += 1
+            logger.warning("%s %s cut off at its deadline", scope["method"], scope["path"])
+            if not started:
+                await self._expired(send)
+
+    async def _expired(self, send: Callable) -> None:
+        """Send 504 Gateway Timeout without touching the app."""
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(EXPIRED_BODY)).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 504, "headers": headers})
+        await send({"type": "http.response.body", "body": EXPIRED_BODY})
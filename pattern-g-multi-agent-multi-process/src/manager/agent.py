@@ -5,18 +5,58 @@ Routes requests to specialist services via HTTP.
 Key difference from Pattern F: Uses HTTP calls instead of in-process handoffs.
 """
 
-import os
+from collections.abc import AsyncIterator
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional
 
 import httpx
-from agents import Agent, Runner, RunContextWrapper, function_tool
+from agents import (
+    Agent,
+    OpenAIProvider,
+    RunConfig,
+    Runner,
+    function_tool,
+    set_tracing_export_api_key,
+)
+from agents.run import CallModelData, ModelInputData
+from openai.types.responses import ResponseTextDeltaEvent
+
+from shared import ConversationStore, create_conversation_store, make_slot_id
+from shared.llm import get_llm_client
 
 from ..settings import get_settings
+from .resilience import SpecialistUnavailableError
+from .specialists import availability_client, booking_client
+
+
+@lru_cache
+def configure_openai() -> None:
+    """Give trace export the OpenAI API key, on the first run rather than at import."""
+    set_tracing_export_api_key(get_settings().get_openai_api_key())
+
+
+def _add_current_datetime(data: CallModelData[Any]) -> ModelInputData:
+    """Give the model the current date and time after the history, not in the instructions."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+    return ModelInputData(
+        input=[*data.model_data.input, {"role": "system", "content": f"CURRENT DATETIME: {now}"}],
+        instructions=data.model_data.instructions,
+    )
+
+
+def _run_config(api_key: Optional[str] = None) -> RunConfig:
+    """
+    Run the agents on the shared LLM gateway's pooled client.
 
-# Set OpenAI API key for the Agents SDK
-settings = get_settings()
-os.environ["OPENAI_API_KEY"] = settings.get_openai_api_key()
+    Async callers pass ``api_key``, looked up without blocking the event loop.
+    """
+    configure_openai()
+    client = get_llm_client(api_key or get_settings().get_openai_api_key())
+    return RunConfig(
+        model_provider=OpenAIProvider(openai_client=client),
+        call_model_input_filter=_add_current_datetime,
+    )
 
 
 # =============================================================================
@@ -24,8 +64,30 @@ os.environ["OPENAI_API_KEY"] = settings.get_openai_api_key()
 # =============================================================================
 
 
+def render_slots(date: str, time: Optional[str], slots: list[dict[str, Any]]) -> str:
+    """
+    Render a structured slot list compactly for the LLM.
+
+    Slots are grouped by time, one line per time, each listing the exact
+    slot_ids to pass to book_slot - the model copies them rather than
+    composing IDs itself.
+    """
+    if not slots:
+        return f"No available slots found for {date}" + (f" at {time}" if time else "")
+
+    ids_by_time: dict[str, list[str]] = {}
+    for slot in slots:
+        ids_by_time.setdefault(slot["time"], []).append(
+            make_slot_id(date, slot["court"], slot["time"])
+        )
+
+    lines = [f"Available on {date} (slot_ids by time):"]
+    lines += [f"{t}: {' '.join(slot_ids)}" for t, slot_ids in ids_by_time.items()]
+    return "\n".join(lines)
+
+
 @function_tool
-def check_availability(date: str, time: Optional[str] = None) -> str:
+async def check_availability(date: str, time: Optional[str] = None) -> str:
     """
     Check available tennis court slots by calling the Availability Specialist service.
 
@@ -36,24 +98,20 @@ def check_availability(date: str, time: Optional[str] = None) -> str:
     Returns:
         Available slots or a message if none found
     """
-    availability_url = settings.availability_url
-    if not availability_url:
+    if not availability_client.base_url:
         return "Error: Availability service URL not configured"
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{availability_url}/process",
-                json={"date": date, "time": time},
-            )
-            response.raise_for_status()
-            return response.json()["result"]
-    except httpx.HTTPError as e:
+        response = await availability_client.process_cached(
+            {"date": date, "time": time, "format": "structured"}
+        )
+        return render_slots(date, time, response["slots"])
+    except (httpx.HTTPError, SpecialistUnavailableError) as e:
         return f"Error calling availability service: {e}"
 
 
 @function_tool
-def book_slot(slot_id: str) -> str:
+async def book_slot(slot_id: str) -> str:
     """
     Book a tennis court slot by calling the Booking Specialist service.
 
@@ -63,19 +121,13 @@ def book_slot(slot_id: str) -> str:
     Returns:
         Booking confirmation or error message
     """
-    booking_url = settings.booking_url
-    if not booking_url:
+    if not booking_client.base_url:
         return "Error: Booking service URL not configured"
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                f"{booking_url}/process",
-                json={"slot_id": slot_id},
-            )
-            response.raise_for_status()
-            return response.json()["result"]
-    except httpx.HTTPError as e:
+        response = await booking_client.process_batched({"slot_id": slot_id})
+        return response["result"]
+    except (httpx.HTTPError, SpecialistUnavailableError) as e:
         return f"Error calling booking service: {e}"
 
 
@@ -84,16 +136,7 @@ def book_slot(slot_id: str) -> str:
 # =============================================================================
 
 
-def get_manager_instructions(
-    context: RunContextWrapper[Any], agent: Agent[Any]
-) -> str:
-    """Instructions for the Manager Agent."""
-    now = datetime.now()
-    current_datetime = now.strftime("%Y-%m-%d %H:%M (%A)")
-
-    return f"""You are the Tennis Court Booking Manager. Your job is to help users book tennis courts.
-
-CURRENT DATETIME: {current_datetime}
+MANAGER_INSTRUCTIONS = """You are the Tennis Court Booking Manager. Your job is to help users book tennis courts.
 
 AVAILABLE ACTIONS:
 1. check_availability - Check what tennis court slots are available (calls Availability Service)
@@ -106,8 +149,9 @@ WORKFLOW:
 4. Always confirm the booking details
 
 GUIDELINES:
-- Convert relative dates ("tomorrow", "next Monday") to YYYY-MM-DD format
+- Convert relative dates ("tomorrow", "next Monday") to YYYY-MM-DD format, from the CURRENT DATETIME message
 - If no time is specified, show all available slots for that day
+- To compare several dates, call check_availability for all of them in the same step
 - Be concise but friendly
 - Always use the tools to check real availability - don't make up slots
 
@@ -117,7 +161,7 @@ Each tool call goes to a separate specialist service via HTTP - this is Pattern
 
 manager_agent = Agent(
     name="Tennis Court Booking Manager",
-    instructions=get_manager_instructions,
+    instructions=MANAGER_INSTRUCTIONS,
     tools=[check_availability, book_slot],
 )
 
@@ -127,20 +171,73 @@ manager_agent = Agent(
 # =============================================================================
 
 
-async def run_manager(user_message: str) -> str:
+@lru_cache
+def get_conversations() -> ConversationStore:
+    """Get the conversation history store for requests that send a session_id."""
+    settings = get_settings()
+    return create_conversation_store(
+        settings.session_store,
+        settings.session_db_path,
+        ttl=settings.session_ttl,
+        max_turns=settings.session_max_turns,
+        max_bytes=settings.session_max_bytes,
+    )
+
+
+def _agent_input(user_message: str, session_id: Optional[str]) -> str | list[dict[str, Any]]:
+    """The run input: just the message, or the session's earlier turns followed by it."""
+    if session_id is None:
+        return user_message
+    return [*get_conversations().load(session_id), {"role": "user", "content": user_message}]
+
+
+async def run_manager(user_message: str, session_id: Optional[str] = None) -> str:
     """
     Run the manager agent with a user message.
 
     Args:
         user_message: The user's request
+        session_id: Optional conversation to continue; its earlier turns are
+            sent with the message and this turn is saved to it
 
     Returns:
         The final response after routing to specialist services
     """
-    result = await Runner.run(manager_agent, user_message)
+    run_config = _run_config(await get_settings().get_openai_api_key_async())
+    result = await Runner.run(
+        manager_agent, _agent_input(user_message, session_id), run_config=run_config
+    )
+    if session_id is not None:
+        get_conversations().save(session_id, result.to_input_list())
     return result.final_output
 
 
+async def run_manager_streamed(
+    user_message: str, session_id: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Run the manager agent, yielding response text as it is generated.
+
+    Args:
+        user_message: The user's request
+        session_id: Optional conversation to continue, as in the non-streamed run
+
+    Yields:
+        Text deltas of the response after routing to specialist services
+    """
+    run_config = _run_config(await get_settings().get_openai_api_key_async())
+    result = Runner.run_streamed(
+        manager_agent, _agent_input(user_message, session_id), run_config=run_config
+    )
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(
+            event.data, ResponseTextDeltaEvent
+        ):
+            yield event.data.delta
+    if session_id is not None:
+        get_conversations().save(session_id, result.to_input_list())
+
+
 def run_manager_sync(user_message: str) -> str:
     """
     Synchronous version for simpler use cases.
@@ -151,5 +248,16 @@ def run_manager_sync(user_message: str) -> str:
     Returns:
         The final response after routing to specialist services
     """
-    result = Runner.run_sync(manager_agent, user_message)
+    result = Runner.run_sync(manager_agent, user_message, run_config=_run_config())
     return result.final_output
+
+
+def warmup() -> None:
+    """
+    Do the first request's setup ahead of time, e.g. on a Lambda warmup event.
+
+    Importing this module loads the Agents SDK; this also resolves the
+    OpenAI API key and opens the conversation store.
+    """
+    configure_openai()
+    get_conversations()
@@ -4,17 +4,29 @@ FastAPI for Manager Service - Pattern G
 User-facing service that routes to specialist services via HTTP.
 """
 
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator
+
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+from shared import AdmissionMiddleware, sse_stream
 
 from ..models import ChatRequest, ChatResponse
-from .agent import run_manager
+from ..settings import get_settings
+from .resilience import deadline_scope, remaining_time, request_deadline
 
+settings = get_settings()
+
+# The agent module (and the Agents SDK) is imported on the first chat request, not
+# at cold start - see lambda_handler.warmup
 
 app = FastAPI(
     title="Pattern G: Multi-Agent (Multi-Process)",
     description="Manager routes requests to specialist services via HTTP",
     version="1.0.0",
 )
+app.add_middleware(AdmissionMiddleware)
 
 
 @app.post("/chat", response_model=ChatResponse)
@@ -27,14 +39,63 @@ async def chat(request: ChatRequest) -> ChatResponse:
     - Booking Specialist (separate Lambda): for booking a specific slot
 
     This is Pattern G: multiple agents in separate processes, communicating via HTTP.
+    The whole request, including every specialist call, is bounded by
+    ``chat_deadline``.
     """
+    from .agent import run_manager
+
     try:
-        response = await run_manager(request.message)
-        return ChatResponse(response=response)
+        async with request_deadline(settings.chat_deadline):
+            response = await run_manager(request.message, request.session_id)
+        return ChatResponse(response=response, session_id=request.session_id)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _deadline_bounded(deltas: AsyncGenerator[str, None]) -> AsyncIterator[str]:
+    """
+    Bound a streamed reply by ``chat_deadline``, like /chat.
+
+    Only the wait for each delta is timed, never a yield, so the timeout
+    cannot fire while the response is being sent. ``deltas`` is closed when
+    this stops, whether at the deadline or because the client went away.
+    """
+    try:
+        with deadline_scope(settings.chat_deadline):
+            while True:
+                try:
+                    async with asyncio.timeout(remaining_time()):
+                        delta = await anext(deltas)
+                except StopAsyncIteration:
+                    return
+                except TimeoutError:
+                    raise TimeoutError("Request deadline exceeded") from None
+                yield delta
+    finally:
+        await deltas.aclose()
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Send a message to the multi-agent booking system, streaming the reply as server-sent events.
+
+    Specialist services are called exactly as in /chat; the manager's reply
+    text is sent as each delta arrives, followed by a final ``done`` event.
+    """
+    from .agent import run_manager_streamed
+
+    return StreamingResponse(
+        sse_stream(
+            _deadline_bounded(run_manager_streamed(request.message, request.session_id)),
+            {TimeoutError: "Request deadline exceeded"},
+        ),
+        media_type="text/event-stream",
+    )
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
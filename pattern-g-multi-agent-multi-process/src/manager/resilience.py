@@ -0,0 +1,153 @@
+"""
+Resilience helpers for the Manager's specialist calls - Pattern G
+
+- CircuitBreaker: stop calling a specialist that keeps failing, so tool calls
+  fail fast instead of each waiting for a timeout.
+- request_deadline() / deadline_scope(): one time budget for a whole /chat
+  request, visible to every tool call made while handling it.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class SpecialistUnavailableError(Exception):
+    """A specialist call was not attempted."""
+
+
+class CircuitOpenError(SpecialistUnavailableError):
+    """The specialist's circuit breaker is open."""
+
+    def __init__(self, service: str) -> None:
+        self.service = service
+        super().__init__(f"{service} service unavailable (circuit open)")
+
+
+class DeadlineExceededError(SpecialistUnavailableError):
+    """The request deadline passed before the specialist was called."""
+
+    def __init__(self, service: str) -> None:
+        self.service = service
+        super().__init__(f"request deadline exceeded before calling {service} service")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Opens after ``failure_threshold`` failures in a row. While open, calls are
+    rejected until ``reset_timeout`` seconds have passed; then a single trial
+    call is let through (half-open), which closes the circuit on success or
+    reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Check whether a call may be made now."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        if self._opened_at is not None:
+            logger.info("%s circuit closed", self.name)
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            if self._opened_at is None or self._trial_in_flight:
+                logger.warning("%s circuit opened after %d failures", self.name, self._failures)
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+    def record_abandoned(self) -> None:
+        """
+        Record that the half-open trial call was given up before it finished.
+
+        A cancelled call (request deadline, client disconnect, a losing hedge)
+        says nothing about the service, so the circuit stays half-open and
+        the next call becomes the trial.
+        """
+        self._trial_in_flight = False
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """
+    Set a deadline ``seconds`` from now for tool calls made inside.
+
+    Tool calls see the remaining budget via remaining_time(); nothing is
+    cancelled. Use request_deadline() to also bound the block itself.
+    """
+    token = _deadline.set(asyncio.get_running_loop().time() + seconds)
+    try:
+        yield
+    finally:
+        try:
+            _deadline.reset(token)
+        except ValueError:
+            # Exited from another context, e.g. an abandoned stream being closed
+            pass
+
+
+@asynccontextmanager
+async def request_deadline(seconds: float) -> AsyncIterator[None]:
+    """
+    Give the enclosed request a deadline ``seconds`` from now.
+
+    Raises:
+        TimeoutError: If the enclosed block is still running at the deadline
+    """
+    with deadline_scope(seconds):
+        async with asyncio.timeout(seconds):
+            yield
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None if it has none."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
@@ -0,0 +1,433 @@
+"""
+Specialist Service Clients - Pattern G
+
+HTTP clients the Manager uses to reach the specialist services.
+All calls share one long-lived httpx.AsyncClient per event loop, so tool calls
+reuse pooled keep-alive (and HTTP/2) connections instead of opening a new
+connection each time.
+
+SPECIALIST_TRANSPORT picks how requests reach the specialists:
+- "http": TCP to AVAILABILITY_URL / BOOKING_URL (separate services)
+- "uds": a Unix domain socket per service, for co-located services, e.g.
+  ``uvicorn src.availability.api:app --uds /tmp/availability.sock``
+- "asgi": the specialist FastAPI apps called in-process, with no network at
+  all - the baseline for measuring what the process split costs
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+import httpx
+
+from ..deadline import DEADLINE_HEADER
+from ..settings import get_settings
+from ..wire import JSON, MSGPACK, decode_body
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    remaining_time,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared pooled client for the running event loop.
+
+    Pooled connections belong to the loop that opened them, so a new client
+    is created if the loop has changed (e.g. between test runs).
+    """
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            http2=settings.specialist_http2,
+            limits=httpx.Limits(
+                max_connections=settings.specialist_max_connections,
+                max_keepalive_connections=settings.specialist_max_connections,
+                keepalive_expiry=settings.specialist_keepalive_expiry,
+            ),
+        )
+        _http_client_loop = loop
+        logger.debug("Created pooled specialist HTTP client")
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared client, and the specialists' own clients, with their connections."""
+    global _http_client, _http_client_loop
+
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+    for client in (availability_client, booking_client):
+        await client.aclose()
+
+
+def transport_factory(
+    mode: str, service: str, socket_path: Optional[str] = None
+) -> Optional[Callable[[], httpx.AsyncBaseTransport]]:
+    """
+    Get a factory for a specialist's transport, or None to use the shared TCP pool.
+
+    Args:
+        mode: "http", "uds" or "asgi"
+        service: "availability" or "booking"
+        socket_path: Unix socket path (uds mode)
+
+    Raises:
+        ValueError: If uds mode has no socket path
+    """
+    if mode == "http":
+        return None
+    if mode == "uds":
+        if not socket_path:
+            raise ValueError(f"No Unix socket configured for the {service} service")
+        return lambda: httpx.AsyncHTTPTransport(
+            uds=socket_path,
+            limits=httpx.Limits(
+                max_connections=settings.specialist_max_connections,
+                max_keepalive_connections=settings.specialist_max_connections,
+                keepalive_expiry=settings.specialist_keepalive_expiry,
+            ),
+        )
+
+    def asgi_transport() -> httpx.AsyncBaseTransport:
+        # Imported here so the manager only loads the specialist apps in asgi mode
+        if service == "availability":
+            from ..availability.api import app
+        else:
+            from ..booking.api import app
+        return httpx.ASGITransport(app=app)
+
+    return asgi_transport
+
+
+class SpecialistClient:
+    """
+    Calls one specialist service's /process endpoints.
+
+    process_batched() coalesces calls made within ``batch_window`` seconds -
+    e.g. the parallel tool calls of one agent step - into a single
+    /process/batch request.
+
+    process_cached() also keeps up to ``cache_size`` responses that carry an
+    ETag and revalidates them with a conditional GET, so an unchanged answer
+    comes back as an empty 304.
+
+    Every request goes through the service's circuit breaker and is bounded
+    by the current request deadline. With ``hedge`` set (idempotent services
+    only), a duplicate request is sent if the first has not answered within
+    the observed p95 latency, and the first answer wins.
+    """
+
+    # Latency samples needed before hedging uses the observed p95
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(
+        self,
+        name: str,
+        base_url: Optional[str],
+        timeout: float,
+        *,
+        batch_window: float = 0.0,
+        wire_format: str = "json",
+        cache_size: int = 0,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge: bool = False,
+        hedge_after: float = 1.0,
+        transport: Optional[Callable[[], httpx.AsyncBaseTransport]] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.name = name
+        self.base_url = base_url
+        self.timeout = timeout
+        self.batch_window = batch_window
+        self._headers = {"Accept": MSGPACK if wire_format == "msgpack" else JSON}
+        self._http_client = http_client
+        self._transport = transport
+        self._own_client: Optional[httpx.AsyncClient] = None
+        self._own_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: list[tuple[dict[str, Any], asyncio.Future]] = []
+        self._flush_tasks: set[asyncio.Task] = set()
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple, tuple[str, dict[str, Any]]] = OrderedDict()
+        self.breaker = breaker or CircuitBreaker(name)
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.hedges_sent = 0
+        self._latencies: deque[float] = deque(maxlen=200)
+
+    def _client(self) -> httpx.AsyncClient:
+        """
+        Get the client to send with.
+
+        An injected client wins; otherwise the shared TCP pool, or - when a
+        transport is set - this service's own client on that transport.
+        """
+        if self._http_client is not None:
+            return self._http_client
+        if self._transport is None:
+            return get_http_client()
+
+        loop = asyncio.get_running_loop()
+        if self._own_client is None or self._own_client_loop is not loop:
+            self._own_client = httpx.AsyncClient(transport=self._transport())
+            self._own_client_loop = loop
+        return self._own_client
+
+    async def aclose(self) -> None:
+        """Close this service's own client, if it has one."""
+        if self._own_client is not None:
+            await self._own_client.aclose()
+        self._own_client = None
+        self._own_client_loop = None
+
+    def hedge_delay(self) -> float:
+        """Seconds to wait before hedging: the observed p95, or hedge_after until known."""
+        if len(self._latencies) < self.HEDGE_MIN_SAMPLES:
+            return self.hedge_after
+        return statistics.quantiles(self._latencies, n=20)[-1]
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send one request through the circuit breaker, deadline and hedging.
+
+        Transport errors and 5xx responses count as breaker failures. A call
+        cancelled before it finishes counts as neither, and so does a timeout
+        the request deadline made shorter than ``self.timeout``: the service
+        had less time than it is allowed, so that says nothing about it.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            DeadlineExceededError: If the request deadline has already passed
+            httpx.HTTPError: If the request fails
+        """
+        timeout = self.timeout
+        headers = {**self._headers, **kwargs.pop("headers", {})}
+        remaining = remaining_time()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceededError(self.name)
+            timeout = min(timeout, remaining)
+            headers[DEADLINE_HEADER] = f"{remaining:.3f}"
+        deadline_bound = timeout < self.timeout
+        trial = self.breaker.state == "half_open"
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.name)
+
+        client = self._client()
+        url = f"{self.base_url}{path}"
+
+        def send() -> Awaitable[httpx.Response]:
+            return client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+
+        started = time.monotonic()
+        try:
+            response = await (self._send_hedged(send) if self.hedge else send())
+        except httpx.TimeoutException:
+            if not deadline_bound:
+                self.breaker.record_failure()
+            elif trial:
+                self.breaker.record_abandoned()
+            raise
+        except httpx.HTTPError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            if trial:
+                self.breaker.record_abandoned()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+            self._latencies.append(time.monotonic() - started)
+        return response
+
+    async def _send_hedged(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Send a request, and a duplicate if it is slow; return the first success."""
+        tasks = [asyncio.ensure_future(send())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay())
+            if not done:
+                self.hedges_sent += 1
+                logger.debug("Hedging slow %s request", self.name)
+                tasks.append(asyncio.ensure_future(send()))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def process(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        POST a request to the specialist and return its JSON response.
+
+        Raises:
+            SpecialistUnavailableError: If the circuit is open or the deadline passed
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        response = await self._request("POST", "/process", json=payload)
+        response.raise_for_status()
+        return decode_body(response.content, response.headers.get("content-type"))
+
+    async def process_batch(self, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        POST several requests in one call and return the responses in order.
+
+        Raises:
+            SpecialistUnavailableError: If the circuit is open or the deadline passed
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        response = await self._request("POST", "/process/batch", json={"requests": payloads})
+        response.raise_for_status()
+        return decode_body(response.content, response.headers.get("content-type"))["results"]
+
+    async def process_batched(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Queue a request to be sent with any others made in the same batch window.
+
+        Raises:
+            SpecialistUnavailableError: If the circuit is open or the deadline passed
+            httpx.HTTPError: If the (batched) request fails
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) == 1:
+            loop.call_later(self.batch_window, self._start_flush)
+        return await future
+
+    async def process_cached(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """
+        Like process_batched(), but answered from the cache when still current.
+
+        A cached response is revalidated with ``If-None-Match``; a 304 returns
+        the cached body, anything else replaces it.
+
+        Raises:
+            SpecialistUnavailableError: If the circuit is open or the deadline passed
+            httpx.HTTPError: If the request fails
+        """
+        key = tuple(sorted(payload.items()))
+        cached = self._cache.get(key)
+        if cached is None:
+            result = await self.process_batched(payload)
+        else:
+            result = await self._revalidate(payload, *cached)
+
+        etag = result.get("etag")
+        if etag and self.cache_size > 0:
+            self._cache[key] = (etag, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    async def _revalidate(
+        self, payload: dict[str, Any], etag: str, cached: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send a conditional GET and return the cached body if unchanged."""
+        response = await self._request(
+            "GET",
+            "/process",
+            params={k: v for k, v in payload.items() if v is not None},
+            headers={"If-None-Match": etag},
+        )
+        if response.status_code == 304:
+            logger.debug("%s cache hit for %s", self.name, payload)
+            return cached
+        response.raise_for_status()
+        return decode_body(response.content, response.headers.get("content-type"))
+
+    def _start_flush(self) -> None:
+        """Start a flush task, keeping a reference until it finishes."""
+        task = asyncio.get_running_loop().create_task(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self) -> None:
+        """Send all queued requests and resolve their futures."""
+        batch, self._pending = self._pending, []
+        payloads = [payload for payload, _ in batch]
+
+        try:
+            if len(batch) == 1:
+                results = [await self.process(payloads[0])]
+            else:
+                logger.debug("Sending %d %s requests as one batch", len(batch), self.name)
+                results = await self.process_batch(payloads)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+def _base_url(service: str, url: Optional[str]) -> Optional[str]:
+    """Service URL; the socket or in-process app ignores the host, so any will do."""
+    if settings.specialist_transport == "http":
+        return url
+    return url or f"http://{service}"
+
+
+availability_client = SpecialistClient(
+    "availability",
+    _base_url("availability", settings.availability_url),
+    settings.availability_timeout,
+    batch_window=settings.specialist_batch_window,
+    wire_format=settings.specialist_wire_format,
+    cache_size=settings.availability_cache_size,
+    breaker=CircuitBreaker(
+        "availability",
+        settings.specialist_breaker_failures,
+        settings.specialist_breaker_reset,
+    ),
+    hedge=settings.availability_hedge,
+    hedge_after=settings.availability_hedge_after,
+    transport=transport_factory(
+        settings.specialist_transport, "availability", settings.availability_socket
+    ),
+)
+booking_client = SpecialistClient(
+    "booking",
+    _base_url("booking", settings.booking_url),
+    settings.booking_timeout,
+    batch_window=settings.specialist_batch_window,
+    wire_format=settings.specialist_wire_format,
+    breaker=CircuitBreaker(
+        "booking",
+        settings.specialist_breaker_failures,
+        settings.specialist_breaker_reset,
+    ),
+    transport=transport_factory(
+        settings.specialist_transport, "booking", settings.booking_socket
+    ),
+)
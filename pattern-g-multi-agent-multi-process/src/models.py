@@ -2,7 +2,7 @@
 Pydantic models for Pattern G: Multi-Agent Multi-Process.
 """
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +15,11 @@ class ChatRequest(BaseModel):
         description="User message to the booking system",
         examples=["Book a tennis court for tomorrow at 3pm"],
     )
+    session_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Conversation to continue; omit for a one-off request",
+    )
 
 
 class ChatResponse(BaseModel):
@@ -24,6 +29,7 @@ class ChatResponse(BaseModel):
         ...,
         description="System response to the user",
     )
+    session_id: Optional[str] = Field(None, description="Session ID echoed from the request")
 
 
 class AvailabilityRequest(BaseModel):
@@ -31,12 +37,44 @@ class AvailabilityRequest(BaseModel):
 
     date: str = Field(..., description="Date in YYYY-MM-DD format")
     time: Optional[str] = Field(None, description="Optional time in HH:MM format")
+    format: Literal["text", "structured"] = Field(
+        "text", description="Preformatted text, or a typed slot list"
+    )
+
+
+class AvailableSlot(BaseModel):
+    """
+    One available slot in a structured availability response.
+
+    The slot ID is not sent; it is derived with shared.make_slot_id.
+    """
+
+    court: str
+    time: str
 
 
 class AvailabilityResponse(BaseModel):
     """Response model for availability specialist."""
 
-    result: str = Field(..., description="Available slots or message")
+    result: Optional[str] = Field(None, description="Available slots or message (text format)")
+    slots: Optional[list[AvailableSlot]] = Field(
+        None, description="Available slots (structured format)"
+    )
+    etag: Optional[str] = Field(
+        None, description="Availability version; revalidate with GET /process and If-None-Match"
+    )
+
+
+class AvailabilityBatchRequest(BaseModel):
+    """Batch of availability requests, answered in order."""
+
+    requests: list[AvailabilityRequest] = Field(..., description="Availability requests")
+
+
+class AvailabilityBatchResponse(BaseModel):
+    """Batch of availability responses, in request order."""
+
+    results: list[AvailabilityResponse] = Field(..., description="One response per request")
 
 
 class BookingRequest(BaseModel):
@@ -49,3 +87,15 @@ class BookingResponse(BaseModel):
     """Response model for booking specialist."""
 
     result: str = Field(..., description="Booking confirmation or error")
+
+
+class BookingBatchRequest(BaseModel):
+    """Batch of booking requests, processed in order."""
+
+    requests: list[BookingRequest] = Field(..., description="Booking requests")
+
+
+class BookingBatchResponse(BaseModel):
+    """Batch of booking responses, in request order."""
+
+    results: list[BookingResponse] = Field(..., description="One response per request")
@@ -1,19 +1,12 @@
 """Settings for Pattern G - supports local dev and Lambda deployment."""
 
+import tempfile
 from functools import lru_cache
-from typing import Optional
+from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from shared import get_env_file
-
-
-def _get_secret_from_aws(secret_arn: str) -> str:
-    """Fetch secret value from AWS Secrets Manager."""
-    import boto3
-
-    client = boto3.client("secretsmanager")
-    response = client.get_secret_value(SecretId=secret_arn)
-    return response["SecretString"]
+from shared import get_env_file, get_secret, get_secret_async
 
 
 class Settings(BaseSettings):
@@ -26,18 +19,68 @@ class Settings(BaseSettings):
     openai_secret_arn: Optional[str] = None
     openai_model: str = "gpt-4o-mini"
 
+    # Booking state of the availability and booking specialists. "memory" gives
+    # each service its own copy. "sqlite" lets them share one file, but only
+    # where both can reach booking_db_path: services on the same host, not the
+    # separate Lambda functions, which each have their own /tmp.
+    booking_store: Literal["memory", "sqlite"] = "memory"
+    booking_db_path: str = str(Path(tempfile.gettempdir()) / "pattern-g-bookings.sqlite3")
+
     # Specialist service URLs (for Manager to call)
     availability_url: Optional[str] = None
     booking_url: Optional[str] = None
 
+    # How the Manager reaches the specialists: TCP, Unix sockets, or in-process
+    specialist_transport: Literal["http", "uds", "asgi"] = "http"
+    availability_socket: Optional[str] = None
+    booking_socket: Optional[str] = None
+
+    # Manager -> specialist HTTP client
+    availability_timeout: float = 10.0
+    booking_timeout: float = 15.0
+    specialist_http2: bool = True
+    specialist_max_connections: int = 20
+    specialist_keepalive_expiry: float = 60.0
+    # Tool calls to the same specialist within this window share one batch request
+    specialist_batch_window: float = 0.002
+    # Response encoding requested from specialists
+    specialist_wire_format: Literal["json", "msgpack"] = "json"
+    # Overall budget for one /chat request, shared by all its tool calls
+    # (API Gateway gives up at 30s)
+    chat_deadline: float = 25.0
+    # Open a specialist's circuit after this many consecutive failures,
+    # and try it again after the reset time
+    specialist_breaker_failures: int = 5
+    specialist_breaker_reset: float = 30.0
+    # Send a duplicate availability request when the first is slower than the
+    # observed p95 (or availability_hedge_after until enough calls are seen)
+    availability_hedge: bool = True
+    availability_hedge_after: float = 1.0
+    # Availability answers kept by the manager and revalidated by ETag (0 disables).
+    # The availability service only gives ETags with booking_store "sqlite".
+    availability_cache_size: int = 128
+
+    # Conversation history for requests that send a session_id
+    session_store: Literal["memory", "sqlite"] = "memory"
+    session_db_path: Optional[str] = None
+    session_ttl: float = 1800.0
+    session_max_turns: int = 10
+    session_max_bytes: int = 64_000
+
     def get_openai_api_key(self) -> str:
-        """Get OpenAI API key from env var or Secrets Manager."""
+        """Get OpenAI API key from env var or Secrets Manager (cached, see shared.get_secret)."""
         if self.openai_api_key:
             return self.openai_api_key
         if self.openai_secret_arn:
-            return _get_secret_from_aws(self.openai_secret_arn)
+            return get_secret(self.openai_secret_arn)
         raise ValueError("No OpenAI API key configured. Set OPENAI_API_KEY or OPENAI_SECRET_ARN.")
 
+    async def get_openai_api_key_async(self) -> str:
+        """get_openai_api_key() for async code: a Secrets Manager fetch won't block the loop."""
+        if self.openai_secret_arn and not self.openai_api_key:
+            return await get_secret_async(self.openai_secret_arn)
+        return self.get_openai_api_key()
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,23 @@
+"""
+Booking store shared by the Pattern G specialists.
+
+With BOOKING_STORE=sqlite, both specialists read and write the same file, so
+availability never advertises a slot the booking service has already taken.
+That needs both services on one host (e.g. run locally with uvicorn); the
+default, memory, gives each service its own bookings.
+"""
+
+from functools import lru_cache
+
+from shared import BookingService, create_booking_service
+
+from .settings import get_settings
+
+
+@lru_cache
+def get_booking_service() -> BookingService:
+    """Get the booking service for this process, backed by the configured store."""
+    settings = get_settings()
+    if settings.booking_store == "sqlite":
+        return create_booking_service(settings.booking_db_path)
+    return create_booking_service()
@@ -0,0 +1,35 @@
+"""
+Wire encoding for Pattern G service-to-service calls.
+
+Specialists answer in JSON by default, or in MessagePack when the caller sends
+``Accept: application/msgpack`` - smaller bodies and faster to decode.
+"""
+
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+
+def encode_response(model: BaseModel, accept: Optional[str]) -> Response:
+    """Encode a response model in the format the caller accepts, dropping null fields."""
+    payload = model.model_dump(exclude_none=True)
+    if accept and MSGPACK in accept:
+        import msgpack
+
+        return Response(content=msgpack.packb(payload), media_type=MSGPACK)
+    return JSONResponse(payload)
+
+
+def decode_body(content: bytes, content_type: Optional[str]) -> Any:
+    """Decode a response body according to its Content-Type."""
+    if content_type and content_type.startswith(MSGPACK):
+        import msgpack
+
+        return msgpack.unpackb(content)
+    return json.loads(content)
@@ -0,0 +1,10 @@
+"""Pytest configuration for Pattern G tests."""
+
+import os
+import tempfile
+
+# Set mock API key before any imports that need it
+os.environ.setdefault("OPENAI_API_KEY", "test-key-for-testing")
+# Fresh booking store per test session, shared by both specialists
+os.environ["BOOKING_STORE"] = "sqlite"
+os.environ["BOOKING_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bookings.sqlite3")
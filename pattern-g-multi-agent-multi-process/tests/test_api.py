@@ -0,0 +1,645 @@
+"""Integration tests for Pattern G services."""
+
+import asyncio
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from openai.types.responses import ResponseTextDeltaEvent
+
+from shared import SlotNotAvailableError, create_booking_service
+from shared.import_profile import format_report, profile_import
+from src.availability.api import app as availability_app
+from src.booking.api import app as booking_app
+from src.deadline import DEADLINE_HEADER, DeadlineMiddleware
+from src.manager.agent import configure_openai, render_slots
+from src.manager.api import _deadline_bounded, app as manager_app
+from src.manager.lambda_handler import handler
+from src.manager.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    deadline_scope,
+)
+from src.manager.specialists import (
+    SpecialistClient,
+    close_http_client,
+    get_http_client,
+    transport_factory,
+)
+from src.settings import Settings
+
+# Import time allowed for a lambda_handler module, in ms
+COLD_START_BUDGET_MS = float(os.environ.get("COLD_START_BUDGET_MS", "1000"))
+
+
+@pytest.fixture
+def tomorrow_date():
+    """Get tomorrow's date in YYYY-MM-DD format."""
+    return (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def streamed_result(*deltas, error=None):
+    """A mock Runner.run_streamed result whose events carry text deltas, then raise ``error``."""
+
+    async def stream_events():
+        for delta in deltas:
+            yield MagicMock(
+                type="raw_response_event",
+                data=ResponseTextDeltaEvent.model_construct(delta=delta),
+            )
+        if error is not None:
+            raise error
+
+    result = MagicMock(stream_events=stream_events)
+    result.to_input_list.return_value = []
+    return result
+
+
+def sse_events(body):
+    """Split a server-sent events body into (event, data) pairs."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines.get("event", "message"), json.loads(lines["data"])))
+    return events
+
+
+def asgi_client(app):
+    """Create an httpx client that calls a specialist app in-process."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+
+
+class TestSpecialistClient:
+    """Tests for the manager's specialist service clients."""
+
+    async def test_availability_process(self, tomorrow_date):
+        """Verify the client posts to the availability specialist and returns its JSON."""
+        async with asgi_client(availability_app) as http_client:
+            client = SpecialistClient(
+                "availability", "http://availability", 5.0, http_client=http_client
+            )
+            response = await client.process({"date": tomorrow_date, "time": "14:00"})
+
+        assert "Available slots" in response["result"]
+
+    async def test_booking_process(self, tomorrow_date):
+        """Verify the client posts to the booking specialist."""
+        async with asgi_client(booking_app) as http_client:
+            client = SpecialistClient(
+                "booking", "http://booking", 5.0, http_client=http_client
+            )
+            response = await client.process({"slot_id": f"{tomorrow_date}_CourtA_0900"})
+
+        assert "Booking confirmed" in response["result"]
+
+    async def test_concurrent_calls_share_one_batch_request(self, tomorrow_date):
+        """Verify tool calls made in the same step go out as one /process/batch call."""
+        dates = [
+            (datetime.now() + timedelta(days=d)).strftime("%Y-%m-%d") for d in (1, 2, 3)
+        ]
+        paths = []
+
+        async def record(request):
+            paths.append(request.url.path)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=availability_app),
+            event_hooks={"request": [record]},
+        ) as http_client:
+            client = SpecialistClient(
+                "availability",
+                "http://availability",
+                5.0,
+                batch_window=0.01,
+                http_client=http_client,
+            )
+            responses = await asyncio.gather(
+                *(client.process_batched({"date": d, "time": None}) for d in dates)
+            )
+
+        assert paths == ["/process/batch"]
+        assert [dates[i] in r["result"] for i, r in enumerate(responses)] == [True] * 3
+
+    async def test_single_call_uses_plain_endpoint(self, tomorrow_date):
+        """Verify a lone tool call is not wrapped in a batch."""
+        paths = []
+
+        async def record(request):
+            paths.append(request.url.path)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=availability_app),
+            event_hooks={"request": [record]},
+        ) as http_client:
+            client = SpecialistClient(
+                "availability", "http://availability", 5.0, http_client=http_client
+            )
+            await client.process_batched({"date": tomorrow_date, "time": None})
+
+        assert paths == ["/process"]
+
+    def test_booking_batch_runs_in_order(self, tomorrow_date):
+        """Verify a batch booking the same slot twice confirms once, then fails."""
+        slot_id = f"{tomorrow_date}_CourtB_1000"
+        response = TestClient(booking_app).post(
+            "/process/batch",
+            json={"requests": [{"slot_id": slot_id}, {"slot_id": slot_id}]},
+        )
+
+        assert response.status_code == 200
+        results = [r["result"] for r in response.json()["results"]]
+        assert results[0].startswith("Booking confirmed")
+        assert results[1].startswith("Booking failed")
+
+    async def test_structured_availability_over_msgpack(self, tomorrow_date):
+        """Verify a structured slot list survives MessagePack encoding."""
+        async with asgi_client(availability_app) as http_client:
+            client = SpecialistClient(
+                "availability",
+                "http://availability",
+                5.0,
+                wire_format="msgpack",
+                http_client=http_client,
+            )
+            response = await client.process(
+                {"date": tomorrow_date, "time": "14:00", "format": "structured"}
+            )
+
+        assert "result" not in response
+        assert [slot["court"] for slot in response["slots"]] == [
+            "Court A",
+            "Court B",
+            "Court C",
+        ]
+
+    async def test_cached_availability_revalidates(self, tomorrow_date):
+        """Verify a repeat check gets a 304, and a booking invalidates the cache."""
+        statuses = []
+
+        async def record(response):
+            statuses.append((response.request.method, response.status_code))
+
+        payload = {"date": tomorrow_date, "time": "16:00", "format": "structured"}
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=availability_app),
+            event_hooks={"response": [record]},
+        ) as http_client:
+            client = SpecialistClient(
+                "availability", "http://availability", 5.0, cache_size=8, http_client=http_client
+            )
+            first = await client.process_cached(payload)
+            second = await client.process_cached(payload)
+            TestClient(booking_app).post(
+                "/process", json={"slot_id": f"{tomorrow_date}_CourtB_1600"}
+            )
+            third = await client.process_cached(payload)
+
+        assert statuses == [("POST", 200), ("GET", 304), ("GET", 200)]
+        assert second == first
+        assert third["etag"] != first["etag"]
+        assert {"court": "Court B", "time": "16:00"} not in third["slots"]
+
+    def test_etag_is_tied_to_this_process(self, tomorrow_date):
+        """Verify a tag issued before a restart, with the same store version, is not a match."""
+        client = TestClient(availability_app)
+        params = {"date": tomorrow_date}
+        etag = client.get("/process", params=params).headers["ETag"]
+
+        with patch("src.availability.agent.BOOT_EPOCH", "restarted"):
+            response = client.get("/process", params=params, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_memory_store_gives_no_etag(self, tomorrow_date):
+        """Verify availability isn't revalidated when it can't see the booking service's bookings."""
+        client = TestClient(availability_app)
+
+        with patch("src.availability.agent.get_settings") as get_settings:
+            get_settings.return_value.booking_store = "memory"
+            response = client.get(
+                "/process", params={"date": tomorrow_date}, headers={"If-None-Match": "*"}
+            )
+
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert "etag" not in response.json()
+
+    async def test_asgi_transport_calls_app_in_process(self, tomorrow_date):
+        """Verify asgi mode reaches the specialist app without a network hop."""
+        client = SpecialistClient(
+            "availability",
+            "http://availability",
+            5.0,
+            transport=transport_factory("asgi", "availability"),
+        )
+        try:
+            response = await client.process({"date": tomorrow_date, "time": None})
+        finally:
+            await client.aclose()
+
+        assert tomorrow_date in response["result"]
+
+    def test_uds_transport_needs_socket(self):
+        """Verify uds mode without a socket path is a configuration error."""
+        assert transport_factory("http", "booking") is None
+        with pytest.raises(ValueError):
+            transport_factory("uds", "booking")
+
+    async def test_shared_http_client_is_reused(self):
+        """Verify tool calls share one pooled client per event loop."""
+        try:
+            assert get_http_client() is get_http_client()
+        finally:
+            await close_http_client()
+
+
+class TestResilience:
+    """Tests for circuit breaking, hedging and deadlines on specialist calls."""
+
+    def test_breaker_opens_then_half_opens(self):
+        """Verify the breaker rejects calls while open and closes after a good trial."""
+        now = [0.0]
+        breaker = CircuitBreaker("booking", 2, 10.0, clock=lambda: now[0])
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        now[0] = 10.0
+        assert breaker.allow()
+        assert not breaker.allow()  # one trial at a time
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    async def test_cancelled_trial_frees_half_open_circuit(self):
+        """Verify a half-open trial cancelled mid-flight doesn't block later trials."""
+        now = [0.0]
+        started = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            await asyncio.sleep(5)
+            return httpx.Response(200, json={})
+
+        breaker = CircuitBreaker("booking", 1, 10.0, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 10.0
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = SpecialistClient(
+                "booking", "http://booking", 5.0, breaker=breaker, http_client=http_client
+            )
+            trial = asyncio.create_task(client.process({"slot_id": "x"}))
+            await started.wait()
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+
+    async def test_deadline_timeout_is_not_a_breaker_failure(self):
+        """Verify a timeout cut short by the request deadline leaves the circuit closed."""
+
+        def handler(request):
+            # Stands in for a transport honouring the timeout on a slow service
+            if request.extensions["timeout"]["read"] < 1.0:
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(200, json={})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            tight = SpecialistClient(
+                "booking",
+                "http://booking",
+                5.0,
+                breaker=CircuitBreaker("booking", 1, 30.0),
+                http_client=http_client,
+            )
+            with deadline_scope(0.5):
+                with pytest.raises(httpx.ReadTimeout):
+                    await tight.process({"slot_id": "x"})
+            assert tight.breaker.state == "closed"
+
+            slow = SpecialistClient(
+                "booking",
+                "http://booking",
+                0.5,
+                breaker=CircuitBreaker("booking", 1, 30.0),
+                http_client=http_client,
+            )
+            with pytest.raises(httpx.ReadTimeout):
+                await slow.process({"slot_id": "x"})
+            assert slow.breaker.state == "open"
+
+    async def test_open_circuit_fails_fast(self):
+        """Verify repeated 5xx responses stop further calls to the service."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = SpecialistClient(
+                "booking",
+                "http://booking",
+                5.0,
+                breaker=CircuitBreaker("booking", 2, 30.0),
+                http_client=http_client,
+            )
+            for _ in range(2):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await client.process({"slot_id": "x"})
+            with pytest.raises(CircuitOpenError):
+                await client.process({"slot_id": "x"})
+
+        assert len(calls) == 2
+
+    async def test_slow_request_is_hedged(self, tomorrow_date):
+        """Verify a slow idempotent call is duplicated and the fast answer wins."""
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"result": "ok"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = SpecialistClient(
+                "availability",
+                "http://availability",
+                10.0,
+                hedge=True,
+                hedge_after=0.05,
+                http_client=http_client,
+            )
+            response = await asyncio.wait_for(
+                client.process({"date": tomorrow_date}), timeout=1.0
+            )
+
+        assert response == {"result": "ok"}
+        assert client.hedges_sent == 1
+        assert len(calls) == 2
+
+    async def test_deadline_is_propagated(self, tomorrow_date):
+        """Verify the remaining budget is sent downstream and enforced."""
+        headers = []
+
+        def handler(request):
+            headers.append(request.headers.get(DEADLINE_HEADER))
+            return httpx.Response(200, json={"result": "ok"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http_client:
+            client = SpecialistClient(
+                "availability", "http://availability", 10.0, http_client=http_client
+            )
+            with deadline_scope(2.0):
+                await client.process({"date": tomorrow_date})
+            with deadline_scope(0.0):
+                with pytest.raises(DeadlineExceededError):
+                    await client.process({"date": tomorrow_date})
+
+        assert len(headers) == 1
+        assert 0 < float(headers[0]) <= 2.0
+
+    async def test_abandoned_stream_is_closed(self):
+        """Verify the reply stream is closed when its consumer stops early."""
+        closed = asyncio.Event()
+
+        async def deltas():
+            try:
+                yield "Court A"
+                await asyncio.sleep(5)
+                yield " is free"
+            finally:
+                closed.set()
+
+        bounded = _deadline_bounded(deltas())
+        assert await anext(bounded) == "Court A"
+        await bounded.aclose()
+
+        assert closed.is_set()
+
+    def test_specialist_refuses_expired_request(self, tomorrow_date):
+        """Verify a specialist answers 504 without working once the budget is spent."""
+        client = TestClient(availability_app)
+        payload = {"date": tomorrow_date}
+
+        with patch("src.availability.api._answer") as answer:
+            expired = client.post("/process", json=payload, headers={DEADLINE_HEADER: "0"})
+        answer.assert_not_called()
+        assert expired.status_code == 504
+
+        in_time = client.post("/process", json=payload, headers={DEADLINE_HEADER: "5"})
+        assert in_time.status_code == 200
+
+    async def test_specialist_work_is_cut_off_at_deadline(self):
+        """Verify a request still running when its budget runs out is cancelled."""
+        cancelled = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=DeadlineMiddleware(slow_app))
+        ) as client:
+            response = await asyncio.wait_for(
+                client.post("http://booking/process", headers={DEADLINE_HEADER: "0.05"}), 1.0
+            )
+
+        assert response.status_code == 504
+        assert cancelled.is_set()
+
+    def test_chat_returns_504_at_deadline(self):
+        """Verify /chat gives up with a 504 once the request deadline passes."""
+
+        async def slow_run(message, session_id=None):
+            await asyncio.sleep(5)
+
+        with (
+            patch("src.manager.agent.run_manager", slow_run),
+            patch("src.manager.api.settings.chat_deadline", 0.05),
+        ):
+            response = TestClient(manager_app).post("/chat", json={"message": "hi"})
+
+        assert response.status_code == 504
+
+
+class TestManagerChat:
+    """Tests for the manager's /chat endpoint."""
+
+    def test_chat_session_sends_earlier_turns(self):
+        """Verify a follow-up in a session runs with the earlier turns as input."""
+        first_turn = [
+            {"role": "user", "content": "What is available tomorrow?"},
+            {"role": "assistant", "content": "Court A at 09:00"},
+        ]
+        result = MagicMock(final_output="Done")
+        result.to_input_list.return_value = first_turn
+        with patch("src.manager.agent.Runner.run", AsyncMock(return_value=result)) as run:
+            client = TestClient(manager_app)
+            client.post("/chat", json={"message": first_turn[0]["content"], "session_id": "s1"})
+            response = client.post("/chat", json={"message": "Book it", "session_id": "s1"})
+
+        assert response.json()["session_id"] == "s1"
+        assert run.call_args.args[1] == [*first_turn, {"role": "user", "content": "Book it"}]
+
+    def test_chat_stream_sends_deltas_then_done(self):
+        """Verify /chat/stream sends the manager's reply as deltas, then in full."""
+        result = streamed_result("Court A ", "is free.")
+        with patch("src.manager.agent.Runner.run_streamed", MagicMock(return_value=result)):
+            response = TestClient(manager_app).post("/chat/stream", json={"message": "Any?"})
+
+        assert response.status_code == 200
+        assert sse_events(response.text) == [
+            ("message", {"delta": "Court A "}),
+            ("message", {"delta": "is free."}),
+            ("done", {"response": "Court A is free."}),
+        ]
+
+    def test_chat_stream_reports_deadline(self):
+        """Verify a stream cut off by the deadline says so, and nothing more."""
+
+        async def stalled_events():
+            yield MagicMock(
+                type="raw_response_event",
+                data=ResponseTextDeltaEvent.model_construct(delta="Court "),
+            )
+            await asyncio.sleep(5)
+
+        result = MagicMock(stream_events=stalled_events)
+        with (
+            patch("src.manager.agent.Runner.run_streamed", MagicMock(return_value=result)),
+            patch("src.manager.api.settings.chat_deadline", 0.05),
+        ):
+            response = TestClient(manager_app).post("/chat/stream", json={"message": "Any?"})
+
+        assert sse_events(response.text) == [
+            ("message", {"delta": "Court "}),
+            ("error", {"detail": "Request deadline exceeded"}),
+        ]
+
+
+class TestSharedBookingStore:
+    """Tests for the booking state shared by both specialists."""
+
+    def test_availability_sees_bookings(self, tomorrow_date):
+        """Verify a slot booked via the booking service is no longer advertised."""
+        slot_id = f"{tomorrow_date}_CourtC_1400"
+        booked = TestClient(booking_app).post("/process", json={"slot_id": slot_id})
+        assert booked.json()["result"].startswith("Booking confirmed")
+
+        response = TestClient(availability_app).post(
+            "/process", json={"date": tomorrow_date, "time": "14:00", "format": "structured"}
+        )
+
+        assert {"court": "Court C", "time": "14:00"} not in response.json()["slots"]
+
+    def test_store_defaults_to_memory(self, monkeypatch):
+        """Verify SQLite is opt-in, since separate Lambda functions can't share its file."""
+        monkeypatch.delenv("BOOKING_STORE", raising=False)
+
+        assert Settings(_env_file=None).booking_store == "memory"
+
+    def test_services_on_same_file_share_state(self, tmp_path, tomorrow_date):
+        """Verify two services on one SQLite file cannot book the same slot."""
+        db_path = str(tmp_path / "bookings.sqlite3")
+        first = create_booking_service(db_path)
+        second = create_booking_service(db_path)
+        slot_id = f"{tomorrow_date}_CourtA_1100"
+
+        booking = first.book(slot_id)
+
+        assert second.get_booking(booking.booking_id) == booking
+        assert slot_id not in [s.slot_id for s in second.check_availability(tomorrow_date)]
+        with pytest.raises(SlotNotAvailableError):
+            second.book(slot_id)
+
+
+class TestRenderSlots:
+    """Tests for the manager's compact availability rendering."""
+
+    def test_groups_slot_ids_by_time(self, tomorrow_date):
+        """Verify slots are grouped by time, each with its exact slot_id."""
+        slots = [
+            {"court": "Court A", "time": "09:00"},
+            {"court": "Court B", "time": "09:00"},
+            {"court": "Court A", "time": "10:00"},
+        ]
+
+        assert render_slots(tomorrow_date, None, slots) == (
+            f"Available on {tomorrow_date} (slot_ids by time):\n"
+            f"09:00: {tomorrow_date}_CourtA_0900 {tomorrow_date}_CourtB_0900\n"
+            f"10:00: {tomorrow_date}_CourtA_1000"
+        )
+
+    def test_rendered_slot_ids_book(self, tomorrow_date):
+        """Verify every slot_id shown for a date is accepted by the booking service."""
+        service = create_booking_service()
+        slots = [
+            {"court": slot.court, "time": slot.time}
+            for slot in service.check_availability(tomorrow_date)
+        ]
+        rendered = render_slots(tomorrow_date, None, slots)
+        slot_ids = [
+            slot_id for line in rendered.splitlines()[1:] for slot_id in line.split()[1:]
+        ]
+
+        assert len(slot_ids) == len(slots)
+        for slot_id in slot_ids:
+            assert service.book(slot_id).slot_id == slot_id
+
+    def test_no_slots(self, tomorrow_date):
+        """Verify the empty case matches the specialist's text message."""
+        assert render_slots(tomorrow_date, "09:00", []) == (
+            f"No available slots found for {tomorrow_date} at 09:00"
+        )
+
+
+class TestHealthEndpoints:
+    """Health checks for each service."""
+
+    @pytest.mark.parametrize(
+        "app,service",
+        [
+            (manager_app, "manager"),
+            (availability_app, "availability-specialist"),
+            (booking_app, "booking-specialist"),
+        ],
+    )
+    def test_health_endpoint(self, app, service):
+        """Verify health endpoint works."""
+        response = TestClient(app).get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["service"] == service
+
+
+class TestColdStart:
+    """Tests for keeping Lambda init work out of the handler import."""
+
+    def test_handler_import_skips_agents_sdk(self):
+        """Verify importing the handler stays within the cold-start budget."""
+        profile = profile_import("src.manager.lambda_handler", Path(__file__).parent.parent)
+
+        assert "agents" not in profile.modules
+        assert "openai" not in profile.modules
+        assert profile.total_ms < COLD_START_BUDGET_MS, format_report(profile)
+
+    def test_warmup_event(self):
+        """Verify a warmup event runs the first-request setup instead of the app."""
+        assert handler({"warmup": True}, None) == {"warmed": True}
+        assert configure_openai.cache_info().currsize == 1
@@ -0,0 +1,86 @@
+"""
+Microbenchmark for the Pattern H invoker's per-request overhead.
+
+Compares the original approach (new boto3 client per request, ``str +=`` per
+chunk) with the current one (process-wide client, single decode) against a
+stubbed completion event stream. No AWS credentials or network are needed.
+
+Run with: uv run benchmarks/invoker_client.py
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path so we can import from src
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("BEDROCK_AGENT_ID", "bench-agent")
+os.environ.setdefault("BEDROCK_AGENT_ALIAS_ID", "bench-alias")
+
+import boto3
+
+from src.invoker.agent import _chunk_bytes, get_bedrock_client
+
+REQUESTS = 50
+CHUNKS = [("Court A is available at 15:00. " * 4).encode()] * 200
+
+
+def stub_completion() -> list[dict]:
+    """A completion event stream as returned by invoke_agent."""
+    return [{"chunk": {"bytes": chunk}} for chunk in CHUNKS]
+
+
+def assemble_concat(completion: list[dict]) -> str:
+    """Original assembly: decode and concatenate every chunk."""
+    result = ""
+    for event in completion:
+        if "chunk" in event:
+            chunk_data = event["chunk"]
+            if "bytes" in chunk_data:
+                result += chunk_data["bytes"].decode("utf-8")
+    return result
+
+
+def assemble_join(completion: list[dict]) -> str:
+    """Current assembly: collect raw bytes, decode once."""
+    return b"".join(_chunk_bytes(completion)).decode("utf-8")
+
+
+def per_request(func) -> float:
+    """Average milliseconds per call over REQUESTS calls."""
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        func()
+    return (time.perf_counter() - start) * 1000 / REQUESTS
+
+
+def main():
+    """Print per-request timings for each approach."""
+    region = os.environ.get("AWS_REGION", "us-east-1")
+    get_bedrock_client()  # warm the shared client, as the first request would
+
+    results = [
+        (
+            "client: new per request",
+            per_request(lambda: boto3.client("bedrock-agent-runtime", region_name=region)),
+        ),
+        ("client: process-wide", per_request(get_bedrock_client)),
+        ("chunks: str += decode", per_request(lambda: assemble_concat(stub_completion()))),
+        ("chunks: join + decode", per_request(lambda: assemble_join(stub_completion()))),
+    ]
+
+    print("=" * 50)
+    print("Pattern H invoker: per-request overhead")
+    print("=" * 50)
+    for name, ms in results:
+        print(f"{name:<28} {ms:>10.3f} ms")
+
+    saved = (results[0][1] + results[2][1]) - (results[1][1] + results[3][1])
+    print("-" * 50)
+    print(f"{'saved per request':<28} {saved:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,54 +4,181 @@ Bedrock Agent Invoker - Pattern H
 Invokes the AWS Bedrock Agent and collects the streaming response.
 """
 
+import asyncio
+import codecs
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Optional
+
 import boto3
+from botocore.config import Config
 
 from ..settings import get_settings
 
 settings = get_settings()
 
+# boto3 is blocking, so invocations run on a bounded pool instead of the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.bedrock_max_concurrency,
+    thread_name_prefix="bedrock-invoke",
+)
 
-def invoke_bedrock_agent(message: str, session_id: str) -> str:
-    """
-    Invoke the Bedrock Agent and return the response.
+# boto3's default session is not thread-safe while creating clients
+_client_lock = threading.Lock()
 
-    Args:
-        message: User's input message
-        session_id: Session ID for conversation continuity
 
-    Returns:
-        The agent's response text
+@lru_cache
+def _create_bedrock_client() -> Any:
+    """Create the bedrock-agent-runtime client with a pool sized for the executor."""
+    config = Config(
+        max_pool_connections=settings.bedrock_max_concurrency,
+        connect_timeout=settings.bedrock_connect_timeout,
+        read_timeout=settings.bedrock_read_timeout,
+        retries={"max_attempts": settings.bedrock_max_attempts, "mode": "standard"},
+    )
+    return boto3.client(
+        "bedrock-agent-runtime",
+        region_name=settings.aws_region,
+        endpoint_url=settings.bedrock_endpoint_url,
+        config=config,
+    )
+
+
+def get_bedrock_client() -> Any:
     """
-    client = boto3.client("bedrock-agent-runtime", region_name=settings.aws_region)
+    Get the process-wide bedrock-agent-runtime client.
 
+    Creating a client loads service models and a new connection pool, so it
+    is built once and shared; boto3 clients are safe to use across threads.
+    """
+    with _client_lock:
+        return _create_bedrock_client()
+
+
+def _invoke(message: str, session_id: str) -> Any:
+    """Start an agent invocation and return its completion event stream."""
     if not settings.bedrock_agent_id or not settings.bedrock_agent_alias_id:
         raise ValueError(
             "BEDROCK_AGENT_ID and BEDROCK_AGENT_ALIAS_ID must be configured"
         )
 
-    response = client.invoke_agent(
+    response = get_bedrock_client().invoke_agent(
         agentId=settings.bedrock_agent_id,
         agentAliasId=settings.bedrock_agent_alias_id,
         sessionId=session_id,
         inputText=message,
     )
+    return response.get("completion", [])
 
-    # Collect the streaming response
-    result = ""
-    for event in response.get("completion", []):
+
+def _chunk_bytes(completion: Any) -> Iterator[bytes]:
+    """Yield the raw bytes of each chunk event in a completion stream."""
+    for event in completion:
         if "chunk" in event:
             chunk_data = event["chunk"]
             if "bytes" in chunk_data:
-                result += chunk_data["bytes"].decode("utf-8")
+                yield chunk_data["bytes"]
+
+
+def _close_stream(completion: Any) -> None:
+    """Close a completion event stream and its HTTP connection, if it is still open."""
+    close = getattr(completion, "close", None)
+    if close is not None:
+        close()
+
+
+def _stream_text(completion: Any) -> Iterator[str]:
+    """Yield the decoded text of each chunk in a completion stream."""
+    # A multi-byte character may be split across chunks, so decode incrementally
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in _chunk_bytes(completion):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def invoke_bedrock_agent_stream(message: str, session_id: str) -> Iterator[str]:
+    """
+    Invoke the Bedrock Agent and yield response text as chunks arrive.
 
-    return result
+    Args:
+        message: User's input message
+        session_id: Session ID for conversation continuity
+
+    Yields:
+        Decoded text of each completion chunk
+    """
+    completion = _invoke(message, session_id)
+    try:
+        yield from _stream_text(completion)
+    finally:
+        _close_stream(completion)
+
+
+def invoke_bedrock_agent(message: str, session_id: str) -> str:
+    """
+    Invoke the Bedrock Agent and return the response.
+
+    Args:
+        message: User's input message
+        session_id: Session ID for conversation continuity
+
+    Returns:
+        The agent's response text
+    """
+    completion = _invoke(message, session_id)
+
+    # Collect raw chunks and decode once at the end
+    return b"".join(_chunk_bytes(completion)).decode("utf-8")
 
 
 async def invoke_bedrock_agent_async(message: str, session_id: str) -> str:
     """
-    Async wrapper for invoke_bedrock_agent.
+    Invoke the Bedrock Agent without blocking the event loop.
+
+    The boto3 call runs on a thread pool capped at
+    ``settings.bedrock_max_concurrency`` workers, so one process can serve
+    many Bedrock sessions at once.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, invoke_bedrock_agent, message, session_id
+    )
+
+
+async def invoke_bedrock_agent_stream_async(
+    message: str, session_id: str
+) -> AsyncIterator[str]:
+    """
+    Async variant of invoke_bedrock_agent_stream.
 
-    Note: boto3 doesn't have native async support, so this runs synchronously.
-    For true async, consider using aioboto3.
+    Each blocking read of the completion stream runs on the Bedrock thread
+    pool, so waiting for the next chunk never stalls the event loop. If this
+    is closed early (e.g. the client disconnected), the Bedrock stream is
+    closed at once, waking a worker blocked reading it, and the reader is
+    closed once that read has returned.
     """
-    return invoke_bedrock_agent(message, session_id)
+    loop = asyncio.get_running_loop()
+    completion = await loop.run_in_executor(_executor, _invoke, message, session_id)
+    chunks = _stream_text(completion)
+    pending: Optional[Future] = None
+    try:
+        while True:
+            pending = _executor.submit(next, chunks, None)
+            text = await asyncio.wrap_future(pending)
+            if text is None:
+                return
+            yield text
+    finally:
+        _close_stream(completion)
+        if pending is None or pending.done():
+            chunks.close()
+        else:
+            # A generator can't be closed while a worker is running it
+            pending.add_done_callback(lambda _: chunks.close())
@@ -5,9 +5,12 @@ User-facing API that invokes the Bedrock Agent.
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+from shared import sse_stream
 
 from ..models import ChatRequest, ChatResponse
-from .agent import invoke_bedrock_agent
+from .agent import invoke_bedrock_agent_async, invoke_bedrock_agent_stream_async
 
 
 app = FastAPI(
@@ -28,7 +31,7 @@ async def chat(request: ChatRequest) -> ChatResponse:
     This is Pattern H: AWS Bedrock manages the conversation loop.
     """
     try:
-        response = invoke_bedrock_agent(request.message, request.session_id)
+        response = await invoke_bedrock_agent_async(request.message, request.session_id)
         return ChatResponse(response=response, session_id=request.session_id)
     except ValueError as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -36,6 +39,21 @@ async def chat(request: ChatRequest) -> ChatResponse:
         raise HTTPException(status_code=500, detail=f"Agent invocation failed: {e}")
 
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Send a message to the Bedrock Agent, streaming the reply as server-sent events.
+
+    Each Bedrock ``completion`` chunk is forwarded as soon as it arrives
+    instead of being concatenated, followed by a final ``done`` event.
+    """
+    chunks = invoke_bedrock_agent_stream_async(request.message, request.session_id)
+    return StreamingResponse(
+        sse_stream(chunks),
+        media_type="text/event-stream",
+    )
+
+
 @app.get("/health")
 async def health() -> dict:
     """Health check endpoint."""
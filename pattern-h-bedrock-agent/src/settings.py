@@ -19,6 +19,16 @@ class Settings(BaseSettings):
     # AWS configuration
     aws_region: str = "us-east-1"
 
+    # Maximum Bedrock invocations running at once; extra requests wait in line
+    bedrock_max_concurrency: int = 16
+
+    # bedrock-agent-runtime client tuning
+    bedrock_connect_timeout: float = 5.0
+    bedrock_read_timeout: float = 120.0
+    bedrock_max_attempts: int = 3
+    # Send Bedrock calls somewhere other than AWS, e.g. a local stub
+    bedrock_endpoint_url: Optional[str] = None
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,7 @@
+"""Pytest configuration for Pattern H tests."""
+
+import os
+
+# Point the invoker at a fake agent before any imports read settings
+os.environ.setdefault("BEDROCK_AGENT_ID", "test-agent-id")
+os.environ.setdefault("BEDROCK_AGENT_ALIAS_ID", "test-alias-id")
@@ -0,0 +1,252 @@
+"""Integration tests for Pattern H invoker API."""
+
+import asyncio
+import base64
+import json
+import struct
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.invoker.agent import (
+    _create_bedrock_client,
+    get_bedrock_client,
+    invoke_bedrock_agent_stream_async,
+    settings,
+)
+from src.invoker.api import app
+
+
+class StubBedrockAgentRuntime:
+    """
+    Stand-in for the bedrock-agent-runtime client with a blocking invoke.
+
+    With ``overlap=n``, each invoke blocks until n are in progress at once,
+    so n invocations only complete if they run concurrently.
+    """
+
+    def __init__(self, chunks, overlap=None):
+        self.chunks = chunks
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self._barrier = threading.Barrier(overlap, timeout=5) if overlap else None
+
+    def invoke_agent(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            if self._barrier:
+                self._barrier.wait()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return {"completion": ({"chunk": {"bytes": chunk}} for chunk in self.chunks)}
+
+
+class BlockingCompletion:
+    """Completion event stream that sends one chunk, then blocks until closed."""
+
+    def __init__(self, chunk):
+        self.chunk = chunk
+        self.closed = threading.Event()
+        self.reader_finished = threading.Event()
+
+    def __iter__(self):
+        try:
+            yield {"chunk": {"bytes": self.chunk}}
+            self.closed.wait(timeout=5)
+        finally:
+            self.reader_finished.set()
+
+    def close(self):
+        self.closed.set()
+
+
+def event_stream_message(chunk: bytes) -> bytes:
+    """Encode a completion chunk as an AWS event stream message."""
+    headers = b"".join(
+        # Name length and name, then type 7 (string), value length and value
+        bytes([len(name)]) + name.encode() + b"\x07" + struct.pack(">H", len(value))
+        + value.encode()
+        for name, value in (
+            (":event-type", "chunk"),
+            (":message-type", "event"),
+            (":content-type", "application/json"),
+        )
+    )
+    payload = json.dumps({"bytes": base64.b64encode(chunk).decode()}).encode()
+    prelude = struct.pack(">II", 16 + len(headers) + len(payload), len(headers))
+    message = prelude + struct.pack(">I", zlib.crc32(prelude)) + headers + payload
+    return message + struct.pack(">I", zlib.crc32(message))
+
+
+class BedrockStubServer(ThreadingHTTPServer):
+    """
+    Local HTTP stand-in for the bedrock-agent-runtime endpoint.
+
+    Each InvokeAgent request is held until ``overlap`` are open at once, then
+    answered with an event stream echoing its session ID.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, overlap):
+        self.paths = []
+        self.barrier = threading.Barrier(overlap, timeout=5)
+        super().__init__(("127.0.0.1", 0), BedrockStubHandler)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class BedrockStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.paths.append(self.path)
+        self.server.barrier.wait()
+        session_id = self.path.split("/")[-2]
+        body = event_stream_message(b"Hello ") + event_stream_message(session_id.encode())
+        self.send_response(200)
+        self.send_header("Content-Type", "application/vnd.amazon.eventstream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def bedrock_stub(monkeypatch):
+    """Point the real bedrock-agent-runtime client at a local stub server."""
+    server = BedrockStubServer(overlap=5)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "bedrock_endpoint_url", server.url)
+    monkeypatch.setattr(settings, "bedrock_agent_id", "AGENT")
+    monkeypatch.setattr(settings, "bedrock_agent_alias_id", "ALIAS")
+    _create_bedrock_client.cache_clear()
+    yield server
+    _create_bedrock_client.cache_clear()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    """Create test client."""
+    return TestClient(app)
+
+
+class TestChatEndpoint:
+    """Integration tests for /chat endpoint."""
+
+    def test_chat_returns_agent_response(self, client):
+        """Verify completion chunks are assembled into one response."""
+        stub = StubBedrockAgentRuntime([b"Court A ", b"is free."])
+        with patch("src.invoker.agent.get_bedrock_client", return_value=stub):
+            response = client.post(
+                "/chat", json={"message": "Any courts?", "session_id": "s1"}
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"response": "Court A is free.", "session_id": "s1"}
+        assert stub.calls[0]["sessionId"] == "s1"
+
+    async def test_chat_serves_concurrent_sessions(self):
+        """Verify a blocked Bedrock call does not hold up other requests."""
+        stub = StubBedrockAgentRuntime([b"ok"], overlap=5)
+        transport = httpx.ASGITransport(app=app)
+
+        with patch("src.invoker.agent.get_bedrock_client", return_value=stub):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://test"
+            ) as http:
+                responses = await asyncio.gather(*(
+                    http.post("/chat", json={"message": "hi", "session_id": f"s{i}"})
+                    for i in range(5)
+                ))
+
+        assert all(r.status_code == 200 for r in responses)
+        assert stub.peak == 5
+
+    async def test_shared_client_serves_concurrent_sessions(self, bedrock_stub):
+        """Verify the pooled boto3 client holds concurrent invocations open over HTTP."""
+        transport = httpx.ASGITransport(app=app)
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            responses = await asyncio.gather(*(
+                http.post("/chat", json={"message": "hi", "session_id": f"s{i}"})
+                for i in range(5)
+            ))
+
+        assert [r.json()["response"] for r in responses] == [f"Hello s{i}" for i in range(5)]
+        assert sorted(bedrock_stub.paths) == [
+            f"/agents/AGENT/agentAliases/ALIAS/sessions/s{i}/text" for i in range(5)
+        ]
+
+    def test_chat_stream_forwards_chunks(self, client):
+        """Verify each completion chunk is sent as its own event, even mid-character."""
+        encoded = "Café A is free.".encode()
+        stub = StubBedrockAgentRuntime([encoded[:4], encoded[4:]])
+        with patch("src.invoker.agent.get_bedrock_client", return_value=stub):
+            response = client.post("/chat/stream", json={"message": "Any courts?"})
+
+        assert response.status_code == 200
+        assert response.text.count("data: ") == 3
+        assert response.text.endswith(
+            'event: done\ndata: {"response": "Caf\\u00e9 A is free."}\n\n'
+        )
+
+    async def test_abandoned_stream_is_closed(self):
+        """Verify a stream given up mid-reply closes the Bedrock stream and frees its worker."""
+        completion = BlockingCompletion(b"Court A")
+        stub = MagicMock()
+        stub.invoke_agent.return_value = {"completion": completion}
+
+        with patch("src.invoker.agent.get_bedrock_client", return_value=stub):
+            stream = invoke_bedrock_agent_stream_async("Any courts?", "s1")
+            assert await anext(stream) == "Court A"
+            reading = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0.05)
+            reading.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await reading
+            await stream.aclose()
+
+        assert completion.closed.is_set()
+        assert await asyncio.to_thread(completion.reader_finished.wait, 5)
+
+    def test_bedrock_client_is_created_once(self):
+        """Verify the runtime client is built once with a pool sized for the executor."""
+        _create_bedrock_client.cache_clear()
+        try:
+            with patch("boto3.client") as make_client:
+                first = get_bedrock_client()
+                second = get_bedrock_client()
+
+            assert first is second
+            assert make_client.call_count == 1
+            config = make_client.call_args.kwargs["config"]
+            assert config.max_pool_connections == 16
+            assert config.retries["mode"] == "standard"
+        finally:
+            _create_bedrock_client.cache_clear()
+
+    def test_health_endpoint(self, client):
+        """Verify health endpoint works."""
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["pattern"] == "H"
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for every Lambda handler.
+
+For each pattern-*/src/**/lambda_handler.py, a fresh interpreter imports the
+handler and invokes it with a synthetic API Gateway (HTTP API, payload 2.0)
+event - or a Bedrock action group event for Pattern H's action handler -
+with OpenAI calls going to shared.mock_llm. It records:
+
+- import_ms: importing the handler module (the Lambda init phase)
+- first_invoke_ms: the first invocation, including any first-use setup
+- warm_invoke_ms: median of the following invocations
+- peak_rss_mb: the interpreter's peak resident set size
+
+Results are compared against cold_start_thresholds.json; the exit status is
+1 if any handler is over a threshold or didn't respond with a 2xx status.
+
+Usage: python scripts/cold_start_bench.py [pattern-name ...] [--output results.json]
+Example: python scripts/cold_start_bench.py pattern-e-single-agent --runs 5
+"""
+
+import argparse
+import base64
+import importlib
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional
+
+SCRIPT_DIR = Path(__file__).parent.absolute()
+PROJECT_ROOT = SCRIPT_DIR.parent
+THRESHOLDS_FILE = SCRIPT_DIR / "cold_start_thresholds.json"
+
+sys.path.insert(0, str(PROJECT_ROOT))
+
+METRICS = ("import_ms", "first_invoke_ms", "warm_invoke_ms", "peak_rss_mb")
+
+TOMORROW = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+CHAT = ("POST", "/chat", {"message": "Book a court tomorrow at 2pm"})
+
+# Request sent to each handler, by "<pattern>/<module>"; the default is CHAT.
+# Pattern H's invoker calls Bedrock, which is not mocked, so it gets /health.
+REQUESTS = {
+    "pattern-g-multi-agent-multi-process/src.availability.lambda_handler": (
+        "POST", "/process", {"date": TOMORROW, "format": "structured"}
+    ),
+    "pattern-g-multi-agent-multi-process/src.booking.lambda_handler": (
+        "POST", "/process", {"slot_id": f"{TOMORROW}_CourtA_1400"}
+    ),
+    "pattern-h-bedrock-agent/src.invoker.lambda_handler": ("GET", "/health", None),
+}
+
+
+@dataclass
+class Result:
+    """Cold-start measurements for one handler."""
+
+    handler: str
+    status: Optional[int]
+    import_ms: float
+    first_invoke_ms: float
+    warm_invoke_ms: float
+    peak_rss_mb: float
+
+
+def find_handlers(patterns: list[str]) -> list[tuple[str, str]]:
+    """
+    Find lambda_handler modules.
+
+    Returns:
+        (pattern directory name, dotted module) pairs, e.g.
+        ("pattern-g-multi-agent-multi-process", "src.manager.lambda_handler")
+    """
+    handlers = []
+    for pattern_dir in sorted(PROJECT_ROOT.glob("pattern-*")):
+        if patterns and pattern_dir.name not in patterns:
+            continue
+        for path in sorted((pattern_dir / "src").rglob("lambda_handler.py")):
+            module = ".".join(path.relative_to(pattern_dir).with_suffix("").parts)
+            handlers.append((pattern_dir.name, module))
+    return handlers
+
+
+def api_gateway_event(method: str, path: str, body: Optional[dict]) -> dict:
+    """Build an API Gateway HTTP API (payload format 2.0) event."""
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"content-type": "application/json", "host": "localhost"},
+        "requestContext": {
+            "accountId": "000000000000",
+            "apiId": "bench",
+            "domainName": "localhost",
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "cold-start-bench",
+            },
+            "requestId": "bench",
+            "routeKey": "$default",
+            "stage": "$default",
+            "timeEpoch": int(time.time() * 1000),
+        },
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+def bedrock_action_event() -> dict:
+    """Build a Bedrock Agent action group event for Pattern H's action handler."""
+    return {
+        "messageVersion": "1.0",
+        "actionGroup": "booking",
+        "apiPath": "/check-availability",
+        "httpMethod": "GET",
+        "parameters": [{"name": "date", "type": "string", "value": TOMORROW}],
+    }
+
+
+def event_for(pattern: str, module: str) -> dict:
+    """The synthetic event a handler is invoked with."""
+    if module == "src.action.lambda_handler":
+        return bedrock_action_event()
+    return api_gateway_event(*REQUESTS.get(f"{pattern}/{module}", CHAT))
+
+
+def _status(response: Any) -> Optional[int]:
+    """HTTP status of a handler response, from Mangum or a Bedrock action."""
+    if not isinstance(response, dict):
+        return None
+    if "statusCode" in response:
+        return response["statusCode"]
+    return response.get("response", {}).get("httpStatusCode")
+
+
+def measure(module_name: str, event: dict, warm_invokes: int) -> dict:
+    """
+    Import a handler and invoke it, in the current (fresh) interpreter.
+
+    Returns:
+        The measurements, with the first invocation's status
+    """
+    context = SimpleNamespace(
+        function_name="cold-start-bench",
+        aws_request_id="bench",
+        get_remaining_time_in_millis=lambda: 30_000,
+    )
+
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    response = module.handler(event, context)
+    first_invoke_ms = (time.perf_counter() - start) * 1000
+
+    warm = []
+    for _ in range(warm_invokes):
+        start = time.perf_counter()
+        module.handler(event, context)
+        warm.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "status": _status(response),
+        "import_ms": import_ms,
+        "first_invoke_ms": first_invoke_ms,
+        "warm_invoke_ms": statistics.median(warm) if warm else 0.0,
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def run_child(pattern: str, module: str, env: dict, warm_invokes: int) -> dict:
+    """Measure one handler in a fresh interpreter, from its pattern directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "result.json"
+        event = base64.b64encode(json.dumps(event_for(pattern, module)).encode()).decode()
+        result = subprocess.run(
+            [
+                sys.executable, __file__, "--child", module, event, str(output),
+                "--warm-invokes", str(warm_invokes),
+            ],
+            cwd=PROJECT_ROOT / pattern,
+            env={**os.environ, **env, "BOOKING_DB_PATH": str(Path(tmp) / "bookings.sqlite3")},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 or not output.exists():
+            raise RuntimeError(f"{pattern}/{module} failed:\n{result.stderr[-2000:]}")
+        return json.loads(output.read_text())
+
+
+def benchmark(handlers: list[tuple[str, str]], runs: int, warm_invokes: int) -> list[Result]:
+    """Benchmark each handler, taking the median of each metric over ``runs`` cold starts."""
+    from shared.mock_llm import MockLLMServer
+
+    results = []
+    with MockLLMServer() as llm:
+        env = {
+            "OPENAI_API_KEY": "mock-key",
+            "OPENAI_BASE_URL": llm.base_url,
+            "OPENAI_AGENTS_DISABLE_TRACING": "1",
+            "AWS_DEFAULT_REGION": os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        }
+        for pattern, module in handlers:
+            samples = [run_child(pattern, module, env, warm_invokes) for _ in range(runs)]
+            results.append(
+                Result(
+                    handler=f"{pattern}/{module}",
+                    # Any failed cold start's status, else the first's
+                    status=next(
+                        (s["status"] for s in samples if not 200 <= (s["status"] or 0) < 300),
+                        samples[0]["status"],
+                    ),
+                    **{
+                        metric: round(statistics.median(s[metric] for s in samples), 1)
+                        for metric in METRICS
+                    },
+                )
+            )
+            print(f"  {results[-1].handler}: {results[-1].import_ms:.0f} ms import")
+    return results
+
+
+def check_thresholds(results: list[Result], thresholds: dict) -> list[str]:
+    """
+    Compare results against thresholds.
+
+    Thresholds are {"default": {metric: limit}, "handlers": {handler: {metric: limit}}};
+    a handler's own limits override the defaults. A handler that didn't
+    respond with a 2xx status fails whatever its timings, since an error
+    response can be fast for the wrong reasons.
+
+    Returns:
+        A description of each limit exceeded or failed request
+    """
+    failures = []
+    for result in results:
+        if result.status is None or not 200 <= result.status < 300:
+            failures.append(f"{result.handler}: status {result.status}, expected 2xx")
+        limits = {**thresholds.get("default", {}), **thresholds.get("handlers", {}).get(
+            result.handler, {}
+        )}
+        for metric, limit in limits.items():
+            value = getattr(result, metric)
+            if value > limit:
+                failures.append(f"{result.handler}: {metric} {value} > {limit}")
+    return failures
+
+
+def print_table(results: list[Result]) -> None:
+    """Print results as a table."""
+    print(f"\n{'handler':<68} {'status':>6} {'import':>8} {'first':>8} {'warm':>7} {'rss MB':>7}")
+    for r in results:
+        print(
+            f"{r.handler:<68} {r.status or '-':>6} {r.import_ms:>8.0f} "
+            f"{r.first_invoke_ms:>8.0f} {r.warm_invoke_ms:>7.1f} {r.peak_rss_mb:>7.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for Lambda handlers")
+    parser.add_argument("patterns", nargs="*", help="Pattern directories (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per handler")
+    parser.add_argument("--warm-invokes", type=int, default=5, help="Invocations after the first")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--thresholds", type=Path, default=THRESHOLDS_FILE)
+    parser.add_argument("--child", nargs=3, metavar=("MODULE", "EVENT", "OUTPUT"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        module, event, output = args.child
+        # Import from the pattern directory, like Lambda does from the package root
+        sys.path.insert(0, os.getcwd())
+        result = measure(module, json.loads(base64.b64decode(event)), args.warm_invokes)
+        Path(output).write_text(json.dumps(result))
+        return
+
+    handlers = find_handlers(args.patterns)
+    if not handlers:
+        print("Error: no lambda_handler.py found")
+        sys.exit(1)
+
+    print(f"Benchmarking {len(handlers)} handlers ({args.runs} cold starts each)...")
+    results = benchmark(handlers, args.runs, args.warm_invokes)
+    print_table(results)
+
+    thresholds = json.loads(args.thresholds.read_text()) if args.thresholds.exists() else {}
+    failures = check_thresholds(results, thresholds)
+
+    if args.output:
+        args.output.write_text(json.dumps(
+            {"results": [asdict(r) for r in results], "failures": failures}, indent=2
+        ))
+        print(f"\nResults: {args.output}")
+
+    if failures:
+        print("\nCold-start thresholds exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll handlers within cold-start thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,65 @@
 #!/usr/bin/env python3
 """
 Package Lambda functions using Docker for AWS compatibility.
-Usage: python package_lambda.py <pattern-name>
-Example: python package_lambda.py pattern-a-ai-as-service
+Usage: python package_lambda.py <pattern-name> [<pattern-name> ...] [--optimize]
+       python package_lambda.py --all [--jobs N] [--report build-report.json]
+Example: python package_lambda.py pattern-a-ai-as-service --optimize
+
+--optimize prunes files Lambda never loads (tests, type stubs, dist-info
+extras other than license texts, unused botocore service models, dev-only
+packages) and precompiles
+everything to unchecked-hash .pyc, so the zip is smaller and cold starts
+don't compile bytecode. Zips are always deterministic: same inputs, same bytes.
+
+Builds are incremental (see package_lambda); --rebuild starts from scratch.
 """
 
+import argparse
+import fnmatch
+import hashlib
+import json
 import os
+import stat
 import sys
 import shutil
 import subprocess
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+LAMBDA_IMAGE = "public.ecr.aws/lambda/python:3.12"
+
+# Resolved requirements and installed dependency layers, shared by all patterns
+CACHE_DIR = Path(__file__).parent.absolute().parent / ".lambda-cache"
+
+# Patterns that deploy several functions from one zip, and their dist/ subdirectories
+FUNCTION_ZIPS = {
+    "pattern-g-multi-agent-multi-process": ["manager", "availability", "booking"],
+    "pattern-h-bedrock-agent": ["action", "invoker"],
+}
+
+# Fixed timestamp for zip entries (the earliest a zip can store)
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+# Installed but never imported in Lambda: build tools, and the local dev server
+# (Mangum serves the app on Lambda)
+PRUNE_PACKAGES = {
+    "_distutils_hack", "bin", "click", "pip", "pkg_resources", "setuptools",
+    "uvicorn", "wheel",
+}
+PRUNE_DIRS = {"__pycache__", "test", "tests"}
+PRUNE_SUFFIXES = {".pyi", ".pyx", ".pxd", ".c", ".h", ".md", ".rst"}
+PRUNE_FILES = {"py.typed"}
+# importlib.metadata only needs these from a .dist-info directory
+KEEP_DIST_INFO = {"METADATA", "entry_points.txt", "top_level.txt"}
+# License texts a .dist-info directory may carry, kept so the zip still ships
+# them: files matching these, and the licenses/ directory (PEP 639)
+KEEP_LICENSE_FILES = {"LICENSE*", "LICENCE*", "COPYING*", "NOTICE*", "licenses"}
+# botocore ships models for every AWS service; these are the ones we call
+# (shared.secret_cache, Pattern H's invoker)
+BOTOCORE_SERVICES = {"secretsmanager", "bedrock-agent-runtime"}
+
 def run_command(cmd, cwd=None, env=None):
     """Run a command and capture output."""
     print(f"Running: {' '.join(cmd)}")
@@ -25,97 +74,587 @@ def run_command(cmd, cwd=None, env=None):
         print(f"Error executing command: {e}")
         sys.exit(1)
 
-def package_lambda(pattern_name: str):
-    """Package the Lambda function with all dependencies."""
+def _remove(path):
+    """Delete a file or directory, returning the bytes freed."""
+    if path.is_dir():
+        size = sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+        shutil.rmtree(path)
+    else:
+        size = path.stat().st_size
+        path.unlink()
+    return size
 
-    # Define paths
-    script_dir = Path(__file__).parent.absolute()
-    project_root = script_dir.parent
-    pattern_dir = project_root / pattern_name
 
-    if not pattern_dir.exists():
-        print(f"Error: Pattern directory '{pattern_dir}' does not exist")
-        sys.exit(1)
+def _is_license(path: Path, build_dir: Path) -> bool:
+    """Whether a path is a license text in a .dist-info directory (or in its licenses/)."""
+    parts = path.relative_to(build_dir).parts
+    return (
+        len(parts) > 1
+        and parts[0].endswith(".dist-info")
+        and any(fnmatch.fnmatch(parts[1], pattern) for pattern in KEEP_LICENSE_FILES)
+    )
+
+
+def prune_build(build_dir: Path) -> int:
+    """
+    Delete files the Lambda runtime never loads.
+
+    Returns:
+        Bytes removed
+    """
+    freed = 0
+    for name in PRUNE_PACKAGES:
+        path = build_dir / name
+        if path.exists():
+            freed += _remove(path)
+        for dist_info in build_dir.glob(f"{name}-*.dist-info"):
+            freed += _remove(dist_info)
+
+    for dist_info in build_dir.glob("*.dist-info"):
+        for path in dist_info.iterdir():
+            if path.name not in KEEP_DIST_INFO and not _is_license(path, build_dir):
+                freed += _remove(path)
+
+    botocore_data = build_dir / "botocore" / "data"
+    if botocore_data.exists():
+        for service in botocore_data.iterdir():
+            if service.is_dir() and service.name not in BOTOCORE_SERVICES:
+                freed += _remove(service)
+
+    # Top-level packages are never removed here, only tests etc. inside them
+    for path in sorted(build_dir.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+        if not path.exists() or path.parent == build_dir and path.is_dir():
+            continue
+        if _is_license(path, build_dir):
+            # e.g. LICENSE.md, or licenses/*.rst
+            continue
+        if path.is_dir():
+            if path.name in PRUNE_DIRS:
+                freed += _remove(path)
+        elif path.suffix in PRUNE_SUFFIXES or path.name in PRUNE_FILES:
+            freed += _remove(path)
+
+    # Directories left empty, deepest first
+    for path in sorted(build_dir.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+        if path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+    return freed
+
+
+def precompile(build_dir: Path):
+    """
+    Compile every module to .pyc with the Lambda image's Python.
+
+    Unchecked-hash .pyc files are used without comparing them to the .py
+    (mtimes don't survive zipping anyway) and don't embed a timestamp, so
+    they keep the zip deterministic.
+    """
+    run_command([
+        "docker", "run", "--rm",
+        "--platform", "linux/amd64",
+        "--entrypoint", "python",
+        "-v", f"{build_dir}:/build",
+        LAMBDA_IMAGE,
+        "-m", "compileall", "-q", "-j", "0",
+        "--invalidation-mode", "unchecked-hash", "/build",
+    ])
+
+
+def write_zip(build_dir: Path, zip_path: Path, append: bool = False, include=None):
+    """
+    Zip a build directory deterministically.
+
+    Entries are sorted, with a fixed timestamp and permissions, so the same
+    build directory always produces the same bytes (and the same hash).
+
+    Args:
+        build_dir: Directory whose contents go at the zip root
+        zip_path: Zip file to write
+        append: Add to an existing zip instead of replacing it
+        include: Only zip these top-level entries of build_dir
+    """
+    roots = [build_dir / name for name in include] if include else [build_dir]
+    files = sorted(
+        (path.relative_to(build_dir).as_posix(), path)
+        for root in roots
+        for path in root.rglob("*")
+        if path.is_file()
+    )
+    mode = "a" if append else "w"
+    with zipfile.ZipFile(zip_path, mode, zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        for arcname, path in files:
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            mode = 0o755 if os.access(path, os.X_OK) else 0o644
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            zf.writestr(info, path.read_bytes())
+
+
+def size_report(zip_path: Path) -> list:
+    """
+    Size of each top-level package in a zip.
+
+    Returns:
+        (package, compressed bytes, uncompressed bytes) tuples, largest first;
+        all .dist-info directories are counted together
+    """
+    sizes = {}
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            name = info.filename.split("/")[0]
+            if name.endswith(".dist-info"):
+                name = "*.dist-info"
+            compressed, uncompressed = sizes.get(name, (0, 0))
+            sizes[name] = (compressed + info.compress_size, uncompressed + info.file_size)
+    return sorted(
+        ((name, c, u) for name, (c, u) in sizes.items()), key=lambda row: row[1], reverse=True
+    )
+
+
+def print_size_report(zip_path: Path, top: int = 15):
+    """Print the largest packages in a zip."""
+    rows = size_report(zip_path)
+    print(f"\n{'package':<28} {'zipped MB':>10} {'unzipped MB':>12}")
+    for name, compressed, uncompressed in rows[:top]:
+        print(f"{name:<28} {compressed / 2**20:>10.2f} {uncompressed / 2**20:>12.2f}")
+    if len(rows) > top:
+        rest = rows[top:]
+        print(
+            f"{f'({len(rest)} more)':<28} {sum(r[1] for r in rest) / 2**20:>10.2f} "
+            f"{sum(r[2] for r in rest) / 2**20:>12.2f}"
+        )
+
+
+def _sha256(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def hash_tree(*roots: Path) -> str:
+    """Hash the source files under some directories (bytecode excluded)."""
+    parts = []
+    for root in roots:
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and "__pycache__" not in path.parts and path.suffix != ".pyc":
+                parts += [f"{root.name}/{path.relative_to(root).as_posix()}".encode(), path.read_bytes()]
+    return _sha256(*parts)
+
+
+def resolve_requirements(pattern_dir: Path, project_root: Path, refresh: bool = False) -> str:
+    """
+    Resolve a pattern's dependencies to pinned requirements.
+
+    The result is cached by the pyproject.toml and uv.lock files it depends
+    on, so uv only runs when one of them changes (or with ``refresh``).
+
+    Returns:
+        The requirements, with uv's comments removed
+    """
+    inputs = [
+        pattern_dir / "pyproject.toml", pattern_dir / "uv.lock",
+        project_root / "pyproject.toml", project_root / "uv.lock",
+    ]
+    key = _sha256(*(path.read_bytes() for path in inputs if path.exists()))
+    cached = CACHE_DIR / "requirements" / f"{key[:16]}.txt"
+    if cached.exists() and not refresh:
+        print(f"Requirements unchanged, using cached {cached.name}")
+        return cached.read_text()
 
-    dist_dir = pattern_dir / "dist"
-    build_dir = dist_dir / "build"
-    
-    # 1. Clean previous build
-    print("Cleaning previous build...")
-    if dist_dir.exists():
-        shutil.rmtree(dist_dir)
-    build_dir.mkdir(parents=True)
-    
-    # 2. Generate requirements.txt
     # We use 'uv pip compile' to ignore local package 'ai-orchestration-shared'
     # which we will copy manually later.
     print("Generating requirements from pyproject.toml...")
-    req_file = script_dir / "requirements-lambda.txt"
-    
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    compiled = cached.with_suffix(f".{os.getpid()}.tmp")
     run_command(
-        ["uv", "pip", "compile", "pyproject.toml", "-o", str(req_file), "--no-emit-package", "ai-orchestration-shared"],
+        ["uv", "pip", "compile", "pyproject.toml", "-o", str(compiled), "--no-emit-package", "ai-orchestration-shared"],
         cwd=str(pattern_dir)
     )
-    
-    # 3. Install dependencies using Docker
+    # Keep only the pins: uv's header names the output file, which would
+    # make identical resolutions hash differently
+    pins = [line.split("#")[0].strip() for line in compiled.read_text().splitlines()]
+    requirements = "\n".join(pin for pin in pins if pin) + "\n"
+    cached.write_text(requirements)
+    compiled.unlink()
+    return requirements
+
+
+def layer_dir_for(requirements: str, optimize: bool) -> Path:
+    """The cache directory for a dependency layer, named by a hash of its inputs."""
+    key_parts = [requirements.encode(), LAMBDA_IMAGE.encode()]
+    if optimize:
+        # Pruned layers depend on the prune rules too
+        rules = [
+            PRUNE_PACKAGES, PRUNE_DIRS, PRUNE_SUFFIXES, PRUNE_FILES, KEEP_DIST_INFO,
+            KEEP_LICENSE_FILES, BOTOCORE_SERVICES,
+        ]
+        key_parts.append(repr([sorted(rule) for rule in rules]).encode())
+    return CACHE_DIR / "layers" / _sha256(*key_parts)[:16]
+
+
+def build_dependency_layer(requirements: str, optimize: bool, rebuild: bool = False) -> Path:
+    """
+    Install dependencies into a cached layer directory, shared by every
+    pattern that resolves to the same requirements.
+
+    The layer directory holds:
+    - python/: the installed packages, in Lambda layer layout
+    - deps.zip: the same packages at the zip root, to start function zips from
+    - layer.zip: python/ zipped, to publish as a Lambda layer
+
+    Returns:
+        The layer directory
+    """
+    layer_dir = layer_dir_for(requirements, optimize)
+    if (layer_dir / "deps.zip").exists() and not rebuild:
+        print(f"Dependencies unchanged, reusing layer {layer_dir.name}")
+        return layer_dir
+
+    # Build next to the cache entry, then rename it into place, so a failed
+    # or concurrent build never leaves a half-built layer behind
+    staging = layer_dir.with_name(f"{layer_dir.name}.{os.getpid()}.tmp")
+    if staging.exists():
+        shutil.rmtree(staging)
+    site_dir = staging / "python"
+    site_dir.mkdir(parents=True)
+    req_file = staging / "requirements.txt"
+    req_file.write_text(requirements)
+
+    # Install dependencies using Docker
     # This ensures we get Linux-compatible wheels (essential for AWS Lambda)
     print("Installing dependencies with Docker...")
-    
+
     try:
         run_command(["docker", "--version"])
     except FileNotFoundError:
         print("Error: Docker is not installed or not in PATH")
         sys.exit(1)
-        
+
     docker_cmd = [
         "docker", "run", "--rm",
         "--platform", "linux/amd64",
         "--entrypoint", "pip",
-        "-v", f"{build_dir}:/build",
+        "-v", f"{site_dir}:/build",
         "-v", f"{req_file}:/requirements.txt",
-        "public.ecr.aws/lambda/python:3.12",
+        LAMBDA_IMAGE,
         "install", "-r", "/requirements.txt", "-t", "/build", "--upgrade", "--no-cache-dir"
     ]
-    
+
     run_command(docker_cmd)
-    
-    # 4. Copy source code
-    print("Copying source files...")
-    
+
+    # Optimize: prune, then precompile what's left
+    if optimize:
+        print("Pruning files Lambda never loads...")
+        freed = prune_build(site_dir)
+        print(f"Pruned {freed / (1024 * 1024):.2f} MB")
+
+        print("Precompiling dependency bytecode...")
+        precompile(site_dir)
+
+    print("Zipping dependency layer...")
+    write_zip(site_dir, staging / "deps.zip")
+    write_zip(staging, staging / "layer.zip", include=["python"])
+
+    if layer_dir.exists():
+        shutil.rmtree(layer_dir)
+    staging.rename(layer_dir)
+    return layer_dir
+
+
+def package_code(
+    pattern_name: str,
+    requirements: str,
+    layer_dir: Path,
+    optimize: bool = False,
+    layer: bool = False,
+    rebuild: bool = False,
+) -> dict:
+    """
+    Zip a pattern's code with its dependency layer, unless nothing changed.
+
+    Returns:
+        The zip path, its size, the previous build's size, and whether it was rebuilt
+    """
+    project_root = Path(__file__).parent.absolute().parent
+    pattern_dir = project_root / pattern_name
+    dist_dir = pattern_dir / "dist"
+    build_dir = dist_dir / "build"
+    zip_path = dist_dir / "lambda.zip"
+    manifest_path = dist_dir / "build.json"
+
+    previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    inputs = {
+        "dependencies": layer_dir.name,
+        "code": hash_tree(pattern_dir / "src", project_root / "shared"),
+        "optimize": optimize,
+        "layer": layer,
+    }
+    result = {
+        "zip": str(zip_path),
+        "previous_size": previous.get("size"),
+        "rebuilt": True,
+    }
+
+    # Skip packaging if neither code nor dependencies changed
+    if not rebuild and zip_path.exists() and previous.get("inputs") == inputs:
+        print(f"Up to date: {zip_path}")
+        return {**result, "size": zip_path.stat().st_size, "rebuilt": False}
+
+    # Copy source code
+    print(f"Copying {pattern_name} source files...")
+    if dist_dir.exists():
+        shutil.rmtree(dist_dir)
+    build_dir.mkdir(parents=True)
+
     # Copy src directory
     shutil.copytree(pattern_dir / "src", build_dir / "src")
-    
+
     # Copy shared directory
     shutil.copytree(project_root / "shared", build_dir / "shared")
-    
-    # 5. Create zip file
-    print("Creating zip archive...")
-    zip_path = dist_dir / "lambda.zip"
-    
-    # shutil.make_archive creates the zip file. 
-    # root_dir is the directory to zip (build_dir)
-    # base_dir is '.' to include everything inside build_dir at root of zip
-    shutil.make_archive(
-        str(dist_dir / "lambda"), 
-        'zip', 
-        root_dir=str(build_dir), 
-        base_dir='.'
-    )
-    
+
+    # Drop bytecode copied from local runs; it would make the zip differ
+    # between machines
+    for cache in build_dir.glob("**/__pycache__"):
+        shutil.rmtree(cache)
+    if optimize:
+        print("Precompiling bytecode...")
+        precompile(build_dir)
+
+    # Create zip file: the cached dependency zip plus the code
+    print(f"Creating {pattern_name} zip archive...")
+    if layer:
+        write_zip(build_dir, zip_path)
+        # Terraform attaches dist/layer.zip to the pattern's functions
+        shutil.copyfile(layer_dir / "layer.zip", dist_dir / "layer.zip")
+    else:
+        shutil.copyfile(layer_dir / "deps.zip", zip_path)
+        write_zip(build_dir, zip_path, append=True)
+
+    # Patterns with several functions deploy the same zip for each
+    for function in FUNCTION_ZIPS.get(pattern_name, []):
+        (dist_dir / function).mkdir()
+        shutil.copyfile(zip_path, dist_dir / function / "lambda.zip")
+
+    size = zip_path.stat().st_size
+    (dist_dir / "requirements.txt").write_text(requirements)
+    manifest_path.write_text(json.dumps({"inputs": inputs, "size": size}, indent=2) + "\n")
+    return {**result, "size": size}
+
+
+def package_lambda(
+    pattern_name: str,
+    optimize: bool = False,
+    layer: bool = False,
+    rebuild: bool = False,
+):
+    """
+    Package the Lambda function with all dependencies.
+
+    Each stage is skipped when its inputs haven't changed: requirements are
+    resolved again only when pyproject.toml/uv.lock change, dependencies are
+    installed again only when the resolved requirements change, and the zip
+    is rebuilt only when the code or dependencies change.
+
+    Args:
+        pattern_name: Pattern directory, e.g. "pattern-a-ai-as-service"
+        optimize: Prune unused files and precompile .pyc
+        layer: Leave dependencies out of lambda.zip and write them to dist/layer.zip
+        rebuild: Ignore all cached stages
+    """
+
+    # Define paths
+    script_dir = Path(__file__).parent.absolute()
+    project_root = script_dir.parent
+    pattern_dir = project_root / pattern_name
+
+    if not pattern_dir.exists():
+        print(f"Error: Pattern directory '{pattern_dir}' does not exist")
+        sys.exit(1)
+
+    # 1. Resolve requirements
+    requirements = resolve_requirements(pattern_dir, project_root, refresh=rebuild)
+
+    # 2. Install dependencies into the shared layer cache
+    layer_dir = build_dependency_layer(requirements, optimize, rebuild=rebuild)
+
+    # 3. Zip the code with the dependencies
+    result = package_code(pattern_name, requirements, layer_dir, optimize, layer, rebuild)
+    zip_path = Path(result["zip"])
+    if not result["rebuilt"]:
+        return zip_path
+    print_size_report(zip_path)
+
     # Calculate size
     size_mb = zip_path.stat().st_size / (1024 * 1024)
     print(f"\nBuild complete!")
     print(f"File: {zip_path}")
     print(f"Size: {size_mb:.2f} MB")
-    
+    if layer:
+        print(f"Layer: {zip_path.parent / 'layer.zip'}")
+
     return zip_path
 
+
+def _timed(function, *args):
+    """Call a function in a worker process, returning its result and duration."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def package_patterns(
+    pattern_names: list,
+    optimize: bool = False,
+    layer: bool = False,
+    rebuild: bool = False,
+    jobs: int = 0,
+) -> list:
+    """
+    Package several patterns concurrently.
+
+    Runs in three stages, each across a process pool: resolve every
+    pattern's requirements, build each distinct dependency layer once (patterns
+    with the same resolved requirements share it), then zip each pattern.
+
+    Args:
+        pattern_names: Pattern directories
+        jobs: Worker processes (default: one per CPU)
+
+    Returns:
+        One report per pattern: seconds per stage, zip size and size change
+    """
+    project_root = Path(__file__).parent.absolute().parent
+    for name in pattern_names:
+        if not (project_root / name).exists():
+            print(f"Error: Pattern directory '{project_root / name}' does not exist")
+            sys.exit(1)
+
+    with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+        # 1. Resolve requirements
+        resolved = list(pool.map(
+            _timed,
+            [resolve_requirements] * len(pattern_names),
+            [project_root / name for name in pattern_names],
+            [project_root] * len(pattern_names),
+            [rebuild] * len(pattern_names),
+        ))
+        requirements = {name: reqs for name, (reqs, _) in zip(pattern_names, resolved)}
+
+        # 2. Build each distinct dependency layer once
+        distinct = sorted(set(requirements.values()))
+        layers = dict(zip(distinct, pool.map(
+            _timed,
+            [build_dependency_layer] * len(distinct),
+            distinct,
+            [optimize] * len(distinct),
+            [rebuild] * len(distinct),
+        )))
+
+        # 3. Zip each pattern
+        packaged = list(pool.map(
+            _timed,
+            [package_code] * len(pattern_names),
+            pattern_names,
+            [requirements[name] for name in pattern_names],
+            [layers[requirements[name]][0] for name in pattern_names],
+            [optimize] * len(pattern_names),
+            [layer] * len(pattern_names),
+            [rebuild] * len(pattern_names),
+        ))
+
+    reports = []
+    for name, (_, resolve_seconds), (result, package_seconds) in zip(
+        pattern_names, resolved, packaged
+    ):
+        layer_dir, dependency_seconds = layers[requirements[name]]
+        previous = result["previous_size"]
+        reports.append({
+            "pattern": name,
+            "layer": layer_dir.name,
+            "rebuilt": result["rebuilt"],
+            "seconds": {
+                "resolve": round(resolve_seconds, 2),
+                # Shared layers are built once; each pattern sharing it shows the same time
+                "dependencies": round(dependency_seconds, 2),
+                "package": round(package_seconds, 2),
+            },
+            "zip": result["zip"],
+            "size": result["size"],
+            "size_delta": result["size"] - previous if previous is not None else None,
+        })
+    return reports
+
+
+def print_build_report(reports: list):
+    """Print the per-pattern build report."""
+    print(f"\n{'pattern':<40} {'layer':<17} {'resolve':>8} {'deps':>8} {'zip':>7} "
+          f"{'MB':>7} {'delta KB':>9}")
+    for report in reports:
+        seconds = report["seconds"]
+        delta = report["size_delta"]
+        delta_text = "new" if delta is None else f"{delta / 1024:+.1f}"
+        status = "" if report["rebuilt"] else "  (up to date)"
+        print(
+            f"{report['pattern']:<40} {report['layer']:<17} {seconds['resolve']:>7.1f}s "
+            f"{seconds['dependencies']:>7.1f}s {seconds['package']:>6.1f}s "
+            f"{report['size'] / 2**20:>7.2f} {delta_text:>9}{status}"
+        )
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python package_lambda.py <pattern-name>")
-        print("Example: python package_lambda.py pattern-a-ai-as-service")
-        print("         python package_lambda.py pattern-b-workflow-single-process")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Package patterns' Lambda functions",
+        epilog="Example: python package_lambda.py pattern-a-ai-as-service --optimize",
+    )
+    parser.add_argument(
+        "pattern_names", nargs="*", help="Pattern directories, e.g. pattern-a-ai-as-service"
+    )
+    parser.add_argument("--all", action="store_true", help="Package every pattern")
+    parser.add_argument(
+        "--optimize",
+        action="store_true",
+        help="Prune unused files and precompile .pyc for a smaller, faster-loading zip",
+    )
+    parser.add_argument(
+        "--layer",
+        action="store_true",
+        help="Leave dependencies out of lambda.zip and write them to dist/layer.zip, "
+        "which terraform deploys as a layer",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Resolve and install dependencies again, ignoring the cache",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=0, help="Parallel builds for several patterns (default: CPUs)"
+    )
+    parser.add_argument(
+        "--report", type=Path, help="Write the build report for several patterns as JSON"
+    )
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.absolute().parent
+    if args.all:
+        pattern_names = sorted(p.name for p in project_root.glob("pattern-*") if p.is_dir())
+    else:
+        pattern_names = args.pattern_names
+    if not pattern_names:
+        parser.error("give one or more pattern names, or --all")
 
-    pattern_name = sys.argv[1]
-    package_lambda(pattern_name)
+    if len(pattern_names) == 1:
+        package_lambda(
+            pattern_names[0], optimize=args.optimize, layer=args.layer, rebuild=args.rebuild
+        )
+    else:
+        start = time.perf_counter()
+        reports = package_patterns(
+            pattern_names, args.optimize, args.layer, args.rebuild, args.jobs
+        )
+        print_build_report(reports)
+        print(f"\nBuilt {len(reports)} patterns in {time.perf_counter() - start:.1f}s")
+        if args.report:
+            args.report.write_text(json.dumps(reports, indent=2) + "\n")
+            print(f"Report: {args.report}")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Prompt-cache benchmark for the OpenAI patterns (A-G).
+
+Drives each pattern's chat handler through a short conversation - several
+turns with one session_id, for the patterns that keep history - in a fresh
+interpreter, then reports the LLM gateway's usage metrics:
+
+- prompt_tokens / cached_tokens: summed over every LLM call
+- cached_ratio: share of prompt tokens served from the provider's prompt cache
+- latency_p50_ms / latency_p95_ms: per LLM call
+
+By default calls go to shared.mock_llm, which reports cached tokens using
+OpenAI's prompt-caching rules (prefixes of 1024+ tokens), so changes to
+prompt layout can be compared offline. --live calls the real API, which
+also makes the latency figures meaningful. --baseline compares against an
+earlier --output file.
+
+Usage: python scripts/prompt_cache_bench.py [pattern-name ...] [--turns N] [--live]
+Example: python scripts/prompt_cache_bench.py pattern-d-function-calling --output after.json
+"""
+
+import argparse
+import base64
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from cold_start_bench import PROJECT_ROOT, api_gateway_event, find_handlers
+
+METRICS = ("prompt_tokens", "cached_tokens", "cached_ratio", "latency_p50_ms", "latency_p95_ms")
+
+# A conversation that needs the date, availability and a booking
+TURNS = [
+    "What courts are free tomorrow afternoon?",
+    "And the day after?",
+    "Book the first slot tomorrow at 2pm",
+    "What's free next Monday morning?",
+    "Thanks, that's all",
+]
+
+
+def chat_handlers(patterns: list[str]) -> list[tuple[str, str]]:
+    """The /chat handlers of the OpenAI patterns (not G's specialists or Pattern H)."""
+    return [
+        (pattern, module)
+        for pattern, module in find_handlers(patterns)
+        if module in ("src.lambda_handler", "src.manager.lambda_handler")
+        and not pattern.startswith("pattern-h")
+    ]
+
+
+def converse(module_name: str, turns: list[str]) -> dict:
+    """
+    Send each turn to a handler, in the current (fresh) interpreter.
+
+    Returns:
+        The gateway's metrics snapshot, with the status of each turn
+    """
+    from shared.llm import get_llm_gateway
+
+    context = SimpleNamespace(function_name="prompt-cache-bench", aws_request_id="bench")
+    module = importlib.import_module(module_name)
+    statuses = []
+    for message in turns:
+        event = api_gateway_event("POST", "/chat", {"message": message, "session_id": "bench"})
+        statuses.append(module.handler(event, context).get("statusCode"))
+    return {"statuses": statuses, **get_llm_gateway().metrics_snapshot()}
+
+
+def run_child(pattern: str, module: str, env: dict, turns: list[str]) -> dict:
+    """Run one conversation in a fresh interpreter, from the pattern directory."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = Path(tmp) / "result.json"
+        encoded = base64.b64encode(json.dumps(turns).encode()).decode()
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", module, encoded, str(output)],
+            cwd=PROJECT_ROOT / pattern,
+            env={
+                **os.environ,
+                **env,
+                "BOOKING_DB_PATH": str(Path(tmp) / "bookings.sqlite3"),
+                "SESSION_DB_PATH": str(Path(tmp) / "sessions.sqlite3"),
+            },
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 or not output.exists():
+            raise RuntimeError(f"{pattern}/{module} failed:\n{result.stderr[-2000:]}")
+        return json.loads(output.read_text())
+
+
+def benchmark(handlers: list[tuple[str, str]], turns: list[str], live: bool) -> dict[str, dict]:
+    """Run the conversation against each handler, returning metrics by handler."""
+    from shared.mock_llm import MockLLMServer
+
+    results = {}
+    env = {"OPENAI_AGENTS_DISABLE_TRACING": "1"}
+    if live:
+        for pattern, module in handlers:
+            results[f"{pattern}/{module}"] = run_child(pattern, module, env, turns)
+        return results
+
+    with MockLLMServer() as llm:
+        env.update({"OPENAI_API_KEY": "mock-key", "OPENAI_BASE_URL": llm.base_url})
+        for pattern, module in handlers:
+            results[f"{pattern}/{module}"] = run_child(pattern, module, env, turns)
+    return results
+
+
+def _format(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def print_table(results: dict[str, dict], baseline: dict[str, dict]) -> None:
+    """Print metrics by handler, with the change from the baseline where there is one."""
+    width = max(len(handler) for handler in results) + 2
+    print(f"\n{'handler':<{width}}" + " ".join(f"{m:>16}" for m in METRICS))
+    for handler, metrics in results.items():
+        cells = []
+        for metric in METRICS:
+            cell = _format(metrics.get(metric))
+            before = baseline.get(handler, {}).get(metric)
+            if before is not None and metrics.get(metric) is not None:
+                cell += f" ({metrics[metric] - before:+.3g})"
+            cells.append(f"{cell:>16}")
+        print(f"{handler:<{width}}" + " ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prompt-cache benchmark for the chat handlers")
+    parser.add_argument("patterns", nargs="*", help="Pattern directories (default: A-G)")
+    parser.add_argument("--turns", type=int, default=len(TURNS), help="Conversation turns")
+    parser.add_argument("--live", action="store_true", help="Call the real OpenAI API")
+    parser.add_argument("--output", type=Path, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare with")
+    parser.add_argument("--child", nargs=3, metavar=("MODULE", "TURNS", "OUTPUT"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        module, turns, output = args.child
+        sys.path.insert(0, os.getcwd())
+        result = converse(module, json.loads(base64.b64decode(turns)))
+        Path(output).write_text(json.dumps(result))
+        return
+
+    if args.live and not os.environ.get("OPENAI_API_KEY"):
+        print("Error: --live needs OPENAI_API_KEY")
+        sys.exit(1)
+
+    handlers = chat_handlers(args.patterns)
+    if not handlers:
+        print("Error: no chat handlers found")
+        sys.exit(1)
+
+    turns = [TURNS[i % len(TURNS)] for i in range(args.turns)]
+    print(f"Running a {len(turns)}-turn conversation against {len(handlers)} handlers...")
+    results = benchmark(handlers, turns, args.live)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    print_table(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"\nResults: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+from .admission import AdmissionMiddleware
 from .booking_service import (
     Booking,
     BookingError,
@@ -10,7 +11,20 @@ from .booking_service import (
     SlotNotAvailableError,
     SlotNotFoundError,
     create_booking_service,
+    make_slot_id,
 )
+from .conversation_store import (
+    ConversationStore,
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+    create_conversation_store,
+    trim_history,
+)
+from .limiter import AdaptiveLimiter, get_llm_limiter
+from .secret_cache import SecretCache, get_secret, get_secret_async, get_secret_cache
+from .sqlite_booking_service import SQLiteBookingService
+from .sse import format_sse, sse_stream
+
 
 def get_env_file() -> Path | None:
     """Find .env file by searching up from current working directory."""
@@ -24,12 +38,28 @@ def get_env_file() -> Path | None:
 
 
 __all__ = [
+    "AdaptiveLimiter",
+    "AdmissionMiddleware",
     "Booking",
     "BookingError",
     "BookingService",
+    "ConversationStore",
+    "InMemoryConversationStore",
+    "SQLiteBookingService",
+    "SQLiteConversationStore",
+    "SecretCache",
     "Slot",
     "SlotNotAvailableError",
     "SlotNotFoundError",
     "create_booking_service",
+    "create_conversation_store",
+    "format_sse",
     "get_env_file",
+    "get_llm_limiter",
+    "get_secret",
+    "get_secret_async",
+    "get_secret_cache",
+    "make_slot_id",
+    "sse_stream",
+    "trim_history",
 ]
@@ -0,0 +1,91 @@
+"""
+Admission control for LLM-backed endpoints.
+
+Once LLM calls are at the limiter's limit (shared.limiter), extra requests
+only queue behind them, and every request's latency grows with the queue.
+AdmissionMiddleware answers requests beyond a short queue at once with 503
+and Retry-After instead, so clients back off while admitted requests keep a
+steady latency.
+"""
+
+import json
+import os
+import threading
+from typing import Callable, Optional
+
+from .limiter import AdaptiveLimiter, get_llm_limiter
+
+BUSY_BODY = json.dumps({"detail": "Service busy, please retry shortly"}).encode()
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that sheds load on LLM-backed routes.
+
+    A request to a guarded route is admitted while fewer than
+    ``limiter.limit + max_queue`` are in progress; a streamed response counts
+    until it has been sent in full. Other routes (e.g. /health) pass through.
+
+    Usage: ``app.add_middleware(AdmissionMiddleware)``
+
+    Args:
+        app: The ASGI app to guard
+        paths: Routes to guard
+        max_queue: Requests admitted beyond the limit, to wait for a slot
+            (default: LLM_MAX_QUEUE, or 16)
+        limiter: Limiter whose limit is followed (default: the process-wide one)
+        retry_after: Seconds rejected clients are told to wait
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        *,
+        paths: tuple[str, ...] = ("/chat", "/chat/stream"),
+        max_queue: Optional[int] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        retry_after: int = 1,
+    ) -> None:
+        self.app = app
+        self.paths = frozenset(paths)
+        self.max_queue = (
+            max_queue if max_queue is not None else int(os.environ.get("LLM_MAX_QUEUE", "16"))
+        )
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.rejected = 0
+        self._limiter = limiter
+        self._lock = threading.Lock()
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        # Resolved per request, so LLM_* settings are read on first use, not at import
+        limiter = self._limiter or get_llm_limiter()
+        with self._lock:
+            admitted = self.in_flight < limiter.limit + self.max_queue
+            if admitted:
+                self.in_flight += 1
+            else:
+                self.rejected += 1
+
+        if not admitted:
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def _reject(self, send: Callable) -> None:
+        """Send 503 Service Unavailable without touching the app."""
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(BUSY_BODY)).encode()),
+            (b"retry-after", str(self.retry_after).encode()),
+        ]
+        await send({"type": "http.response.start", "status": 503, "headers": headers})
+        await send({"type": "http.response.body", "body": BUSY_BODY})
@@ -4,6 +4,7 @@ Used across all orchestration patterns as the core business logic.
 """
 
 import logging
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
@@ -31,6 +32,11 @@ class SlotNotAvailableError(BookingError):
         super().__init__(f"Slot '{slot_id}' is already booked")
 
 
+def make_slot_id(date: str, court: str, time: str) -> str:
+    """Build a slot ID, e.g. ("2024-12-15", "Court A", "14:00") -> "2024-12-15_CourtA_1400"."""
+    return f"{date}_{court.replace(' ', '')}_{time.replace(':', '')}"
+
+
 @dataclass
 class Slot:
     """A bookable time slot."""
@@ -55,6 +61,32 @@ class Booking:
     status: str = "confirmed"
 
 
+def generate_mock_slots() -> list[Slot]:
+    """Generate mock slots for the next 7 days, a few of them already booked."""
+    courts = ["Court A", "Court B", "Court C"]
+    times = ["09:00", "10:00", "11:00", "14:00", "15:00", "16:00", "17:00"]
+
+    slots: list[Slot] = []
+    today = datetime.now()
+    for day_offset in range(7):
+        date = (today + timedelta(days=day_offset)).strftime("%Y-%m-%d")
+        for court in courts:
+            for time in times:
+                slots.append(
+                    Slot(
+                        slot_id=make_slot_id(date, court, time),
+                        court=court,
+                        date=date,
+                        time=time,
+                    )
+                )
+
+    # Mark some slots as already booked for realism
+    for slot in slots[:5]:
+        slot.is_available = False
+    return slots
+
+
 class BookingService:
     """
     In-memory mock booking service for tennis courts.
@@ -65,30 +97,14 @@ class BookingService:
         self._slots: dict[str, Slot] = {}
         self._bookings: dict[str, Booking] = {}
         self._booking_counter: int = 0
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
         self._initialize_mock_data()
 
     def _initialize_mock_data(self) -> None:
         """Generate mock slots for the next 7 days."""
-        courts = ["Court A", "Court B", "Court C"]
-        times = ["09:00", "10:00", "11:00", "14:00", "15:00", "16:00", "17:00"]
-
-        today = datetime.now()
-        for day_offset in range(7):
-            date = (today + timedelta(days=day_offset)).strftime("%Y-%m-%d")
-            for court in courts:
-                for time in times:
-                    slot_id = f"{date}_{court.replace(' ', '')}_{time.replace(':', '')}"
-                    self._slots[slot_id] = Slot(
-                        slot_id=slot_id,
-                        court=court,
-                        date=date,
-                        time=time,
-                    )
-
-        # Mark some slots as already booked for realism
-        sample_booked = list(self._slots.keys())[:5]
-        for slot_id in sample_booked:
-            self._slots[slot_id].is_available = False
+        for slot in generate_mock_slots():
+            self._slots[slot.slot_id] = slot
 
     def check_availability(self, date: str, time: Optional[str] = None) -> list[Slot]:
         """
@@ -111,10 +127,21 @@ class BookingService:
         logger.debug("Found %d available slots for %s", len(available), date)
         return available
 
+    def availability_version(self, date: str) -> int:
+        """
+        Get a version number for a date's availability.
+
+        The version changes whenever a slot on that date is booked, so callers
+        can tell whether a cached availability answer is still current.
+        """
+        return self._versions.get(date, 0)
+
     def book(self, slot_id: str) -> Booking:
         """
         Book a specific slot.
 
+        Safe to call from multiple threads; the check-and-reserve step is atomic.
+
         Args:
             slot_id: The unique identifier of the slot to book
 
@@ -125,30 +152,32 @@ class BookingService:
             SlotNotFoundError: If the slot doesn't exist
             SlotNotAvailableError: If the slot is already booked
         """
-        if slot_id not in self._slots:
-            logger.warning("Attempted to book non-existent slot: %s", slot_id)
-            raise SlotNotFoundError(slot_id)
-
-        slot = self._slots[slot_id]
-        if not slot.is_available:
-            logger.warning("Attempted to book unavailable slot: %s", slot_id)
-            raise SlotNotAvailableError(slot_id)
-
-        # Create booking
-        self._booking_counter += 1
-        booking_id = f"BK{self._booking_counter:04d}"
-
-        booking = Booking(
-            booking_id=booking_id,
-            slot_id=slot_id,
-            court=slot.court,
-            date=slot.date,
-            time=slot.time,
-        )
-
-        # Update slot and store booking
-        slot.is_available = False
-        self._bookings[booking_id] = booking
+        with self._lock:
+            if slot_id not in self._slots:
+                logger.warning("Attempted to book non-existent slot: %s", slot_id)
+                raise SlotNotFoundError(slot_id)
+
+            slot = self._slots[slot_id]
+            if not slot.is_available:
+                logger.warning("Attempted to book unavailable slot: %s", slot_id)
+                raise SlotNotAvailableError(slot_id)
+
+            # Create booking
+            self._booking_counter += 1
+            booking_id = f"BK{self._booking_counter:04d}"
+
+            booking = Booking(
+                booking_id=booking_id,
+                slot_id=slot_id,
+                court=slot.court,
+                date=slot.date,
+                time=slot.time,
+            )
+
+            # Update slot and store booking
+            slot.is_available = False
+            self._bookings[booking_id] = booking
+            self._versions[slot.date] = self._versions.get(slot.date, 0) + 1
 
         logger.info(
             "Booking confirmed: %s for %s on %s at %s",
@@ -165,6 +194,19 @@ class BookingService:
 
 
 # Factory function for dependency injection
-def create_booking_service() -> BookingService:
-    """Create a new BookingService instance."""
+def create_booking_service(db_path: Optional[str] = None) -> BookingService:
+    """
+    Create a new BookingService instance.
+
+    Args:
+        db_path: Optional SQLite file. Services created with the same path,
+            in any process, share one booking state.
+
+    Returns:
+        In-memory BookingService, or SQLiteBookingService if db_path is set
+    """
+    if db_path:
+        from .sqlite_booking_service import SQLiteBookingService
+
+        return SQLiteBookingService(db_path)
     return BookingService()
@@ -0,0 +1,230 @@
+"""
+Conversation history stores, keyed by session ID.
+Lets a follow-up /chat request ("book the second one") reuse the previous
+turns - and their tool results - instead of starting from scratch.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+History = list[dict[str, Any]]
+
+
+def trim_history(history: History, max_turns: int, max_bytes: int) -> History:
+    """
+    Bound a history by user turns and encoded size.
+
+    Only whole turns - a user message and everything after it - are dropped,
+    oldest first, so tool calls always keep their results.
+
+    Args:
+        history: Message dicts, oldest first
+        max_turns: Most user turns to keep
+        max_bytes: Most JSON-encoded bytes to keep
+
+    Returns:
+        The newest whole turns that fit, possibly empty
+    """
+    starts = [i for i, item in enumerate(history) if item.get("role") == "user"]
+    if not starts:
+        return []
+    starts = starts[-max_turns:] if max_turns > 0 else []
+
+    sizes = [len(json.dumps(item).encode()) for item in history]
+    for start in starts:
+        if sum(sizes[start:]) <= max_bytes:
+            return history[start:]
+    return []
+
+
+class ConversationStore(ABC):
+    """
+    Base class for session history stores.
+
+    History is stored as JSON, trimmed on save to ``max_turns`` user turns
+    and ``max_bytes``, and forgotten ``ttl`` seconds after the last save.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 1800.0,
+        max_turns: int = 10,
+        max_bytes: int = 64_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self._clock = clock
+
+    def load(self, session_id: str) -> History:
+        """Get a session's history, or an empty list if unknown or expired."""
+        encoded = self._read(session_id)
+        return json.loads(encoded) if encoded else []
+
+    def save(self, session_id: str, history: History) -> None:
+        """Store a session's history, trimmed to the configured bounds."""
+        trimmed = trim_history(history, self.max_turns, self.max_bytes)
+        if len(trimmed) < len(history):
+            logger.debug(
+                "Trimmed session %s history from %d to %d items",
+                session_id,
+                len(history),
+                len(trimmed),
+            )
+        self._write(session_id, json.dumps(trimmed))
+
+    @abstractmethod
+    def _read(self, session_id: str) -> Optional[str]:
+        """Get a session's encoded history, or None if unknown or expired."""
+
+    @abstractmethod
+    def _write(self, session_id: str, encoded: str) -> None:
+        """Store a session's encoded history, replacing any earlier one."""
+
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    Per-process LRU store.
+
+    Besides the TTL, the least recently used sessions are evicted once there
+    are more than ``max_sessions`` or they hold more than ``max_total_bytes``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_sessions: int = 1000,
+        max_total_bytes: int = 32_000_000,
+        **limits: Any,
+    ) -> None:
+        super().__init__(**limits)
+        self.max_sessions = max_sessions
+        self.max_total_bytes = max_total_bytes
+        self._sessions: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def _read(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            expires_at, encoded = entry
+            if expires_at <= self._clock():
+                self._evict(session_id)
+                return None
+            self._sessions.move_to_end(session_id)
+            return encoded
+
+    def _write(self, session_id: str, encoded: str) -> None:
+        with self._lock:
+            if session_id in self._sessions:
+                self._evict(session_id)
+            self._sessions[session_id] = (self._clock() + self.ttl, encoded)
+            self._total_bytes += len(encoded)
+
+            while self._sessions and (
+                len(self._sessions) > self.max_sessions
+                or self._total_bytes > self.max_total_bytes
+            ):
+                self._evict(next(iter(self._sessions)))
+
+    def _evict(self, session_id: str) -> None:
+        _, encoded = self._sessions.pop(session_id)
+        self._total_bytes -= len(encoded)
+
+
+class SQLiteConversationStore(ConversationStore):
+    """
+    Store backed by a SQLite file, shared by every worker that opens it.
+
+    Expired sessions are deleted on save, along with the least recently
+    saved ones beyond ``max_sessions``.
+    """
+
+    def __init__(self, db_path: str, *, max_sessions: int = 100_000, **limits: Any) -> None:
+        super().__init__(**limits)
+        self.max_sessions = max_sessions
+        self._db_path = db_path
+        self._local = threading.local()
+        self._connect().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS conversations (
+                session_id TEXT PRIMARY KEY,
+                history TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS conversations_by_expiry ON conversations (expires_at);
+            CREATE INDEX IF NOT EXISTS conversations_by_update ON conversations (updated_at);
+            """
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _read(self, session_id: str) -> Optional[str]:
+        row = self._connect().execute(
+            "SELECT history FROM conversations WHERE session_id = ? AND expires_at > ?",
+            (session_id, self._clock()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _write(self, session_id: str, encoded: str) -> None:
+        now = self._clock()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO conversations VALUES (?, ?, ?, ?)",
+                (session_id, encoded, now + self.ttl, now),
+            )
+            conn.execute("DELETE FROM conversations WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM conversations WHERE session_id IN ("
+                " SELECT session_id FROM conversations"
+                " ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_sessions,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def create_conversation_store(
+    backend: str = "memory", db_path: Optional[str] = None, **limits: Any
+) -> ConversationStore:
+    """
+    Create a conversation store.
+
+    Args:
+        backend: "memory" (per process) or "sqlite" (shared by workers)
+        db_path: SQLite file, required for the sqlite backend
+        **limits: ttl, max_turns, max_bytes, max_sessions
+
+    Raises:
+        ValueError: If the sqlite backend has no db_path
+    """
+    if backend == "sqlite":
+        if not db_path:
+            raise ValueError("The sqlite conversation store needs a db_path")
+        return SQLiteConversationStore(db_path, **limits)
+    return InMemoryConversationStore(**limits)
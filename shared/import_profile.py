@@ -0,0 +1,127 @@
+"""
+Import-time profiler for Lambda handlers.
+
+Imports a module in a fresh interpreter with ``python -X importtime`` and
+turns the raw log into a per-package table, so it is easy to see what a
+cold start spends its init phase importing.
+
+Usage (from a pattern directory):
+    python -m shared.import_profile src.lambda_handler
+    python -m shared.import_profile src.manager.lambda_handler --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class ImportProfile:
+    """Import timings for one module, in microseconds."""
+
+    module: str
+    # Self time per imported module
+    self_us: dict[str, int] = field(default_factory=dict)
+    total_us: int = 0
+
+    @property
+    def total_ms(self) -> float:
+        """Total import time of the profiled module, in milliseconds."""
+        return self.total_us / 1000
+
+    @property
+    def modules(self) -> set[str]:
+        """Every module imported along the way."""
+        return set(self.self_us)
+
+    def by_package(self) -> list[tuple[str, int, int]]:
+        """(top-level package, self time, module count), slowest first."""
+        packages: dict[str, list[int]] = {}
+        for name, self_us in self.self_us.items():
+            entry = packages.setdefault(name.split(".")[0], [0, 0])
+            entry[0] += self_us
+            entry[1] += 1
+        return sorted(
+            ((name, us, count) for name, (us, count) in packages.items()),
+            key=lambda row: row[1],
+            reverse=True,
+        )
+
+
+def parse_importtime(log: str, module: str) -> ImportProfile:
+    """
+    Parse ``-X importtime`` output.
+
+    Args:
+        log: The interpreter's stderr
+        module: The module that was imported; its cumulative time is the total
+
+    Returns:
+        Per-module self times and the total
+    """
+    profile = ImportProfile(module)
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        profile.self_us[name] = profile.self_us.get(name, 0) + int(self_us)
+        if name == module:
+            profile.total_us = int(cumulative_us)
+    return profile
+
+
+def profile_import(
+    module: str, cwd: Optional[Path] = None, env: Optional[dict[str, str]] = None
+) -> ImportProfile:
+    """
+    Import a module in a fresh interpreter and profile it.
+
+    Args:
+        module: Dotted module name, e.g. "src.lambda_handler"
+        cwd: Directory to import from (a pattern directory)
+        env: Extra environment variables
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr, module)
+
+
+def format_report(profile: ImportProfile, top: int = 20) -> str:
+    """Render the per-package table."""
+    lines = [
+        f"Import profile: {profile.module} ({profile.total_ms:.0f} ms)",
+        f"{'package':<32} {'ms':>9} {'%':>6} {'modules':>8}",
+    ]
+    for name, self_us, count in profile.by_package()[:top]:
+        share = 100 * self_us / profile.total_us if profile.total_us else 0
+        lines.append(f"{name:<32} {self_us / 1000:>9.1f} {share:>6.1f} {count:>8}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Profile a module and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("module", help="Module to import, e.g. src.lambda_handler")
+    parser.add_argument("--top", type=int, default=20, help="Packages to show")
+    args = parser.parse_args()
+
+    print(format_report(profile_import(args.module, Path.cwd()), args.top))
+
+
+if __name__ == "__main__":
+    main()
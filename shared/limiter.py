@@ -0,0 +1,172 @@
+"""
+Adaptive concurrency limit for LLM calls.
+
+A fixed cap on concurrent requests is either too low (idle capacity) or too
+high (the provider answers with 429s and every request slows down). The
+limit here follows AIMD, as in TCP congestion control:
+
+- each successful call made while at least half the limit is in use
+  raises it by 1/limit, so it grows by about one per busy round of calls
+- a 429, 503 or timeout halves it, once per round: calls already in flight
+  when it was cut don't cut it again
+
+It reacts to throttling rather than to latency, since an LLM call's latency
+mostly tracks how many tokens it generates, not how loaded the provider is.
+
+Calls over the limit wait their turn; shared.admission bounds how many.
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from typing import Optional
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that adapts to provider throttling (AIMD).
+
+    Safe to share between threads and event loops: each waiter is woken on
+    its own loop.
+
+    Args:
+        initial_limit: Concurrent calls allowed to start with
+        min_limit: Lowest the limit is cut to
+        max_limit: Highest the limit grows to
+        backoff_ratio: Factor the limit is multiplied by on throttling
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        backoff_ratio: float = 0.5,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min <= initial <= max")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.decreases = 0
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # Bumped on every decrease; calls started before it can't cut again
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "AdaptiveLimiter":
+        """Create a limiter configured by LLM_*_CONCURRENCY environment variables."""
+        max_limit = int(os.environ.get("LLM_MAX_CONCURRENCY", "16"))
+        return cls(
+            initial_limit=int(os.environ.get("LLM_INITIAL_CONCURRENCY", str(min(8, max_limit)))),
+            min_limit=int(os.environ.get("LLM_MIN_CONCURRENCY", "1")),
+            max_limit=max_limit,
+        )
+
+    @property
+    def limit(self) -> int:
+        """Calls allowed in flight right now."""
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> int:
+        """
+        Wait until a call may start.
+
+        Returns:
+            A ticket to hand back to release()
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self._in_flight < self.limit:
+                self._in_flight += 1
+                return self._generation
+            future = loop.create_future()
+            self._waiters.append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                elif future.done() and not future.cancelled():
+                    # Granted a slot just as we were cancelled: pass it on
+                    self._in_flight -= 1
+                    self._wake()
+            raise
+        return self._generation
+
+    def release(self, ticket: int, *, overloaded: bool = False) -> None:
+        """
+        Finish a call, adjusting the limit by its outcome.
+
+        Args:
+            ticket: What acquire() returned
+            overloaded: The provider throttled or timed out the call
+        """
+        with self._lock:
+            busy = bool(self._waiters) or self._in_flight * 2 >= self.limit
+            self._in_flight -= 1
+            if overloaded:
+                if ticket == self._generation:
+                    self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                    self._generation += 1
+                    self.decreases += 1
+            elif busy:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._wake()
+
+    def snapshot(self) -> dict:
+        """Limiter state as a JSON-serializable dict."""
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "waiting": len(self._waiters),
+            "decreases": self.decreases,
+        }
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters, in order. Call with the lock held."""
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            self._in_flight += 1
+            try:
+                future.get_loop().call_soon_threadsafe(self._grant, future)
+            except RuntimeError:
+                # The waiter's loop has closed
+                self._in_flight -= 1
+
+    def _grant(self, future: asyncio.Future) -> None:
+        """Wake a waiter on its own loop, or free its slot if it gave up."""
+        if not future.done():
+            future.set_result(None)
+            return
+        with self._lock:
+            self._in_flight -= 1
+            self._wake()
+
+
+_default_limiter: Optional[AdaptiveLimiter] = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_llm_limiter() -> AdaptiveLimiter:
+    """Get the process-wide limiter for LLM calls (configured by LLM_*_CONCURRENCY)."""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveLimiter.from_env()
+        return _default_limiter
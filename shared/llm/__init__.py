@@ -0,0 +1,29 @@
+"""
+LLM gateway shared by the OpenAI patterns (A-G).
+
+Kept out of the top-level ``shared`` package so patterns that don't call
+OpenAI (H) don't need the openai SDK installed.
+"""
+
+from .gateway import LLMGateway, LLMMetrics, get_llm_client, get_llm_gateway
+from .structured import (
+    StructuredOutputError,
+    create_structured,
+    json_schema_format,
+    repair_json,
+    strict_json_schema,
+    validate_json,
+)
+
+__all__ = [
+    "LLMGateway",
+    "LLMMetrics",
+    "StructuredOutputError",
+    "create_structured",
+    "get_llm_client",
+    "get_llm_gateway",
+    "json_schema_format",
+    "repair_json",
+    "strict_json_schema",
+    "validate_json",
+]
@@ -0,0 +1,367 @@
+"""
+LLM gateway: one pooled OpenAI client per process, shared by every pattern.
+
+Every OpenAI request - Chat Completions from patterns A-D, Responses API
+calls from the Agents SDK in E-G - goes through the gateway's HTTP transport,
+which:
+
+- limits concurrent requests to the provider, adapting the limit to
+  throttling (shared.limiter)
+- retries 429s, 5xx and connection errors with jittered exponential backoff,
+  honouring Retry-After
+- records latency, retries and token usage
+
+The client is the openai SDK's own, created with max_retries=0 so retries
+happen in one place.
+"""
+
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Optional
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from ..limiter import AdaptiveLimiter, get_llm_limiter
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying, as in the openai SDK
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+# Statuses meaning the provider is over capacity, which lower the concurrency limit
+OVERLOAD_STATUSES = {429, 503}
+
+
+# HTTP packages the openai SDK has been built on, newest first
+HTTP_PACKAGES = ("httpx2", "httpx")
+
+
+@lru_cache
+def _http() -> ModuleType:
+    """The HTTP package the installed openai SDK is built on (httpx2, or httpx before it)."""
+    for name in HTTP_PACKAGES:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        if issubclass(DefaultAsyncHttpxClient, module.AsyncClient):
+            return module
+    raise ImportError(f"openai's HTTP client is not from any of {', '.join(HTTP_PACKAGES)}")
+
+
+@dataclass
+class LLMMetrics:
+    """Counters for requests made through the gateway, updated under its lock."""
+
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    throttled: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    # Seconds per successful request (last attempt only), most recent last
+    latencies: deque = field(default_factory=lambda: deque(maxlen=1000))
+
+    def record_usage(self, usage: dict[str, Any]) -> None:
+        """Add a response's token usage (Chat Completions or Responses API shape)."""
+        self.prompt_tokens += usage.get("prompt_tokens", usage.get("input_tokens", 0)) or 0
+        self.completion_tokens += (
+            usage.get("completion_tokens", usage.get("output_tokens", 0)) or 0
+        )
+        details = usage.get("prompt_tokens_details") or usage.get("input_tokens_details") or {}
+        self.cached_tokens += details.get("cached_tokens", 0) or 0
+
+    def snapshot(self) -> dict:
+        """Metrics as a JSON-serializable dict, with latency percentiles in ms."""
+        latencies = sorted(self.latencies)
+        p50 = p95 = None
+        if latencies:
+            p50 = round(statistics.median(latencies) * 1000, 1)
+            p95 = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            # Share of prompt tokens served from the provider's prompt cache
+            "cached_ratio": (
+                round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None
+            ),
+            "latency_p50_ms": p50,
+            "latency_p95_ms": p95,
+        }
+
+
+@lru_cache
+def _permit_stream_class() -> type:
+    """A response stream that frees its concurrency slot when closed."""
+
+    class PermitStream(_http().AsyncByteStream):
+        def __init__(self, stream: Any, release: Callable[[], None]) -> None:
+            self._stream = stream
+            self._release = release
+
+        async def __aiter__(self):
+            async for chunk in self._stream:
+                yield chunk
+
+        async def aclose(self) -> None:
+            try:
+                await self._stream.aclose()
+            finally:
+                self._release()
+
+    return PermitStream
+
+
+class _GatewayTransport:
+    """Sends the client's requests through the gateway."""
+
+    def __init__(self, gateway: "LLMGateway", transport: Any) -> None:
+        self._gateway = gateway
+        self._transport = transport
+
+    async def handle_async_request(self, request: Any) -> Any:
+        return await self._gateway._send(request, self._transport)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class LLMGateway:
+    """
+    Owner of the process's OpenAI client.
+
+    Args:
+        limiter: Concurrency limit for requests in flight; more wait their turn
+        max_retries: Retries after the first attempt
+        timeout: Seconds per attempt
+        max_connections: Pooled connections to the provider
+        backoff_base: First retry waits up to this many seconds, doubling after
+        backoff_max: Longest wait between attempts
+        transport: HTTP transport to send requests with (e.g. a mock in tests)
+    """
+
+    def __init__(
+        self,
+        *,
+        limiter: Optional[AdaptiveLimiter] = None,
+        max_retries: int = 3,
+        timeout: float = 60.0,
+        max_connections: int = 32,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        transport: Any = None,
+    ) -> None:
+        self.limiter = limiter or AdaptiveLimiter()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = LLMMetrics()
+        self._transport = transport
+        # Guards the client and the metrics, which may be shared across threads
+        self._lock = threading.Lock()
+        self._client: Optional[AsyncOpenAI] = None
+        self._client_key: Optional[tuple] = None
+        # Closes of replaced clients in progress, kept so they aren't garbage collected
+        self._closing: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        """Create a gateway configured by LLM_* environment variables."""
+        env = os.environ
+        return cls(
+            limiter=get_llm_limiter(),
+            max_retries=int(env.get("LLM_MAX_RETRIES", "3")),
+            timeout=float(env.get("LLM_TIMEOUT", "60")),
+            max_connections=int(env.get("LLM_MAX_CONNECTIONS", "32")),
+            backoff_base=float(env.get("LLM_BACKOFF_BASE", "0.5")),
+            backoff_max=float(env.get("LLM_BACKOFF_MAX", "8")),
+        )
+
+    def client(self, api_key: str) -> AsyncOpenAI:
+        """
+        Get the shared client.
+
+        Pooled connections belong to the event loop that opened them, so a
+        new client is created if the loop has changed (e.g. between test runs),
+        as well as when the API key changes (e.g. after a secret rotation).
+        The client it replaces is closed on its own loop.
+        """
+        try:
+            loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        replaced = None
+        with self._lock:
+            if self._client is None or self._client_key != (loop, api_key):
+                if self._client is not None:
+                    replaced = (self._client, self._client_key[0])
+                http = _http()
+                transport = self._transport or http.AsyncHTTPTransport(
+                    limits=http.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    )
+                )
+                http_client = DefaultAsyncHttpxClient(
+                    transport=_GatewayTransport(self, transport),
+                    timeout=self.timeout,
+                )
+                self._client = AsyncOpenAI(
+                    api_key=api_key, http_client=http_client, max_retries=0, timeout=self.timeout
+                )
+                self._client_key = (loop, api_key)
+            client = self._client
+
+        if replaced is not None:
+            self._close(*replaced)
+        return client
+
+    def _close(self, client: AsyncOpenAI, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close a replaced client's pooled connections, on the loop that opened them."""
+        if loop is None or loop.is_closed():
+            # No loop to close them on; a closed loop's connections went with it
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            task = loop.create_task(client.close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+
+    def metrics_snapshot(self) -> dict:
+        """Snapshot of the metrics, consistent while requests are being recorded."""
+        with self._lock:
+            return self.metrics.snapshot()
+
+    def _backoff(self, attempt: int, response: Any = None) -> float:
+        """Seconds to wait before retry ``attempt`` (0-based): Retry-After, else full jitter."""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            try:
+                if retry_after is not None:
+                    return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def _send(self, request: Any, transport: Any) -> Any:
+        """Send a request within the concurrency limit, retrying transient failures."""
+        http = _http()
+        with self._lock:
+            self.metrics.requests += 1
+
+        for attempt in range(self.max_retries + 1):
+            ticket = await self.limiter.acquire()
+            released = False
+
+            def release(overloaded: bool = False) -> None:
+                nonlocal released
+                if not released:
+                    released = True
+                    self.limiter.release(ticket, overloaded=overloaded)
+
+            start = time.monotonic()
+            try:
+                response = await transport.handle_async_request(request)
+            except http.TransportError as e:
+                release(overloaded=isinstance(e, http.TimeoutException))
+                if attempt == self.max_retries:
+                    with self._lock:
+                        self.metrics.errors += 1
+                    raise
+                logger.warning("LLM request failed (%s), retrying", type(e).__name__)
+                with self._lock:
+                    self.metrics.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            except BaseException:
+                release()
+                raise
+
+            status = response.status_code
+            if status == 429:
+                with self._lock:
+                    self.metrics.throttled += 1
+            if status in RETRY_STATUSES and attempt < self.max_retries:
+                # The slot is freed while backing off, for other requests to use
+                release(overloaded=status in OVERLOAD_STATUSES)
+                await response.aclose()
+                delay = self._backoff(attempt, response)
+                logger.warning("LLM request got %d, retrying in %.2fs", status, delay)
+                with self._lock:
+                    self.metrics.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            break
+
+        streamed = False
+        try:
+            if status >= 400:
+                with self._lock:
+                    self.metrics.errors += 1
+                release(overloaded=status in OVERLOAD_STATUSES)
+            elif response.headers.get("content-type", "").startswith("application/json"):
+                # Read the whole body now to record usage; the client reuses it
+                await response.aread()
+                latency = time.monotonic() - start
+                try:
+                    usage = json.loads(response.content).get("usage") or {}
+                except (ValueError, AttributeError):
+                    usage = {}
+                with self._lock:
+                    self.metrics.latencies.append(latency)
+                    self.metrics.record_usage(usage)
+            else:
+                with self._lock:
+                    self.metrics.latencies.append(time.monotonic() - start)
+                if not response.is_closed:
+                    # Streamed: the slot is held until the stream is closed
+                    response.stream = _permit_stream_class()(response.stream, release)
+                    streamed = True
+        finally:
+            if not streamed:
+                release()
+        return response
+
+
+_default_gateway: Optional[LLMGateway] = None
+_default_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Get the process-wide gateway (configured by LLM_* environment variables)."""
+    global _default_gateway
+    with _default_gateway_lock:
+        if _default_gateway is None:
+            _default_gateway = LLMGateway.from_env()
+        return _default_gateway
+
+
+def get_llm_client(api_key: str) -> AsyncOpenAI:
+    """Get the process-wide pooled OpenAI client."""
+    return get_llm_gateway().client(api_key)
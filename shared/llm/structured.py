@@ -0,0 +1,141 @@
+"""
+Structured outputs: ask for JSON matching a pydantic model, and validate it.
+
+The reply format is a strict JSON schema generated from the model, so the
+provider constrains decoding to it. Replies are validated with
+model_validate_json in one pass; if that fails, a local repair (code
+fences, surrounding prose, trailing commas) is tried before the request is
+repeated.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+# Keywords whose values map names (of properties, or definitions) to subschemas
+_SCHEMA_MAPS = {"properties", "patternProperties", "$defs", "definitions"}
+
+
+class StructuredOutputError(ValueError):
+    """The model's reply could not be turned into the requested type."""
+
+
+def strict_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    """
+    JSON schema for a model, in the form strict structured outputs require.
+
+    Every object lists all its properties as required (optional fields stay
+    nullable) and allows no others, and defaults are dropped. A property
+    that happens to be named ``default`` is kept.
+    """
+
+    def strict_map(schemas: dict[str, Any]) -> dict[str, Any]:
+        return {name: strict(schema) for name, schema in schemas.items()}
+
+    def strict(node: Any) -> Any:
+        if isinstance(node, dict):
+            node = {
+                key: strict_map(value)
+                if key in _SCHEMA_MAPS and isinstance(value, dict)
+                else strict(value)
+                for key, value in node.items()
+                if key != "default"
+            }
+            if node.get("type") == "object" and "properties" in node:
+                node["required"] = list(node["properties"])
+                node["additionalProperties"] = False
+            return node
+        if isinstance(node, list):
+            return [strict(item) for item in node]
+        return node
+
+    return strict(model.model_json_schema())
+
+
+@lru_cache
+def json_schema_format(model: type[BaseModel]) -> dict[str, Any]:
+    """The Chat Completions ``response_format`` for replies matching ``model``."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "schema": strict_json_schema(model),
+            "strict": True,
+        },
+    }
+
+
+def repair_json(content: str) -> str:
+    """
+    Fix common near-misses in a JSON reply.
+
+    Strips code fences and any prose around the outermost object, and
+    removes trailing commas.
+    """
+    text = _FENCE.sub("", content.strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start : end + 1]
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def validate_json(model: type[ModelT], content: str) -> ModelT:
+    """
+    Validate a JSON reply against a model, repairing it locally if needed.
+
+    Raises:
+        ValidationError: If the reply is invalid even after repair
+    """
+    try:
+        return model.model_validate_json(content)
+    except ValidationError:
+        repaired = repair_json(content)
+        if repaired == content:
+            raise
+        return model.model_validate_json(repaired)
+
+
+async def create_structured(
+    client: Any, response_model: type[ModelT], *, retries: int = 1, **kwargs: Any
+) -> ModelT:
+    """
+    Request a chat completion whose reply is an instance of ``response_model``.
+
+    Args:
+        client: AsyncOpenAI-compatible client
+        response_model: Pydantic model the reply must match
+        retries: Times to repeat the request if the reply is still invalid after repair
+        **kwargs: Passed to ``chat.completions.create`` (model, messages, ...)
+
+    Raises:
+        StructuredOutputError: If the model refuses, or no reply is valid
+    """
+    attempt = 0
+    while True:
+        response = await client.chat.completions.create(
+            response_format=json_schema_format(response_model), **kwargs
+        )
+        message = response.choices[0].message
+        refusal = getattr(message, "refusal", None)
+        if isinstance(refusal, str) and refusal:
+            raise StructuredOutputError(f"Model refused: {refusal}")
+        if not message.content:
+            raise StructuredOutputError("AI returned empty response")
+
+        try:
+            return validate_json(response_model, message.content)
+        except ValidationError as e:
+            if attempt == retries:
+                raise StructuredOutputError(f"Invalid reply from AI: {e}") from e
+            attempt += 1
+            logger.warning("Invalid structured reply (%d errors), retrying", e.error_count())
@@ -0,0 +1,238 @@
+"""
+Local stand-in for the OpenAI API, for benchmarks.
+
+Serves canned replies for Chat Completions and the Responses API (used by
+the Agents SDK), so a handler can be driven end to end without a network or
+API key. A Chat Completions request offering a check_availability tool is
+answered with a call to it first, so tool loops and their history run too. Usage reports cached prompt tokens the way OpenAI's prompt caching
+does - for the longest prefix shared with an earlier request, once at least
+1024 tokens, in 128-token steps - so prompt layout changes can be measured
+offline. Point a pattern at it with ``OPENAI_BASE_URL``:
+
+    with MockLLMServer() as llm:
+        env = {"OPENAI_BASE_URL": llm.base_url, "OPENAI_API_KEY": "mock"}
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+MOCK_REPLY = "Court A is available at 14:00 tomorrow."
+
+# Prompt caching rules: minimum cacheable prefix and cache granularity, in tokens
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+
+
+def _intent_json(response_format: dict[str, Any]) -> str:
+    """
+    A parsed booking intent, as the A/B/C parsers ask for.
+
+    With a json_schema response format, only the schema's properties are
+    returned, as strict structured outputs would.
+    """
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    intent = {"date": tomorrow, "time": "14:00", "slot_preference": 1}
+    schema = (response_format.get("json_schema") or {}).get("schema")
+    if schema:
+        intent = {key: intent.get(key) for key in schema.get("properties", {})}
+    return json.dumps(intent)
+
+
+def _tokens(text: str) -> int:
+    """Rough token count: about four characters per token."""
+    return len(text) // 4
+
+
+def prompt_text(request: dict[str, Any]) -> str:
+    """The prompt as the provider sees it, in order: tools, reply format, instructions, messages."""
+    return json.dumps(
+        [
+            request.get("tools"),
+            request.get("response_format"),
+            request.get("instructions"),
+            request.get("messages", request.get("input", "")),
+        ]
+    )
+
+
+def cached_tokens(prompt: str, earlier: list[str]) -> int:
+    """Tokens of ``prompt`` a prompt cache holding ``earlier`` prompts would serve."""
+    shared = max((len(os.path.commonprefix([prompt, e])) for e in earlier), default=0)
+    tokens = _tokens(prompt[:shared])
+    if tokens < CACHE_MIN_TOKENS:
+        return 0
+    return tokens - (tokens - CACHE_MIN_TOKENS) % CACHE_STEP_TOKENS
+
+
+def _tool_call(request: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """A check_availability call, if the tool is offered and the user spoke last."""
+    names = {tool.get("function", {}).get("name") for tool in request.get("tools") or []}
+    messages = request.get("messages") or []
+    if "check_availability" not in names or not messages or messages[-1].get("role") != "user":
+        return None
+    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    return {
+        # Unique within the conversation, as the history is keyed by it
+        "id": f"call_mock_{len(messages)}",
+        "type": "function",
+        "function": {"name": "check_availability", "arguments": json.dumps({"date": tomorrow})},
+    }
+
+
+def chat_completion(request: dict[str, Any], cached: int = 0) -> dict[str, Any]:
+    """Build a Chat Completions response for a request."""
+    response_format = request.get("response_format") or {}
+    wants_json = response_format.get("type") in ("json_object", "json_schema")
+    content = _intent_json(response_format) if wants_json else MOCK_REPLY
+    tool_call = None if wants_json else _tool_call(request)
+    message: dict[str, Any] = {"role": "assistant", "content": content}
+    if tool_call is not None:
+        message = {"role": "assistant", "content": None, "tool_calls": [tool_call]}
+        content = json.dumps(tool_call)
+    prompt_tokens = _tokens(prompt_text(request))
+    completion_tokens = len(content) // 4
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "mock"),
+        "choices": [
+            {
+                "index": 0,
+                "message": message,
+                "finish_reason": "stop" if tool_call is None else "tool_calls",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached},
+        },
+    }
+
+
+def response(request: dict[str, Any], cached: int = 0) -> dict[str, Any]:
+    """Build a Responses API response for a request."""
+    input_tokens = _tokens(prompt_text(request))
+    output_tokens = len(MOCK_REPLY) // 4
+    return {
+        "id": "resp_mock",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": request.get("model") or "mock",
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_mock",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": MOCK_REPLY, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": cached},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        request = json.loads(body or b"{}")
+        if self.path.endswith("/chat/completions"):
+            build = chat_completion
+        elif self.path.endswith("/responses"):
+            build = response
+        else:
+            self.send_error(404)
+            return
+        payload = build(request, cached=self.server.cache(prompt_text(request)))
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.requests += 1
+
+        encoded = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    latency = 0.0
+    requests = 0
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self._prompts: deque[str] = deque(maxlen=256)
+        self._prompts_lock = threading.Lock()
+
+    def cache(self, prompt: str) -> int:
+        """Cached tokens for a prompt, remembering it for later requests."""
+        with self._prompts_lock:
+            cached = cached_tokens(prompt, list(self._prompts))
+            self._prompts.append(prompt)
+        return cached
+
+
+class MockLLMServer:
+    """
+    OpenAI-compatible mock server on a free local port, run in a thread.
+
+    Args:
+        latency: Seconds to wait before each reply, to stand in for model time
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.latency = latency
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to use as OPENAI_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def requests(self) -> int:
+        """Completions served so far."""
+        return self._server.requests
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
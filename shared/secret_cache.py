@@ -0,0 +1,173 @@
+"""
+Cached AWS Secrets Manager lookups.
+Used by every pattern's Settings.get_openai_api_key, so a secret is fetched
+once per TTL instead of once per call, through a single boto3 client.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedSecret:
+    value: str
+    fetched_at: float
+    refreshing: bool = False
+
+
+class SecretCache:
+    """
+    TTL cache for Secrets Manager secret strings.
+
+    - A secret is fetched on first use and kept for ``ttl`` seconds.
+    - Once ``refresh_after`` seconds have passed, the next lookup still
+      returns the cached value but starts a background refresh, so rotated
+      secrets are picked up without a request waiting on the network.
+    - If a background refresh fails, the cached value is kept until it
+      expires.
+    - Once expired, one caller fetches the secret again. Concurrent callers
+      keep using the expired value meanwhile, or, if there is none yet, wait
+      for that fetch instead of making their own.
+
+    Async code should use aget(), which fetches in a worker thread rather
+    than blocking the event loop on boto3.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        refresh_after: Optional[float] = None,
+        *,
+        client: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.refresh_after = ttl * 0.8 if refresh_after is None else refresh_after
+        self._client = client
+        self._clock = clock
+        self._secrets: dict[str, _CachedSecret] = {}
+        self._lock = threading.Lock()
+        # One per secret, held while it is fetched
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self.fetches = 0
+
+    def _get_client(self) -> Any:
+        """Get the Secrets Manager client, creating it once."""
+        with self._lock:
+            if self._client is None:
+                import boto3
+
+                self._client = boto3.client("secretsmanager")
+            return self._client
+
+    def _fetch(self, secret_id: str) -> str:
+        """Fetch a secret string from Secrets Manager and cache it."""
+        response = self._get_client().get_secret_value(SecretId=secret_id)
+        value = response["SecretString"]
+        with self._lock:
+            self._secrets[secret_id] = _CachedSecret(value, self._clock())
+            self.fetches += 1
+        return value
+
+    def _fetch_lock(self, secret_id: str) -> threading.Lock:
+        """Get the lock held while fetching a secret."""
+        with self._lock:
+            return self._fetch_locks.setdefault(secret_id, threading.Lock())
+
+    def _refresh(self, secret_id: str) -> None:
+        """Background refresh; on failure the cached value stays in use."""
+        try:
+            with self._fetch_lock(secret_id):
+                self._fetch(secret_id)
+            logger.debug("Refreshed secret %s", secret_id)
+        except Exception:
+            logger.warning("Background refresh of secret %s failed", secret_id, exc_info=True)
+            with self._lock:
+                cached = self._secrets.get(secret_id)
+                if cached is not None:
+                    cached.refreshing = False
+
+    def _lookup(self, secret_id: str) -> Optional[str]:
+        """Get a cached, unexpired secret without blocking, starting a refresh if it is due."""
+        now = self._clock()
+        with self._lock:
+            cached = self._secrets.get(secret_id)
+            if cached is None or now - cached.fetched_at >= self.ttl:
+                return None
+            if now - cached.fetched_at >= self.refresh_after and not cached.refreshing:
+                cached.refreshing = True
+                threading.Thread(target=self._refresh, args=(secret_id,), daemon=True).start()
+            return cached.value
+
+    def get(self, secret_id: str) -> str:
+        """
+        Get a secret string, from the cache when possible.
+
+        Args:
+            secret_id: Secret name or ARN
+
+        Returns:
+            The secret's SecretString
+
+        Raises:
+            botocore.exceptions.ClientError: If the secret has to be fetched and can't be
+        """
+        value = self._lookup(secret_id)
+        if value is not None:
+            return value
+
+        with self._lock:
+            expired = self._secrets.get(secret_id)
+        fetch_lock = self._fetch_lock(secret_id)
+        if not fetch_lock.acquire(blocking=expired is None):
+            # Another caller is fetching it; the expired value will do until then
+            return expired.value
+        try:
+            # It may have been fetched while we waited for the lock
+            value = self._lookup(secret_id)
+            return value if value is not None else self._fetch(secret_id)
+        finally:
+            fetch_lock.release()
+
+    async def aget(self, secret_id: str) -> str:
+        """Like get(), but any fetch from Secrets Manager runs in a worker thread."""
+        value = self._lookup(secret_id)
+        if value is not None:
+            return value
+        return await asyncio.to_thread(self.get, secret_id)
+
+    def clear(self) -> None:
+        """Forget all cached secrets."""
+        with self._lock:
+            self._secrets.clear()
+
+
+_default_cache: Optional[SecretCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_secret_cache() -> SecretCache:
+    """Get the process-wide secret cache (TTL from SECRET_CACHE_TTL, default 300s)."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SecretCache(ttl=float(os.environ.get("SECRET_CACHE_TTL", "300")))
+        return _default_cache
+
+
+def get_secret(secret_id: str) -> str:
+    """Get a secret string through the process-wide cache."""
+    return get_secret_cache().get(secret_id)
+
+
+async def get_secret_async(secret_id: str) -> str:
+    """Get a secret string through the process-wide cache, without blocking the event loop."""
+    return await get_secret_cache().aget(secret_id)
@@ -0,0 +1,186 @@
+"""
+SQLite-backed booking service.
+Lets several processes on one host share booking state through a single file.
+"""
+
+import logging
+import sqlite3
+import threading
+from typing import Optional
+
+from .booking_service import (
+    Booking,
+    BookingService,
+    Slot,
+    SlotNotAvailableError,
+    SlotNotFoundError,
+    generate_mock_slots,
+)
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS slots (
+    slot_id TEXT PRIMARY KEY,
+    court TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    is_available INTEGER NOT NULL
+);
+-- Covers check_availability: lookup by date, filtered and ordered in the index
+CREATE INDEX IF NOT EXISTS slots_by_date
+    ON slots (date, is_available, time, court, slot_id, duration_minutes);
+CREATE TABLE IF NOT EXISTS bookings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    booking_id TEXT UNIQUE,
+    slot_id TEXT NOT NULL,
+    court TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bookings_by_date ON bookings (date, id);
+"""
+
+
+class SQLiteBookingService(BookingService):
+    """
+    Booking service that keeps slots and bookings in a SQLite file.
+
+    Uses WAL mode so availability reads never wait on a booking write, and a
+    conditional UPDATE so a slot can only be booked once across processes.
+    """
+
+    def __init__(self, db_path: str, *, timeout: float = 5.0) -> None:
+        self._db_path = db_path
+        self._timeout = timeout
+        self._local = threading.local()
+        self._initialize_mock_data()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn: Optional[sqlite3.Connection] = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=self._timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _initialize_mock_data(self) -> None:
+        """Create the schema and add any missing mock slots."""
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO slots VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (s.slot_id, s.court, s.date, s.time, s.duration_minutes, int(s.is_available))
+                    for s in generate_mock_slots()
+                ],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def check_availability(self, date: str, time: Optional[str] = None) -> list[Slot]:
+        """
+        Check available slots for a given date and optional time.
+
+        Args:
+            date: Date in YYYY-MM-DD format
+            time: Optional time in HH:MM format to filter specific slots
+
+        Returns:
+            List of available Slot objects, sorted by time then court
+        """
+        query = (
+            "SELECT slot_id, court, date, time, duration_minutes FROM slots"
+            " WHERE date = ? AND is_available = 1"
+        )
+        params: tuple[str, ...] = (date,)
+        if time is not None:
+            query += " AND time = ?"
+            params += (time,)
+        query += " ORDER BY time, court"
+
+        available = [
+            Slot(slot_id=row[0], court=row[1], date=row[2], time=row[3], duration_minutes=row[4])
+            for row in self._connect().execute(query, params)
+        ]
+        logger.debug("Found %d available slots for %s", len(available), date)
+        return available
+
+    def availability_version(self, date: str) -> int:
+        """
+        Get a version number for a date's availability.
+
+        The latest booking row for the date; it changes with every booking on
+        that date.
+        """
+        row = self._connect().execute(
+            "SELECT COALESCE(MAX(id), 0) FROM bookings WHERE date = ?", (date,)
+        ).fetchone()
+        return row[0]
+
+    def book(self, slot_id: str) -> Booking:
+        """
+        Book a specific slot.
+
+        Safe to call from multiple threads and processes; the slot is reserved
+        with a single conditional UPDATE.
+
+        Args:
+            slot_id: The unique identifier of the slot to book
+
+        Returns:
+            Booking confirmation
+
+        Raises:
+            SlotNotFoundError: If the slot doesn't exist
+            SlotNotAvailableError: If the slot is already booked
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            reserved = conn.execute(
+                "UPDATE slots SET is_available = 0 WHERE slot_id = ? AND is_available = 1",
+                (slot_id,),
+            ).rowcount
+            row = conn.execute(
+                "SELECT court, date, time FROM slots WHERE slot_id = ?", (slot_id,)
+            ).fetchone()
+            if row is None:
+                logger.warning("Attempted to book non-existent slot: %s", slot_id)
+                raise SlotNotFoundError(slot_id)
+            if not reserved:
+                logger.warning("Attempted to book unavailable slot: %s", slot_id)
+                raise SlotNotAvailableError(slot_id)
+
+            court, date, time = row
+            row_id = conn.execute(
+                "INSERT INTO bookings (slot_id, court, date, time, status)"
+                " VALUES (?, ?, ?, ?, 'confirmed')",
+                (slot_id, court, date, time),
+            ).lastrowid
+            booking_id = f"BK{row_id:04d}"
+            conn.execute("UPDATE bookings SET booking_id = ? WHERE id = ?", (booking_id, row_id))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        logger.info("Booking confirmed: %s for %s on %s at %s", booking_id, court, date, time)
+        return Booking(booking_id=booking_id, slot_id=slot_id, court=court, date=date, time=time)
+
+    def get_booking(self, booking_id: str) -> Optional[Booking]:
+        """Retrieve booking details by ID."""
+        row = self._connect().execute(
+            "SELECT booking_id, slot_id, court, date, time, status FROM bookings"
+            " WHERE booking_id = ?",
+            (booking_id,),
+        ).fetchone()
+        return Booking(*row) if row else None
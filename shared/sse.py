@@ -0,0 +1,51 @@
+"""
+Server-sent events helpers for streaming chat responses.
+Used by the patterns that expose a /chat/stream endpoint.
+"""
+
+import json
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sent for unexpected errors, as /chat does: exception text can carry provider
+# errors, URLs or configuration details
+INTERNAL_ERROR = "Internal error"
+
+
+def format_sse(data: dict[str, Any], event: Optional[str] = None) -> str:
+    """Format one server-sent event with a JSON payload."""
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+async def sse_stream(
+    deltas: AsyncIterable[str],
+    error_details: Optional[Mapping[type[Exception], str]] = None,
+) -> AsyncIterator[str]:
+    """
+    Wrap a stream of text deltas as server-sent events.
+
+    Emits one unnamed event per delta (``{"delta": "..."}``), then a ``done``
+    event carrying the full response. Errors raised after the response has
+    started are logged and reported as an ``error`` event, since the HTTP
+    status has already been sent. Its detail is the message ``error_details``
+    gives for the exception's type, or INTERNAL_ERROR.
+    """
+    parts: list[str] = []
+    try:
+        async for delta in deltas:
+            parts.append(delta)
+            yield format_sse({"delta": delta})
+    except Exception as e:
+        logger.exception("Streaming response failed")
+        detail = next(
+            (message for error, message in (error_details or {}).items() if isinstance(e, error)),
+            INTERNAL_ERROR,
+        )
+        yield format_sse({"detail": detail}, event="error")
+        return
+
+    yield format_sse({"response": "".join(parts)}, event="done")
@@ -96,6 +96,21 @@ resource "aws_iam_role_policy_attachment" "lambda_basic" {
   policy_arn = "arn:aws:iam::aws:policy/service-role/AWSLambdaBasicExecutionRole"
 }
 
+# ========================================
+# Dependency Layer
+# ========================================
+
+# Published only when package_lambda.py --layer wrote dist/layer.zip;
+# otherwise the dependencies are inside lambda.zip
+resource "aws_lambda_layer_version" "deps" {
+  count = fileexists("${path.module}/../../pattern-c-workflow-multi-process/dist/layer.zip") ? 1 : 0
+
+  layer_name          = "ai-patterns-pattern-c-deps"
+  filename            = "${path.module}/../../pattern-c-workflow-multi-process/dist/layer.zip"
+  source_code_hash    = filebase64sha256("${path.module}/../../pattern-c-workflow-multi-process/dist/layer.zip")
+  compatible_runtimes = ["python3.12"]
+}
+
 # ========================================
 # Lambda Function
 # ========================================
@@ -123,6 +138,7 @@ resource "aws_lambda_function" "api" {
   runtime     = "python3.12"
   timeout     = var.lambda_timeout
   memory_size = var.lambda_memory
+  layers      = aws_lambda_layer_version.deps[*].arn
 
   environment {
     variables = {
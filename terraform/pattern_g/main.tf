@@ -138,6 +138,21 @@ resource "aws_cloudwatch_log_group" "booking_logs" {
   }
 }
 
+# ========================================
+# Dependency Layer
+# ========================================
+
+# Published only when package_lambda.py --layer wrote dist/layer.zip;
+# otherwise the dependencies are inside lambda.zip
+resource "aws_lambda_layer_version" "deps" {
+  count = fileexists("${path.module}/../../pattern-g-multi-agent-multi-process/dist/layer.zip") ? 1 : 0
+
+  layer_name          = "ai-patterns-pattern-g-deps"
+  filename            = "${path.module}/../../pattern-g-multi-agent-multi-process/dist/layer.zip"
+  source_code_hash    = filebase64sha256("${path.module}/../../pattern-g-multi-agent-multi-process/dist/layer.zip")
+  compatible_runtimes = ["python3.12"]
+}
+
 # ========================================
 # Lambda Functions - Specialists (deployed first)
 # ========================================
@@ -155,6 +170,7 @@ resource "aws_lambda_function" "availability" {
   runtime     = "python3.12"
   timeout     = var.lambda_timeout
   memory_size = var.lambda_memory
+  layers      = aws_lambda_layer_version.deps[*].arn
 
   environment {
     variables = {
@@ -188,6 +204,7 @@ resource "aws_lambda_function" "booking" {
   runtime     = "python3.12"
   timeout     = var.lambda_timeout
   memory_size = var.lambda_memory
+  layers      = aws_lambda_layer_version.deps[*].arn
 
   environment {
     variables = {
@@ -253,6 +270,7 @@ resource "aws_lambda_function" "manager" {
   runtime     = "python3.12"
   timeout     = var.lambda_timeout
   memory_size = var.lambda_memory
+  layers      = aws_lambda_layer_version.deps[*].arn
 
   environment {
     variables = {
@@ -160,6 +160,21 @@ resource "aws_cloudwatch_log_group" "invoker_logs" {
   }
 }
 
+# ========================================
+# Dependency Layer
+# ========================================
+
+# Published only when package_lambda.py --layer wrote dist/layer.zip;
+# otherwise the dependencies are inside lambda.zip
+resource "aws_lambda_layer_version" "deps" {
+  count = fileexists("${path.module}/../../pattern-h-bedrock-agent/dist/layer.zip") ? 1 : 0
+
+  layer_name          = "ai-patterns-pattern-h-deps"
+  filename            = "${path.module}/../../pattern-h-bedrock-agent/dist/layer.zip"
+  source_code_hash    = filebase64sha256("${path.module}/../../pattern-h-bedrock-agent/dist/layer.zip")
+  compatible_runtimes = ["python3.12"]
+}
+
 # ========================================
 # Lambda Functions
 # ========================================
@@ -177,6 +192,7 @@ resource "aws_lambda_function" "action" {
   runtime     = "python3.12"
   timeout     = var.lambda_timeout
   memory_size = var.lambda_memory
+  layers      = aws_lambda_layer_version.deps[*].arn
 
   tags = {
     Project = "ai-patterns"
@@ -211,6 +227,7 @@ resource "aws_lambda_function" "invoker" {
   runtime     = "python3.12"
   timeout     = var.lambda_timeout
   memory_size = var.lambda_memory
+  layers      = aws_lambda_layer_version.deps[*].arn
 
   environment {
     variables = {
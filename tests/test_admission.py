@@ -0,0 +1,46 @@
+"""Tests for the admission control middleware."""
+
+import asyncio
+
+from shared import AdaptiveLimiter, AdmissionMiddleware
+
+
+class TestAdmissionMiddleware:
+    """Tests for shedding /chat load with a fast 503."""
+
+    async def request(self, app, path):
+        """Send a GET through an ASGI app, returning the status and headers."""
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await app({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+        return sent[0]["status"], dict(sent[0]["headers"])
+
+    async def test_rejects_requests_beyond_limit_and_queue(self):
+        """Verify requests over limit + queue get 503 at once, and /health passes."""
+        release = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        app = AdmissionMiddleware(slow_app, max_queue=1, limiter=limiter)
+        admitted = [asyncio.create_task(self.request(app, "/chat")) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        status, headers = await asyncio.wait_for(self.request(app, "/chat"), 1)
+        assert status == 503
+        assert headers[b"retry-after"] == b"1"
+        assert app.rejected == 1
+
+        health = asyncio.create_task(self.request(app, "/health"))
+        release.set()
+        assert [(await task)[0] for task in (*admitted, health)] == [200, 200, 200]
+        assert app.in_flight == 0
@@ -0,0 +1,62 @@
+"""Tests for the shared conversation history stores."""
+
+import pytest
+
+from shared import (
+    ConversationStore,
+    InMemoryConversationStore,
+    SQLiteConversationStore,
+    trim_history,
+)
+
+
+class TestConversationStore:
+    """Tests for the session history stores."""
+
+    def turn(self, text):
+        """One user turn with a tool call and reply."""
+        return [
+            {"role": "user", "content": text},
+            {"role": "assistant", "tool_calls": [{"id": text}]},
+            {"role": "tool", "tool_call_id": text, "content": "x" * 100},
+            {"role": "assistant", "content": "ok"},
+        ]
+
+    def test_trim_keeps_whole_recent_turns(self):
+        """Verify trimming drops the oldest whole turns, by count and by size."""
+        history = self.turn("a") + self.turn("b") + self.turn("c")
+
+        assert trim_history(history, 2, 10_000) == self.turn("b") + self.turn("c")
+        assert trim_history(history, 10, 300) == self.turn("c")
+        assert trim_history(history, 10, 10) == []
+
+    def test_memory_store_expires_and_evicts(self):
+        """Verify sessions expire after the TTL and the least recently used go first."""
+        now = [0.0]
+        store = InMemoryConversationStore(max_sessions=2, ttl=60, clock=lambda: now[0])
+        for session_id in ("a", "b"):
+            store.save(session_id, self.turn(session_id))
+        store.load("a")
+        store.save("c", self.turn("c"))
+
+        assert store.load("b") == []
+        assert store.load("a") == self.turn("a")
+        now[0] = 61
+        assert store.load("a") == []
+
+    def test_incomplete_store_fails_at_construction(self):
+        """Verify a store missing _read/_write can't be created, rather than failing on use."""
+
+        class WriteOnlyStore(ConversationStore):
+            def _write(self, session_id, encoded):
+                pass
+
+        with pytest.raises(TypeError):
+            WriteOnlyStore()
+
+    def test_sqlite_store_is_shared(self, tmp_path):
+        """Verify two stores on one SQLite file see the same sessions."""
+        db_path = str(tmp_path / "sessions.sqlite3")
+        SQLiteConversationStore(db_path).save("s1", self.turn("a"))
+
+        assert SQLiteConversationStore(db_path).load("s1") == self.turn("a")
@@ -0,0 +1,46 @@
+"""Tests for the adaptive concurrency limit on LLM calls."""
+
+import asyncio
+
+from shared import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter:
+    """Tests for the AIMD concurrency limit in front of LLM calls."""
+
+    async def test_throttling_halves_limit_once_per_round(self):
+        """Verify 429s from one round of calls cut the limit once, not once each."""
+        limiter = AdaptiveLimiter(initial_limit=8, max_limit=16)
+        tickets = [await limiter.acquire() for _ in range(4)]
+
+        for ticket in tickets:
+            limiter.release(ticket, overloaded=True)
+
+        assert limiter.limit == 4
+        assert limiter.decreases == 1
+
+    async def test_limit_grows_while_busy(self):
+        """Verify successful calls raise the limit only when it is in use."""
+        limiter = AdaptiveLimiter(initial_limit=4, max_limit=8)
+
+        limiter.release(await limiter.acquire())
+        assert limiter.limit == 4
+
+        for _ in range(10):
+            tickets = [await limiter.acquire() for _ in range(limiter.limit)]
+            for ticket in tickets:
+                limiter.release(ticket)
+        assert limiter.limit == 8
+
+    async def test_calls_over_limit_wait_their_turn(self):
+        """Verify a call over the limit starts when another finishes."""
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        ticket = await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.waiting == 1 and not waiter.done()
+
+        limiter.release(ticket)
+        limiter.release(await asyncio.wait_for(waiter, 1))
+        assert limiter.in_flight == 0
@@ -0,0 +1,136 @@
+"""Tests for the shared LLM gateway, against a mock HTTP transport."""
+
+import asyncio
+import threading
+
+import pytest
+
+from openai import DefaultAsyncHttpxClient
+
+from shared.limiter import AdaptiveLimiter
+from shared.llm import LLMGateway
+from shared.llm.gateway import _http
+
+
+def completion(prompt_tokens=10, cached_tokens=0, content="{}"):
+    """A Chat Completions response body."""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": 2,
+            "total_tokens": prompt_tokens + 2,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+class TestLLMGateway:
+    """Tests for the shared LLM gateway, against a mock HTTP transport."""
+
+    async def create(self, gateway):
+        client = gateway.client("sk-test")
+        return await client.chat.completions.create(model="gpt-4o-mini", messages=[])
+
+    def test_uses_the_http_package_openai_is_built_on(self):
+        """Verify the gateway's transport types come from the same package as openai's client."""
+        assert issubclass(DefaultAsyncHttpxClient, _http().AsyncClient)
+
+    async def test_retries_throttled_request_and_records_usage(self):
+        """Verify a 429 is retried after Retry-After and the usage is recorded."""
+        http = _http()
+        responses = [
+            http.Response(429, headers={"retry-after": "0"}, json={"error": {"message": "slow"}}),
+            http.Response(200, json=completion(prompt_tokens=1200, cached_tokens=1024)),
+        ]
+        gateway = LLMGateway(transport=http.MockTransport(lambda request: responses.pop(0)))
+
+        await self.create(gateway)
+
+        metrics = gateway.metrics.snapshot()
+        assert metrics["requests"] == 1
+        assert metrics["retries"] == 1
+        assert metrics["throttled"] == 1
+        assert metrics["errors"] == 0
+        assert metrics["prompt_tokens"] == 1200
+        assert metrics["cached_tokens"] == 1024
+        assert metrics["cached_ratio"] == round(1024 / 1200, 3)
+        assert metrics["latency_p50_ms"] is not None
+        assert gateway.limiter.decreases == 1
+
+    async def test_gives_up_after_max_retries(self):
+        """Verify a persistent 5xx is surfaced after max_retries retries."""
+        http = _http()
+        gateway = LLMGateway(
+            max_retries=2,
+            backoff_base=0.001,
+            transport=http.MockTransport(lambda request: http.Response(503, json={})),
+        )
+
+        with pytest.raises(Exception):
+            await self.create(gateway)
+
+        assert gateway.metrics.retries == 2
+        assert gateway.metrics.errors == 1
+
+    async def test_limits_concurrent_requests(self):
+        """Verify no more requests are in flight at once than the limiter allows."""
+        http = _http()
+        in_flight, peak = 0, 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return http.Response(200, json=completion())
+
+        gateway = LLMGateway(
+            limiter=AdaptiveLimiter(initial_limit=2, max_limit=2),
+            transport=http.MockTransport(handler),
+        )
+
+        await asyncio.gather(*(self.create(gateway) for _ in range(6)))
+
+        assert peak == 2
+        assert gateway.metrics.requests == 6
+
+    async def test_replaced_client_is_closed(self):
+        """Verify the client a new API key replaces is closed, on the same loop."""
+        gateway = LLMGateway(transport=_http().MockTransport(lambda request: None))
+        old = gateway.client("sk-old")
+
+        new = gateway.client("sk-new")
+        await asyncio.sleep(0)
+
+        assert new is not old
+        assert old.is_closed()
+        assert not new.is_closed()
+
+    async def test_client_replaced_from_another_loop_is_closed_on_its_own(self):
+        """Verify a client opened on another thread's loop is closed on that loop."""
+        gateway = LLMGateway(transport=_http().MockTransport(lambda request: None))
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        async def open_client():
+            return gateway.client("sk-test")
+
+        try:
+            old = asyncio.run_coroutine_threadsafe(open_client(), loop).result(timeout=5)
+            gateway.client("sk-test")
+            # The close was queued on the old loop ahead of this
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0), loop).result(timeout=5)
+            assert old.is_closed()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
@@ -0,0 +1,107 @@
+"""Tests for cached Secrets Manager lookups."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from shared import SecretCache, get_secret
+
+SECRET_ARN = "arn:aws:secretsmanager:us-east-1:123456789012:secret:openai-key"
+
+
+class SlowSecretsClient:
+    """Secrets Manager stand-in whose calls take a while, returning value-1, value-2, ..."""
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def get_secret_value(self, SecretId):  # noqa: N803 - boto3 naming
+        self.threads.add(threading.get_ident())
+        time.sleep(0.05)
+        self.calls += 1
+        return {"SecretString": f"value-{self.calls}"}
+
+
+class TestSecretCache:
+    """Tests for cached Secrets Manager lookups, against a stubbed client."""
+
+    @pytest.fixture
+    def stubbed_client(self):
+        """A Secrets Manager client whose responses are queued with a Stubber."""
+        client = boto3.client(
+            "secretsmanager",
+            region_name="us-east-1",
+            aws_access_key_id="test",
+            aws_secret_access_key="test",
+        )
+        with Stubber(client) as stubber:
+            yield client, stubber
+
+    def queue_secret(self, stubber, value):
+        """Queue one GetSecretValue response."""
+        stubber.add_response(
+            "get_secret_value", {"SecretString": value}, {"SecretId": SECRET_ARN}
+        )
+
+    def test_secret_is_fetched_once(self, stubbed_client):
+        """Verify repeated lookups make one Secrets Manager call."""
+        client, stubber = stubbed_client
+        self.queue_secret(stubber, "sk-from-secrets-manager")
+
+        with patch("shared.secret_cache._default_cache", SecretCache(client=client)):
+            values = {get_secret(SECRET_ARN) for _ in range(3)}
+
+        assert values == {"sk-from-secrets-manager"}
+        stubber.assert_no_pending_responses()
+
+    def test_refreshes_in_background_then_expires(self, stubbed_client):
+        """Verify a stale secret is served while refreshing, and refetched once expired."""
+        client, stubber = stubbed_client
+        for value in ("old", "rotated", "latest"):
+            self.queue_secret(stubber, value)
+        now = [0.0]
+        cache = SecretCache(ttl=100, refresh_after=50, client=client, clock=lambda: now[0])
+
+        assert cache.get(SECRET_ARN) == "old"
+        now[0] = 60
+        assert cache.get(SECRET_ARN) == "old"
+        deadline = time.monotonic() + 2
+        while cache.fetches < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert cache.get(SECRET_ARN) == "rotated"
+
+        now[0] = 200
+        assert cache.get(SECRET_ARN) == "latest"
+        stubber.assert_no_pending_responses()
+
+    def test_concurrent_lookups_share_one_fetch(self):
+        """Verify callers racing on a missing or expired secret make one fetch between them."""
+        client = SlowSecretsClient()
+        now = [0.0]
+        cache = SecretCache(ttl=100, client=client, clock=lambda: now[0])
+
+        def lookup_concurrently():
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                return set(pool.map(lambda _: cache.get(SECRET_ARN), range(8)))
+
+        assert lookup_concurrently() == {"value-1"}
+        now[0] = 150
+        # Callers that find the fetch in progress keep the expired value meanwhile
+        assert lookup_concurrently() <= {"value-1", "value-2"}
+        assert client.calls == 2
+
+    async def test_aget_fetches_off_event_loop(self):
+        """Verify an async lookup doesn't run the blocking fetch on the event loop's thread."""
+        client = SlowSecretsClient()
+        cache = SecretCache(client=client)
+
+        assert await cache.aget(SECRET_ARN) == "value-1"
+        assert await cache.aget(SECRET_ARN) == "value-1"
+        assert client.threads and threading.get_ident() not in client.threads
+        assert client.calls == 1
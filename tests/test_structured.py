@@ -0,0 +1,97 @@
+"""Tests for structured outputs: strict reply schemas, repair and retries."""
+
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel, Field
+
+from shared.llm import (
+    StructuredOutputError,
+    create_structured,
+    json_schema_format,
+    strict_json_schema,
+)
+
+
+class Slot(BaseModel):
+    court: str
+    time: str = Field(default="09:00", pattern=r"^\d{2}:\d{2}$")
+
+
+class Preference(BaseModel):
+    slot: Slot
+    default: Optional[str] = "any"
+    note: Optional[str] = None
+
+
+class ReplyClient:
+    """Chat Completions stand-in that answers each request with the next reply."""
+
+    def __init__(self, *replies, refusal=None):
+        self.replies = list(replies)
+        self.refusal = refusal
+        self.requests = []
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content=self.replies.pop(0), refusal=self.refusal)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class TestStructuredOutput:
+    """Tests for the JSON-schema reply format and reply validation."""
+
+    def test_schema_is_strict(self):
+        """Verify every object requires all its fields, allows no others and has no defaults."""
+        response_format = json_schema_format(Slot)
+        schema = response_format["json_schema"]["schema"]
+
+        assert response_format["json_schema"]["strict"] is True
+        assert schema["required"] == ["court", "time"]
+        assert schema["additionalProperties"] is False
+        assert "default" not in schema["properties"]["time"]
+        assert schema["properties"]["time"]["pattern"]
+
+    def test_property_named_default_is_kept(self):
+        """Verify only the ``default`` keyword is dropped, not a property called default."""
+        schema = strict_json_schema(Preference)
+
+        assert list(schema["properties"]) == ["slot", "default", "note"]
+        assert schema["required"] == ["slot", "default", "note"]
+        assert "default" not in schema["properties"]["default"]
+        nested = schema["$defs"]["Slot"]
+        assert nested["required"] == ["court", "time"]
+        assert nested["additionalProperties"] is False
+        assert "default" not in nested["properties"]["time"]
+
+    async def test_repairs_reply_without_asking_again(self):
+        """Verify a fenced reply with a trailing comma is repaired locally."""
+        client = ReplyClient('Here you go:\n```json\n{"court": "Court 1", "time": "14:00",}\n```')
+
+        slot = await create_structured(client, Slot, model="gpt-4o-mini", messages=[])
+
+        assert slot == Slot(court="Court 1", time="14:00")
+        assert len(client.requests) == 1
+        assert client.requests[0]["response_format"] == json_schema_format(Slot)
+        assert client.requests[0]["model"] == "gpt-4o-mini"
+
+    async def test_retries_invalid_reply_once(self):
+        """Verify a reply that fails validation is requested again, then reported."""
+        invalid = '{"court": "Court 1", "time": "2pm"}'
+        client = ReplyClient(invalid, invalid)
+
+        with pytest.raises(StructuredOutputError, match="time"):
+            await create_structured(client, Slot, model="gpt-4o-mini", messages=[])
+
+        assert len(client.requests) == 2
+
+    async def test_refusal_is_not_retried(self):
+        """Verify a refusal is reported without asking again."""
+        client = ReplyClient(None, refusal="I can't help with that")
+
+        with pytest.raises(StructuredOutputError, match="refused"):
+            await create_structured(client, Slot, model="gpt-4o-mini", messages=[])
+
+        assert len(client.requests) == 1